@@ -1,446 +1,708 @@
-import requests
-from bs4 import BeautifulSoup
-import json
-import time
-import re
-from datetime import datetime
-from urllib.parse import urljoin, urlparse
-from dataclasses import dataclass, asdict
-from typing import List, Dict, Optional
-import logging
-
-# Configure logging
-logging.basicConfig(level=logging.INFO)
-logger = logging.getLogger(__name__)
-
-@dataclass
-class JobListing:
-    """Data class to structure job information"""
-    title: str
-    company: str
-    location: str
-    description: str
-    requirements: str
-    salary: Optional[str]
-    category: str
-    technology_stack: List[str]  # New field for tech stack
-    url: str
-    posted_date: Optional[str]
-    scraped_date: str
-    source_website: str
-    
-    def to_dict(self) -> Dict:
-        return asdict(self)
-
-class JobScraper:
-    def __init__(self):
-        self.session = requests.Session()
-        self.session.headers.update({
-            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
-        })
-        
-        # Define job categories and their keywords
-        self.categories = {
-            'Python': ['python', 'django', 'flask', 'fastapi', 'python developer'],
-            'Backend': ['backend', 'back-end', 'api', 'server', 'microservices', 'rest api'],
-            'Frontend': ['frontend', 'front-end', 'react', 'angular', 'vue', 'javascript', 'html', 'css'],
-            'Database': ['database', 'sql', 'mysql', 'postgresql', 'mongodb', 'dba', 'data engineer']
-        }
-        
-        # Define technology stack keywords to extract
-        self.tech_stack_keywords = {
-            # Programming Languages
-            'python', 'java', 'javascript', 'typescript', 'c#', 'c++', 'c', 'php', 'ruby', 'go', 'rust', 'swift', 'kotlin', 'scala', 'r',
-            
-            # Web Frameworks
-            'django', 'flask', 'fastapi', 'react', 'angular', 'vue', 'node.js', 'express', 'laravel', 'spring', 'ruby on rails',
-            
-            # Databases
-            'mysql', 'postgresql', 'mongodb', 'sqlite', 'oracle', 'sql server', 'redis', 'cassandra', 'dynamodb', 'elasticsearch',
-            
-            # Cloud & DevOps
-            'aws', 'azure', 'gcp', 'docker', 'kubernetes', 'jenkins', 'terraform', 'ansible', 'github actions', 'gitlab ci',
-            
-            # Tools & Technologies
-            'git', 'linux', 'unix', 'nginx', 'apache', 'rabbitmq', 'kafka', 'spark', 'hadoop', 'airflow',
-            
-            # Testing & Quality
-            'pytest', 'junit', 'selenium', 'cypress', 'jest', 'mocha', 'postman',
-            
-            # Data Science & ML
-            'pandas', 'numpy', 'scikit-learn', 'tensorflow', 'pytorch', 'keras', 'jupyter', 'tableau', 'power bi',
-            
-            # Mobile
-            'android', 'ios', 'react native', 'flutter', 'xamarin',
-            
-            # Other
-            'microservices', 'rest api', 'graphql', 'websockets', 'oauth', 'jwt', 'ci/cd', 'agile', 'scrum'
-        }
-        
-        # Website configurations
-        self.website_configs = {
-            'linkedin': {
-                'base_url': 'https://www.linkedin.com',
-                'job_search_path': '/jobs/search/?keywords={}&location={}',
-                'selectors': {
-                    'job_cards': '.job-search-card',
-                    'title': '.base-search-card__title',
-                    'company': '.base-search-card__subtitle',
-                    'location': '.job-search-card__location',
-                    'link': '.base-card__full-link'
-                }
-            },
-            'indeed': {
-                'base_url': 'https://indeed.com',
-                'job_search_path': '/jobs?q={}&l={}',
-                'selectors': {
-                    'job_cards': '[data-jk]',
-                    'title': '[data-testid="job-title"]',
-                    'company': '[data-testid="company-name"]',
-                    'location': '[data-testid="job-location"]',
-                    'link': 'a[data-jk]'
-                }
-            }
-        }
-    
-    def clean_text(self, text: str) -> str:
-        """Clean text by removing asterisks and extra whitespace"""
-        if not text:
-            return ""
-        
-        # Remove asterisks and other unwanted characters
-        cleaned = re.sub(r'\*+', '', text)
-        
-        # Remove extra whitespace and normalize
-        cleaned = re.sub(r'\s+', ' ', cleaned).strip()
-        
-        # Remove common job board artifacts
-        cleaned = re.sub(r'new\s*!?$', '', cleaned, flags=re.IGNORECASE)
-        cleaned = re.sub(r'hiring\s*!?$', '', cleaned, flags=re.IGNORECASE)
-        cleaned = re.sub(r'urgent\s*!?$', '', cleaned, flags=re.IGNORECASE)
-        
-        return cleaned.strip()
-    
-    def extract_technology_stack(self, title: str, description: str, requirements: str) -> List[str]:
-        """Extract technology stack from job title, description, and requirements"""
-        # Combine all text for analysis
-        full_text = f"{title} {description} {requirements}".lower()
-        
-        # Find matching technologies
-        found_technologies = set()
-        
-        for tech in self.tech_stack_keywords:
-            # Use word boundaries to avoid partial matches
-            pattern = r'\b' + re.escape(tech.lower()) + r'\b'
-            if re.search(pattern, full_text):
-                found_technologies.add(tech.title())
-        
-        # Special handling for common variations
-        tech_variations = {
-            'nodejs': 'Node.js',
-            'node js': 'Node.js',
-            'reactjs': 'React',
-            'react.js': 'React',
-            'vuejs': 'Vue',
-            'vue.js': 'Vue',
-            'angularjs': 'Angular',
-            'c sharp': 'C#',
-            'dot net': '.NET',
-            'dotnet': '.NET',
-            'postgresql': 'PostgreSQL',
-            'mongo db': 'MongoDB',
-            'sql server': 'SQL Server',
-            'amazon web services': 'AWS',
-            'google cloud': 'GCP',
-            'machine learning': 'Machine Learning',
-            'artificial intelligence': 'AI',
-            'deep learning': 'Deep Learning'
-        }
-        
-        for variation, standard in tech_variations.items():
-            if re.search(r'\b' + re.escape(variation) + r'\b', full_text):
-                found_technologies.add(standard)
-        
-        return sorted(list(found_technologies))
-    
-    def categorize_job(self, title: str, description: str) -> str:
-        """Categorize job based on title and description"""
-        title_lower = title.lower()
-        description_lower = description.lower()
-        
-        for category, keywords in self.categories.items():
-            for keyword in keywords:
-                if keyword in title_lower or keyword in description_lower:
-                    return category
-        
-        return 'Other'
-    
-    def extract_salary(self, text: str) -> Optional[str]:
-        """Extract salary information from text"""
-        salary_patterns = [
-            r'\$[\d,]+\s*-\s*\$[\d,]+',
-            r'\$[\d,]+k?\s*-\s*\$[\d,]+k?',
-            r'\$[\d,]+(?:\.\d+)?k?',
-            r'[\d,]+\s*-\s*[\d,]+\s*(?:per year|annually|yearly)',
-        ]
-        
-        for pattern in salary_patterns:
-            match = re.search(pattern, text, re.IGNORECASE)
-            if match:
-                return match.group(0)
-        
-        return None
-    
-    def scrape_job_details(self, job_url: str, source_website: str) -> Dict:
-        """Scrape detailed job information from job URL"""
-        try:
-            response = self.session.get(job_url, timeout=10)
-            response.raise_for_status()
-            soup = BeautifulSoup(response.content, 'html.parser')
-            
-            # Extract job details based on website
-            if source_website == 'linkedin':
-                return self._scrape_linkedin_details(soup)
-            elif source_website == 'indeed':
-                return self._scrape_indeed_details(soup)
-            
-        except Exception as e:
-            logger.error(f"Error scraping job details from {job_url}: {str(e)}")
-            return {}
-    
-    def _scrape_linkedin_details(self, soup: BeautifulSoup) -> Dict:
-        """Extract LinkedIn job details"""
-        description = ""
-        requirements = ""
-        
-        # LinkedIn job description selectors
-        desc_selectors = [
-            '.show-more-less-html__markup',
-            '.jobs-description-content__text',
-            '.jobs-box__html-content'
-        ]
-        
-        for selector in desc_selectors:
-            desc_elem = soup.select_one(selector)
-            if desc_elem:
-                description = self.clean_text(desc_elem.get_text(strip=True))
-                break
-        
-        # Extract requirements (usually in bullet points or specific sections)
-        req_keywords = ['requirements', 'qualifications', 'skills', 'experience']
-        for keyword in req_keywords:
-            req_section = soup.find(text=re.compile(keyword, re.IGNORECASE))
-            if req_section:
-                parent = req_section.parent
-                if parent:
-                    requirements = self.clean_text(parent.get_text(strip=True))
-                    break
-        
-        return {
-            'description': description,
-            'requirements': requirements,
-            'salary': self.extract_salary(description)
-        }
-    
-    def _scrape_indeed_details(self, soup: BeautifulSoup) -> Dict:
-        """Extract Indeed job details"""
-        description = ""
-        requirements = ""
-        
-        # Indeed job description selectors
-        desc_selectors = [
-            '.jobsearch-jobDescriptionText',
-            '.jobsearch-JobComponent-description',
-            '#jobDescriptionText'
-        ]
-        
-        for selector in desc_selectors:
-            desc_elem = soup.select_one(selector)
-            if desc_elem:
-                description = self.clean_text(desc_elem.get_text(strip=True))
-                break
-        
-        # Extract salary from Indeed's salary section
-        salary_elem = soup.select_one('.icl-u-xs-mr--xs .attribute_snippet')
-        salary = salary_elem.get_text(strip=True) if salary_elem else self.extract_salary(description)
-        
-        return {
-            'description': description,
-            'requirements': requirements,
-            'salary': salary
-        }
-    
-    def scrape_website(self, website: str, categories: List[str], location: str = "", max_jobs: int = 50) -> List[JobListing]:
-        """Scrape jobs from a specific website"""
-        if website not in self.website_configs:
-            logger.error(f"Website {website} not supported")
-            return []
-        
-        config = self.website_configs[website]
-        jobs = []
-        
-        for category in categories:
-            logger.info(f"Scraping {category} jobs from {website}")
-            
-            # Build search URL
-            search_url = config['base_url'] + config['job_search_path'].format(category, location)
-            
-            try:
-                response = self.session.get(search_url, timeout=10)
-                response.raise_for_status()
-                soup = BeautifulSoup(response.content, 'html.parser')
-                
-                # Find job cards
-                job_cards = soup.select(config['selectors']['job_cards'])
-                
-                for i, card in enumerate(job_cards[:max_jobs]):
-                    if i >= max_jobs:
-                        break
-                    
-                    try:
-                        # Extract basic job info
-                        title_elem = card.select_one(config['selectors']['title'])
-                        company_elem = card.select_one(config['selectors']['company'])
-                        location_elem = card.select_one(config['selectors']['location'])
-                        link_elem = card.select_one(config['selectors']['link'])
-                        
-                        if not all([title_elem, company_elem, link_elem]):
-                            continue
-                        
-                        # Clean the extracted text
-                        title = self.clean_text(title_elem.get_text(strip=True))
-                        company = self.clean_text(company_elem.get_text(strip=True))
-                        job_location = self.clean_text(location_elem.get_text(strip=True)) if location_elem else "Not specified"
-                        
-                        # Skip if essential information is missing after cleaning
-                        if not title or not company:
-                            continue
-                        
-                        # Get job URL
-                        job_url = link_elem.get('href')
-                        if job_url and not job_url.startswith('http'):
-                            job_url = urljoin(config['base_url'], job_url)
-                        
-                        # Scrape detailed job information
-                        job_details = self.scrape_job_details(job_url, website)
-                        
-                        # Extract technology stack
-                        tech_stack = self.extract_technology_stack(
-                            title, 
-                            job_details.get('description', ''), 
-                            job_details.get('requirements', '')
-                        )
-                        
-                        # Determine job category
-                        job_category = self.categorize_job(title, job_details.get('description', ''))
-                        
-                        # Only include jobs that match our target categories
-                        if job_category in self.categories:
-                            job = JobListing(
-                                category=job_category,
-                                title=title,
-                                company=company,
-                                location=job_location,
-                                description=job_details.get('description', ''),
-                                requirements=job_details.get('requirements', ''),
-                                salary=job_details.get('salary'),
-                                technology_stack=tech_stack,  # Include tech stack
-                                url=job_url,
-                                posted_date=None,  # Could be extracted if available
-                                scraped_date=datetime.now().isoformat(),
-                                source_website=website
-                            )
-                            jobs.append(job)
-                            
-                        # Add delay to avoid being blocked
-                        time.sleep(1)
-                        
-                    except Exception as e:
-                        logger.error(f"Error processing job card: {str(e)}")
-                        continue
-                
-            except Exception as e:
-                logger.error(f"Error scraping {website} for {category}: {str(e)}")
-                continue
-        
-        return jobs
-    
-    def scrape_all_websites(self, websites: List[str], categories: List[str], location: str = "", max_jobs_per_site: int = 50) -> List[Dict]:
-        """Scrape jobs from multiple websites"""
-        all_jobs = []
-        
-        for website in websites:
-            logger.info(f"Starting to scrape {website}")
-            jobs = self.scrape_website(website, categories, location, max_jobs_per_site)
-            all_jobs.extend([job.to_dict() for job in jobs])
-            
-            # Add delay between websites
-            time.sleep(2)
-        
-        return all_jobs
-    
-#    def save_to_json(self, jobs: List[Dict], filename: str):
-#        """Save jobs to JSON file"""
-#        with open(filename, 'w', encoding='utf-8') as f:
-#            json.dump(jobs, f, indent=2, ensure_ascii=False)
-#        
-#        logger.info(f"Saved {len(jobs)} jobs to {filename}")
-        
-    def save_to_json(self, jobs: List[Dict], filename: str):
-        """Save jobs to JSON file with numbered keys like JD001, JD002"""
-        
-        # Convert list to dict with keys JD001, JD002, etc.
-        jobs_dict = {
-            f"JD{str(index + 1).zfill(3)}": job
-            for index, job in enumerate(jobs)
-        }
-
-        with open(filename, 'w', encoding='utf-8') as f:
-            json.dump(jobs_dict, f, indent=2, ensure_ascii=False)
-
-        logger.info(f"Saved {len(jobs)} jobs to {filename}")
-
-# Example usage
-if __name__ == "__main__":
-    scraper = JobScraper()
-    
-    # Configuration
-    websites = ['linkedin', 'indeed']  # Add more websites as needed
-    categories = ['Python', 'Backend', 'Frontend', 'Database']
-    location = "New York, NY"  # Optional location filter
-    max_jobs_per_site = 25
-    
-    # Scrape jobs
-    jobs = scraper.scrape_all_websites(
-        websites=websites,
-        categories=categories,
-        location=location,
-        max_jobs_per_site=max_jobs_per_site
-    )
-    
-    # Save to JSON
-    scraper.save_to_json(jobs, 'scraped_jobs_ids.json')
-    
-    # Print summary
-    print(f"Total jobs scraped: {len(jobs)}")
-    
-    # Print category breakdown
-    category_counts = {}
-    tech_stack_counts = {}
-    
-    for job in jobs:
-        category = job['category']
-        category_counts[category] = category_counts.get(category, 0) + 1
-        
-        # Count technology occurrences
-        for tech in job['technology_stack']:
-            tech_stack_counts[tech] = tech_stack_counts.get(tech, 0) + 1
-    
-    print("\nJobs by category:")
-    for category, count in category_counts.items():
-        print(f"  {category}: {count}")
-    
-    print("\nTop 10 technologies mentioned:")
-    sorted_tech = sorted(tech_stack_counts.items(), key=lambda x: x[1], reverse=True)
-    for tech, count in sorted_tech[:10]:
-        print(f"  {tech}: {count}")
\ No newline at end of file
+import json
+import time
+import re
+from datetime import datetime
+from urllib.parse import urljoin, urlparse
+from dataclasses import dataclass, asdict
+from typing import TYPE_CHECKING, Iterable, List, Dict, Optional, Tuple
+import logging
+
+from scrape_metrics import ScrapeMetrics
+from site_registry import DEFAULT_SITES_DIR, SiteAdapter, get_registry
+from structured_data import find_job_posting, job_posting_details
+from fingerprint_store import card_fingerprint
+from enrichment_cache import enrichment_key, enrichment_version
+from job_store import JobStore
+from tech_matcher import TECH_STACK_KEYWORDS, KeywordSet, TechMatcher, extract_technology_stacks, get_tech_matcher
+
+# asyncio, requests, bs4 and httpx are imported on first use to keep startup fast
+if TYPE_CHECKING:
+    import httpx
+    import requests
+    from async_transport import AsyncFetcher
+
+# Configure logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+# Define job categories and their keywords
+CATEGORIES = {
+    'Python': ['python', 'django', 'flask', 'fastapi', 'python developer'],
+    'Backend': ['backend', 'back-end', 'api', 'server', 'microservices', 'rest api'],
+    'Frontend': ['frontend', 'front-end', 'react', 'angular', 'vue', 'javascript', 'html', 'css'],
+    'Database': ['database', 'sql', 'mysql', 'postgresql', 'mongodb', 'dba', 'data engineer']
+}
+
+@dataclass
+class JobListing:
+    """Data class to structure job information"""
+    title: str
+    company: str
+    location: str
+    description: str
+    requirements: str
+    salary: Optional[str]
+    category: str
+    technology_stack: List[str]  # New field for tech stack
+    url: str
+    posted_date: Optional[str]
+    scraped_date: str
+    source_website: str
+    
+    def to_dict(self) -> Dict:
+        return asdict(self)
+
+class JobScraper:
+    # Variants such as jd_aus.py subclass this and swap in their own category table and listing layout
+    category_table = CATEGORIES
+    listing_class = JobListing
+    
+    def __init__(self, sites_dir: Optional[str] = None, transport: str = 'requests'):
+        # 'requests' fetches one page at a time; 'httpx' runs the async engine behind the same sync API
+        if transport not in ('requests', 'httpx'):
+            raise ValueError(f"Unknown transport {transport}")
+        self.transport = transport
+        self.async_transport = None  # optional httpx.AsyncBaseTransport, e.g. for replaying fixtures
+        self.fingerprints = None  # optional FingerprintStore; skips job pages whose search card is unchanged
+        self.enrichment_cache = None  # optional EnrichmentCache; reuses tech stack and category for repeated job text
+        self.html_archive = None  # optional HtmlArchive; keeps every fetched page for offline re-parsing
+        
+        self.headers = {
+            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
+        }
+        self._session = None  # created on first request
+
+        # Per-stage timings and counters for the current run
+        self.metrics = ScrapeMetrics()
+
+        # Politeness delays in seconds, between job detail requests and between websites.
+        # A request_delay of None uses each site's own rate_limit.request_delay.
+        self.request_delay = None
+        self.site_delay = 2
+        
+        # Per-instance copies of the module tables, so edits stay local to this scraper
+        self.categories = {category: list(keywords) for category, keywords in self.category_table.items()}
+        self.tech_stack_keywords = TECH_STACK_KEYWORDS
+        self._tech_matcher = None
+        self._tech_matcher_source = None  # (keyword set, its version) the current matcher was built from
+        self._enrichment_config = None  # (matcher, version) for enrichment cache keys; cleared at the start of every scrape
+        
+        # Site adapters (selectors, detail-page rules, pagination, rate limits) compiled from sites/*.json
+        self.sites = get_registry(sites_dir or DEFAULT_SITES_DIR)
+    
+    @property
+    def session(self) -> 'requests.Session':
+        """HTTP session for the requests transport, created on first use"""
+        if self._session is None:
+            from http_client import make_session
+            self._session = make_session(headers=self.headers)
+        return self._session
+    
+    @session.setter
+    def session(self, session: 'requests.Session'):
+        self._session = session
+    
+    @property
+    def tech_stack_keywords(self) -> KeywordSet:
+        return self._tech_stack_keywords
+    
+    @tech_stack_keywords.setter
+    def tech_stack_keywords(self, keywords: Iterable[str]):
+        # Copied into a KeywordSet, whose in-place edits bump the version tech_matcher checks
+        self._tech_stack_keywords = KeywordSet(keywords)
+    
+    @property
+    def tech_matcher(self) -> TechMatcher:
+        """Matcher for the current tech_stack_keywords, rebuilt when the table is replaced or edited"""
+        keywords = self._tech_stack_keywords
+        source = self._tech_matcher_source
+        if source is None or source[0] is not keywords or source[1] != keywords.version:
+            self._tech_matcher = get_tech_matcher(keywords)
+            self._tech_matcher_source = (keywords, keywords.version)
+        return self._tech_matcher
+    
+    @property
+    def website_configs(self) -> Dict[str, Dict]:
+        """Raw site definitions keyed by site name"""
+        return self.sites.configs()
+    
+    def clean_text(self, text: str) -> str:
+        """Clean text by removing asterisks and extra whitespace"""
+        if not text:
+            return ""
+        
+        # Remove asterisks and other unwanted characters
+        cleaned = re.sub(r'\*+', '', text)
+        
+        # Remove extra whitespace and normalize
+        cleaned = re.sub(r'\s+', ' ', cleaned).strip()
+        
+        # Remove common job board artifacts
+        cleaned = re.sub(r'new\s*!?$', '', cleaned, flags=re.IGNORECASE)
+        cleaned = re.sub(r'hiring\s*!?$', '', cleaned, flags=re.IGNORECASE)
+        cleaned = re.sub(r'urgent\s*!?$', '', cleaned, flags=re.IGNORECASE)
+        
+        return cleaned.strip()
+    
+    def extract_technology_stack(self, title: str, description: str, requirements: str) -> List[str]:
+        """Extract technology stack from job title, description, and requirements"""
+        # One precompiled pattern finds every keyword and common variation in a single pass
+        return self.tech_matcher.extract(title, description, requirements)
+    
+    def extract_technology_stacks(self, jobs: List[Dict], processes: Optional[int] = None) -> List[List[str]]:
+        """Extract technology stacks for many jobs at once, spread over a process pool"""
+        return extract_technology_stacks(jobs, self.tech_matcher, processes)
+    
+    def categorize_job(self, title: str, description: str) -> str:
+        """Categorize job based on title and description"""
+        title_lower = title.lower()
+        description_lower = description.lower()
+        
+        for category, keywords in self.categories.items():
+            for keyword in keywords:
+                if keyword in title_lower or keyword in description_lower:
+                    return category
+        
+        return 'Other'
+    
+    def extract_salary(self, text: str) -> Optional[str]:
+        """Extract salary information from text"""
+        salary_patterns = [
+            r'\$[\d,]+\s*-\s*\$[\d,]+',
+            r'\$[\d,]+k?\s*-\s*\$[\d,]+k?',
+            r'\$[\d,]+(?:\.\d+)?k?',
+            r'[\d,]+\s*-\s*[\d,]+\s*(?:per year|annually|yearly)',
+        ]
+        
+        for pattern in salary_patterns:
+            match = re.search(pattern, text, re.IGNORECASE)
+            if match:
+                return match.group(0)
+        
+        return None
+    
+    def _fetch(self, url: str, website: str, stage: str) -> 'requests.Response':
+        """GET a URL through the session, recording the attempt, latency, status code and size"""
+        try:
+            with self.metrics.timer(stage, website):
+                response = self.session.get(url, timeout=10)
+        except Exception as e:
+            self.metrics.record_request_error(website, e)
+            raise
+        finally:
+            self.metrics.inc('requests', site=website)
+        self.metrics.record_response(website, response.status_code, len(response.content))
+        self._archive_response(url, website, stage, response)
+        response.raise_for_status()
+        return response
+
+    async def _fetch_async(self, fetcher: 'AsyncFetcher', url: str, website: str, stage: str) -> 'httpx.Response':
+        """Async counterpart of _fetch, throttled by the fetcher's per-site limits"""
+        try:
+            with self.metrics.timer(stage, website):
+                response = await fetcher.get(url, website)
+        except Exception as e:
+            self.metrics.record_request_error(website, e)
+            raise
+        finally:
+            self.metrics.inc('requests', site=website)
+        self.metrics.record_response(website, response.status_code, len(response.content))
+        self._archive_response(url, website, stage, response)
+        response.raise_for_status()
+        return response
+
+    def _archive_response(self, url: str, website: str, stage: str, response):
+        """Append the raw response to the HTML archive, if one is attached"""
+        if self.html_archive is not None:
+            self.html_archive.write(url, website, stage, response.status_code, response.content,
+                                    response.headers.get('Content-Type'))
+
+    def _flush_archive(self):
+        """Commit the HTML archive's buffered index rows so the pages fetched so far can be looked up"""
+        if self.html_archive is not None:
+            self.html_archive.flush()
+    
+    def _sleep(self, seconds: float, website: str = ''):
+        """Politeness delay, recorded so runs show how much time is spent waiting"""
+        with self.metrics.timer('sleep', website):
+            time.sleep(seconds)
+
+    def _make_async_fetcher(self) -> 'AsyncFetcher':
+        from async_transport import AsyncFetcher
+        from http_client import install_dns_cache
+        install_dns_cache()
+        headers = dict(self._session.headers) if self._session is not None else dict(self.headers)
+        return AsyncFetcher(headers=headers, transport=self.async_transport)
+
+    def _parse_job_details(self, content: bytes, adapter: SiteAdapter) -> Dict:
+        """Extract job details from a fetched job page"""
+        # Fast path: an embedded JSON-LD JobPosting already has every field, no DOM needed
+        posting = find_job_posting(content) if adapter.json_ld else None
+        if posting:
+            details = job_posting_details(posting, self.clean_text, self.extract_salary)
+            if details['description']:
+                self.metrics.inc('json_ld_hits', site=adapter.name)
+                return details
+        
+        from bs4 import BeautifulSoup
+        soup = BeautifulSoup(content, 'html.parser')
+        
+        # Extract job details with the site's detail-page rules
+        details = adapter.extract_details(soup, self.clean_text, self.extract_salary)
+        if posting:
+            details['posted_date'] = posting.get('datePosted') or None
+        return details
+    
+    def scrape_job_details(self, job_url: str, source_website: str) -> Dict:
+        """Scrape detailed job information from job URL"""
+        adapter = self.sites.get(source_website)
+        if adapter is None:
+            logger.error(f"Website {source_website} not supported")
+            return {}
+        
+        try:
+            response = self._fetch(job_url, source_website, 'detail_fetch')
+        except Exception as e:
+            logger.error(f"Error scraping job details from {job_url}: {str(e)}")
+            return {}
+        return self._details_from_response(response, adapter, job_url)
+    
+    async def scrape_job_details_async(self, fetcher: 'AsyncFetcher', job_url: str, source_website: str) -> Dict:
+        """Async counterpart of scrape_job_details"""
+        adapter = self.sites.get(source_website)
+        if adapter is None:
+            logger.error(f"Website {source_website} not supported")
+            return {}
+        
+        try:
+            response = await self._fetch_async(fetcher, job_url, source_website, 'detail_fetch')
+        except Exception as e:
+            logger.error(f"Error scraping job details from {job_url}: {str(e)}")
+            return {}
+        return self._details_from_response(response, adapter, job_url)
+    
+    def _details_from_response(self, response, adapter: SiteAdapter, job_url: str) -> Dict:
+        """Parse a fetched job page; empty details if it cannot be parsed"""
+        try:
+            with self.metrics.timer('detail_parse', adapter.name):
+                return self._parse_job_details(response.content, adapter)
+        except Exception as e:
+            logger.error(f"Error scraping job details from {job_url}: {str(e)}")
+            return {}
+    
+    def _parse_job_cards(self, content: bytes, adapter: SiteAdapter) -> List[Dict]:
+        """Extract title, company, location, URL and change fingerprint from every job card on a search page"""
+        from bs4 import BeautifulSoup
+        soup = BeautifulSoup(content, 'html.parser')
+        cards = []
+        
+        for card in adapter.select_cards(soup):
+            try:
+                # Extract basic job info
+                title_elem = adapter.select_field(card, 'title')
+                company_elem = adapter.select_field(card, 'company')
+                location_elem = adapter.select_field(card, 'location')
+                link_elem = adapter.select_field(card, 'link')
+                listed_elem = adapter.select_field(card, 'listed_date')
+                snippet_elem = adapter.select_field(card, 'snippet')
+                
+                if not all([title_elem, company_elem, link_elem]):
+                    continue
+                
+                # Clean the extracted text
+                title = self.clean_text(title_elem.get_text(strip=True))
+                company = self.clean_text(company_elem.get_text(strip=True))
+                job_location = self.clean_text(location_elem.get_text(strip=True)) if location_elem else "Not specified"
+                
+                # Skip if essential information is missing after cleaning
+                if not title or not company:
+                    continue
+                
+                # Get job URL
+                job_url = link_elem.get('href')
+                if job_url and not job_url.startswith('http'):
+                    job_url = urljoin(adapter.base_url, job_url)
+                
+                job_card = {
+                    'title': title,
+                    'company': company,
+                    'location': job_location,
+                    'has_location': location_elem is not None,
+                    'url': job_url,
+                    # <time> elements carry a machine-readable date that does not drift like "2 days ago"
+                    'listed_date': (listed_elem.get('datetime') or listed_elem.get_text(strip=True)) if listed_elem else '',
+                    'snippet': self.clean_text(snippet_elem.get_text(' ', strip=True)) if snippet_elem else ''
+                }
+                job_card['fingerprint'] = card_fingerprint(job_card)
+                cards.append(job_card)
+                
+            except Exception as e:
+                logger.error(f"Error processing job card: {str(e)}")
+                continue
+        
+        return cards
+    
+    def _check_fingerprints(self, cards: List[Dict], website: str) -> List[Dict]:
+        """Attach the stored listing to cards whose fingerprint matches a detail fetch younger than the store's max age"""
+        if self.fingerprints is None:
+            return cards
+        for card in cards:
+            job = self.fingerprints.unchanged_job(card['url'], card['fingerprint'])
+            # A listing whose category is no longer scraped is built again from a fresh fetch
+            if job is not None and job.get('category') in self.categories:
+                card['stored_job'] = job
+                self.metrics.inc('fingerprint_hits', site=website)
+        return cards
+    
+    def _changed_cards(self, cards: List[Dict], website: str) -> List[Dict]:
+        """Cards whose job page has to be fetched, i.e. without an unchanged stored listing"""
+        return [card for card in self._check_fingerprints(cards, website) if 'stored_job' not in card]
+    
+    def _remember_card(self, card: Dict, job_details: Dict, job: Optional[JobListing]):
+        """Record the card fingerprint and its listing once the job was fetched and built successfully"""
+        if self.fingerprints is not None and job_details and job:
+            self.fingerprints.record(card['url'], card['fingerprint'], job.to_dict())
+    
+    def _enrichment_version(self) -> str:
+        """Configuration version for enrichment cache keys.
+        
+        Combines the config hash of the matcher actually in use with a hash of the
+        categories, which is taken once per scrape so in-place edits count from the next one.
+        """
+        matcher = self.tech_matcher
+        config = self._enrichment_config
+        if config is None or config[0] is not matcher:
+            config = self._enrichment_config = (matcher, enrichment_version(self.categories, matcher))
+        return config[1]
+    
+    def enrich(self, title: str, description: str, requirements: str, website: str = '') -> Tuple[List[str], str]:
+        """Technology stack and category of a job, memoized by content hash when an enrichment cache is set"""
+        cache = self.enrichment_cache
+        if cache is not None:
+            key = enrichment_key(self._enrichment_version(), title, description, requirements)
+            cached = cache.get(key)
+            if cached is not None:
+                self.metrics.inc('enrichment_cache_hits', site=website)
+                return cached
+            self.metrics.inc('enrichment_cache_misses', site=website)
+        
+        # Extract technology stack
+        tech_stack = self.extract_technology_stack(title, description, requirements)
+        
+        # Determine job category
+        job_category = self.categorize_job(title, description)
+        
+        if cache is not None:
+            cache.put(key, tech_stack, job_category)
+        return tech_stack, job_category
+    
+    def _build_job(self, card: Dict, job_details: Dict, website: str) -> Optional[JobListing]:
+        """Combine a job card with its details; None if the job is outside the target categories"""
+        job_location = card['location']
+        if not card['has_location'] and job_details.get('location'):
+            job_location = job_details['location']
+        
+        with self.metrics.timer('enrichment', website):
+            tech_stack, job_category = self.enrich(
+                card['title'],
+                job_details.get('description', ''),
+                job_details.get('requirements', ''),
+                website
+            )
+        
+        # Only include jobs that match our target categories
+        if job_category not in self.categories:
+            return None
+        
+        return self.listing_class(
+            category=job_category,
+            title=card['title'],
+            company=card['company'],
+            location=job_location,
+            description=job_details.get('description', ''),
+            requirements=job_details.get('requirements', ''),
+            salary=job_details.get('salary'),
+            technology_stack=tech_stack,  # Include tech stack
+            url=card['url'],
+            posted_date=job_details.get('posted_date'),
+            scraped_date=datetime.now().isoformat(),
+            source_website=website
+        )
+    
+    def scrape_website(self, website: str, categories: List[str], location: str = "", max_jobs: int = 50) -> List[JobListing]:
+        """Scrape jobs from a specific website"""
+        # Rehash the categories for enrichment cache keys; they may have been edited since the last scrape
+        self._enrichment_config = None
+        if self.transport == 'httpx':
+            import asyncio
+            return asyncio.run(self.scrape_website_async(website, categories, location, max_jobs))
+        
+        adapter = self.sites.get(website)
+        if adapter is None:
+            logger.error(f"Website {website} not supported")
+            return []
+        
+        jobs = []
+        
+        try:
+            for category in categories:
+                logger.info(f"Scraping {category} jobs from {website}")
+                with self.metrics.timer('category', website, category):
+                    jobs.extend(self._scrape_category(adapter, category, location, max_jobs))
+        finally:
+            self._flush_archive()
+        
+        return jobs
+    
+    def _scrape_category(self, adapter: SiteAdapter, category: str, location: str, max_jobs: int) -> List[JobListing]:
+        """Scrape the search result pages of one category on a website"""
+        website = adapter.name
+        jobs = []
+        job_cards = []
+        
+        # Walk result pages until enough cards are collected or a page comes back empty
+        for search_url in adapter.search_urls(category, location):
+            try:
+                response = self._fetch(search_url, website, 'search_fetch')
+            except Exception as e:
+                logger.error(f"Error scraping {website} for {category}: {str(e)}")
+                break
+            if not self._add_search_page(response, adapter, category, job_cards, max_jobs):
+                break
+        
+        delay = self.request_delay if self.request_delay is not None else adapter.request_delay
+        
+        for card in job_cards[:max_jobs]:
+            if 'stored_job' in card:
+                # Unchanged card: return the stored listing without fetching its job page
+                job = self._reuse_card(card, website, category)
+                if job:
+                    jobs.append(job)
+                continue
+            
+            card_started = time.perf_counter()
+            # Scrape detailed job information
+            job = self._finish_card(card, self.scrape_job_details(card['url'], website), website, category, card_started)
+            if job:
+                jobs.append(job)
+            
+            # Add delay to avoid being blocked
+            self._sleep(delay, website)
+        
+        return jobs
+    
+    def _add_search_page(self, response, adapter: SiteAdapter, category: str, job_cards: List[Dict], max_jobs: int) -> bool:
+        """Parse one search result page into job_cards; False once no further page is needed"""
+        try:
+            with self.metrics.timer('search_parse', adapter.name):
+                page_cards = self._parse_job_cards(response.content, adapter)
+        except Exception as e:
+            logger.error(f"Error scraping {adapter.name} for {category}: {str(e)}")
+            return False
+        
+        if not page_cards:
+            return False
+        job_cards.extend(self._check_fingerprints(page_cards, adapter.name))
+        return len(job_cards) < max_jobs
+    
+    def _reuse_card(self, card: Dict, website: str, category: str) -> Optional[JobListing]:
+        """Listing stored with an unchanged card's fingerprint, as it was built when its page was last fetched"""
+        try:
+            job = self.listing_class(**card['stored_job'])
+        except TypeError as e:
+            logger.error(f"Error restoring stored job {card['url']}: {str(e)}")
+            return None
+        self.metrics.record_job(website, category)
+        return job
+    
+    def _finish_card(self, card: Dict, job_details: Dict, website: str, category: str,
+                     card_started: float) -> Optional[JobListing]:
+        """Turn a card and its fetched details into a listing, recording the job's metrics"""
+        try:
+            job = self._build_job(card, job_details, website)
+            # Only a job that was actually built may be skipped next time
+            self._remember_card(card, job_details, job)
+        except Exception as e:
+            logger.error(f"Error processing job card: {str(e)}")
+            return None
+        if job:
+            self.metrics.record_job(website, category)
+            self.metrics.observe('job', time.perf_counter() - card_started, website)
+        return job
+    
+    async def scrape_website_async(self, website: str, categories: List[str], location: str = "", max_jobs: int = 50,
+                                   fetcher: Optional['AsyncFetcher'] = None) -> List[JobListing]:
+        """Scrape jobs from a specific website, fetching job pages concurrently"""
+        self._enrichment_config = None  # see scrape_website
+        adapter = self.sites.get(website)
+        if adapter is None:
+            logger.error(f"Website {website} not supported")
+            return []
+        
+        if fetcher is None:
+            async with self._make_async_fetcher() as own_fetcher:
+                return await self.scrape_website_async(website, categories, location, max_jobs, own_fetcher)
+        
+        # The site's delay becomes the minimum spacing between request starts
+        delay = self.request_delay if self.request_delay is not None else adapter.request_delay
+        fetcher.set_site_limits(website, adapter.concurrency, delay)
+        
+        import asyncio
+        
+        async def scrape_category(category: str) -> List[JobListing]:
+            logger.info(f"Scraping {category} jobs from {website}")
+            with self.metrics.timer('category', website, category):
+                return await self._scrape_category_async(fetcher, adapter, category, location, max_jobs)
+        
+        try:
+            results = await asyncio.gather(*(scrape_category(category) for category in categories))
+        finally:
+            self._flush_archive()
+        return [job for jobs in results for job in jobs]
+    
+    async def _scrape_category_async(self, fetcher: 'AsyncFetcher', adapter: SiteAdapter, category: str,
+                                     location: str, max_jobs: int) -> List[JobListing]:
+        """Async counterpart of _scrape_category; job pages are fetched concurrently"""
+        website = adapter.name
+        job_cards = []
+        
+        for search_url in adapter.search_urls(category, location):
+            try:
+                response = await self._fetch_async(fetcher, search_url, website, 'search_fetch')
+            except Exception as e:
+                logger.error(f"Error scraping {website} for {category}: {str(e)}")
+                break
+            if not self._add_search_page(response, adapter, category, job_cards, max_jobs):
+                break
+        
+        import asyncio
+        
+        async def scrape_card(card: Dict) -> Optional[JobListing]:
+            if 'stored_job' in card:
+                return self._reuse_card(card, website, category)
+            card_started = time.perf_counter()
+            job_details = await self.scrape_job_details_async(fetcher, card['url'], website)
+            return self._finish_card(card, job_details, website, category, card_started)
+        
+        results = await asyncio.gather(*(scrape_card(card) for card in job_cards[:max_jobs]))
+        return [job for job in results if job]
+    
+    def scrape_all_websites(self, websites: List[str], categories: List[str], location: str = "", max_jobs_per_site: int = 50,
+                            store: Optional[JobStore] = None) -> List[Dict]:
+        """Scrape jobs from multiple websites; with a store, each site's jobs are also written to it"""
+        if self.transport == 'httpx':
+            import asyncio
+            return asyncio.run(self.scrape_all_websites_async(websites, categories, location, max_jobs_per_site, store))
+        
+        all_jobs = []
+        
+        # Pick up edited or newly added site files before the run
+        self.sites.reload_if_changed()
+        
+        for website in websites:
+            logger.info(f"Starting to scrape {website}")
+            jobs = [job.to_dict() for job in self.scrape_website(website, categories, location, max_jobs_per_site)]
+            all_jobs.extend(jobs)
+            if store is not None:
+                store.add_many(jobs)
+            
+            # Add delay between websites
+            self._sleep(self.site_delay, website)
+        
+        return all_jobs
+    
+    async def scrape_all_websites_async(self, websites: List[str], categories: List[str], location: str = "",
+                                        max_jobs_per_site: int = 50, store: Optional[JobStore] = None) -> List[Dict]:
+        """Scrape several websites at once over one shared connection pool"""
+        import asyncio
+        
+        # Pick up edited or newly added site files before the run
+        self.sites.reload_if_changed()
+        
+        async with self._make_async_fetcher() as fetcher:
+            results = await asyncio.gather(*(
+                self.scrape_website_async(website, categories, location, max_jobs_per_site, fetcher)
+                for website in websites
+            ))
+        
+        all_jobs = [job.to_dict() for jobs in results for job in jobs]
+        if store is not None:
+            store.add_many(all_jobs)
+        return all_jobs
+    
+#    def save_to_json(self, jobs: List[Dict], filename: str):
+#        """Save jobs to JSON file"""
+#        with open(filename, 'w', encoding='utf-8') as f:
+#            json.dump(jobs, f, indent=2, ensure_ascii=False)
+#        
+#        logger.info(f"Saved {len(jobs)} jobs to {filename}")
+        
+    def save_to_json(self, jobs: List[Dict], filename: str):
+        """Save jobs to JSON file with numbered keys like JD001, JD002"""
+        
+        # Convert list to dict with keys JD001, JD002, etc.
+        jobs_dict = {
+            f"JD{str(index + 1).zfill(3)}": job
+            for index, job in enumerate(jobs)
+        }
+
+        with open(filename, 'w', encoding='utf-8') as f:
+            json.dump(jobs_dict, f, indent=2, ensure_ascii=False)
+
+        logger.info(f"Saved {len(jobs)} jobs to {filename}")
+
+# Example usage
+if __name__ == "__main__":
+    scraper = JobScraper()
+    
+    # Configuration
+    websites = ['linkedin', 'indeed']  # Add more websites as needed
+    categories = ['Python', 'Backend', 'Frontend', 'Database']
+    location = "New York, NY"  # Optional location filter
+    max_jobs_per_site = 25
+    
+    # Scrape jobs
+    jobs = scraper.scrape_all_websites(
+        websites=websites,
+        categories=categories,
+        location=location,
+        max_jobs_per_site=max_jobs_per_site
+    )
+    
+    # Save to JSON
+    scraper.save_to_json(jobs, 'scraped_jobs_ids.json')
+    
+    # Print summary
+    print(f"Total jobs scraped: {len(jobs)}")
+    
+    # Print category breakdown
+    category_counts = {}
+    tech_stack_counts = {}
+    
+    for job in jobs:
+        category = job['category']
+        category_counts[category] = category_counts.get(category, 0) + 1
+        
+        # Count technology occurrences
+        for tech in job['technology_stack']:
+            tech_stack_counts[tech] = tech_stack_counts.get(tech, 0) + 1
+    
+    print("\nJobs by category:")
+    for category, count in category_counts.items():
+        print(f"  {category}: {count}")
+    
+    print("\nTop 10 technologies mentioned:")
+    sorted_tech = sorted(tech_stack_counts.items(), key=lambda x: x[1], reverse=True)
+    for tech, count in sorted_tech[:10]:
+        print(f"  {tech}: {count}")
+
+    # Fold this run into the trend aggregates (jobs seen in earlier runs are skipped)
+    from trend_analytics import TrendStore
+    trends = TrendStore()
+    trends.update(jobs)
+    trends.save()
+    trends.close()
+
+    # Export per-stage timings and counters for this run
+    scraper.metrics.to_json('scrape_metrics.json')
+    scraper.metrics.to_prometheus('scrape_metrics.prom')
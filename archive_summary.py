@@ -0,0 +1,33 @@
+import argparse
+import json
+
+from job_archive import iter_jobs, summarize_jobs
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Job, category and technology counts over archives in constant memory")
+    parser.add_argument('archives', nargs='+', help="archives in any layout; split archives never decode text fields")
+    parser.add_argument('--top', type=int, default=10, help="number of technologies to list")
+    parser.add_argument('--json', action='store_true', help="print the summary as JSON")
+    args = parser.parse_args(argv)
+
+    summary = summarize_jobs(iter_jobs(args.archives, lazy=True))
+    if args.json:
+        summary['technologies'] = dict(summary['technologies'].most_common(args.top))
+        print(json.dumps(summary, indent=2, ensure_ascii=False))
+        return
+
+    print(f"Total jobs: {summary['jobs']}")
+    print("\nJobs by category:")
+    for category, count in summary['categories'].most_common():
+        print(f"  {category}: {count}")
+    print("\nJobs by website:")
+    for website, count in summary['sites'].most_common():
+        print(f"  {website}: {count}")
+    print(f"\nTop {args.top} technologies mentioned:")
+    for tech, count in summary['technologies'].most_common(args.top):
+        print(f"  {tech}: {count}")
+
+
+if __name__ == "__main__":
+    main()
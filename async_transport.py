@@ -0,0 +1,82 @@
+import asyncio
+import importlib.util
+import time
+from typing import Dict, Optional
+import logging
+
+import httpx
+
+logger = logging.getLogger(__name__)
+
+# HTTP/2 needs the optional 'h2' package; without it httpx negotiates HTTP/1.1 only
+HTTP2_AVAILABLE = importlib.util.find_spec('h2') is not None
+
+DEFAULT_MAX_CONNECTIONS = 200
+DEFAULT_MAX_KEEPALIVE = 50
+
+
+class SiteLimiter:
+    """Concurrency cap plus minimum spacing between request starts for one site"""
+
+    def __init__(self, concurrency: int = 1, min_interval: float = 0.0):
+        self.semaphore = asyncio.Semaphore(max(1, concurrency))
+        self.min_interval = min_interval
+        self._next_start = 0.0
+        self._lock = asyncio.Lock()
+
+    async def __aenter__(self):
+        await self.semaphore.acquire()
+        if self.min_interval > 0:
+            # Reserve the next start slot, then wait for it outside the lock
+            async with self._lock:
+                now = time.monotonic()
+                start = max(now, self._next_start)
+                self._next_start = start + self.min_interval
+            if start > now:
+                await asyncio.sleep(start - now)
+        return self
+
+    async def __aexit__(self, *exc):
+        self.semaphore.release()
+
+
+class AsyncFetcher:
+    """Pooled ``httpx.AsyncClient`` with per-site concurrency and rate limits.
+
+    One client (and connection pool) is shared by every site, with HTTP/2
+    when the server and the installed packages support it. Requests for a
+    site go through that site's SiteLimiter, so many fetches can be in flight
+    without exceeding any host's budget.
+    """
+
+    def __init__(self, headers: Optional[Dict[str, str]] = None, max_connections: int = DEFAULT_MAX_CONNECTIONS,
+                 max_keepalive_connections: int = DEFAULT_MAX_KEEPALIVE, timeout: float = 10.0,
+                 http2: Optional[bool] = None, transport: Optional[httpx.AsyncBaseTransport] = None):
+        self.client = httpx.AsyncClient(
+            headers=headers,
+            http2=HTTP2_AVAILABLE if http2 is None else http2,
+            limits=httpx.Limits(max_connections=max_connections, max_keepalive_connections=max_keepalive_connections),
+            timeout=timeout,
+            follow_redirects=True,
+            transport=transport
+        )
+        self._limiters: Dict[str, SiteLimiter] = {}
+
+    def set_site_limits(self, site: str, concurrency: int, min_interval: float):
+        self._limiters[site] = SiteLimiter(concurrency, min_interval)
+
+    async def get(self, url: str, site: str = '') -> httpx.Response:
+        limiter = self._limiters.get(site)
+        if limiter is None:
+            limiter = self._limiters[site] = SiteLimiter(concurrency=DEFAULT_MAX_CONNECTIONS)
+        async with limiter:
+            return await self.client.get(url)
+
+    async def aclose(self):
+        await self.client.aclose()
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        await self.aclose()
@@ -0,0 +1,223 @@
+import argparse
+import importlib
+import json
+import os
+import subprocess
+import sys
+import time
+from typing import Dict, List, Optional
+import logging
+
+from fixture_replay import FixtureStore, StandInServer, install_recorder, install_stand_in
+from scrape_metrics import ScrapeMetrics
+
+logger = logging.getLogger(__name__)
+
+# Descriptions rotated through synthetic detail pages; each one categorizes into a known category
+SYNTHETIC_DESCRIPTIONS = [
+    "We are hiring a Python developer to build Django and FastAPI services on AWS with PostgreSQL, Docker and Kubernetes. Salary $120,000 - $150,000.",
+    "Join our data team as a data engineer working with SQL, Spark, Kafka and Airflow pipelines on GCP. Experience with pandas and numpy is a plus.",
+    "Machine learning engineer wanted: deep learning with PyTorch and TensorFlow, MLOps on Azure, Python and Jupyter. $140k - $180k.",
+    "Business analyst to gather requirements, analyse data in SQL and Power BI, and work in an Agile Scrum team with Jira.",
+]
+
+
+def _synthetic_site_pages(website: str, config: Dict, count: int, offset: int):
+    """Build (search page HTML, [(detail url, detail HTML)]) matching a site's selectors"""
+    cards = []
+    details = []
+    for n in range(offset, offset + count):
+        title = f"Python Developer {n}"
+        company = f"Company {n % 17}"
+        place = "Sydney, New South Wales, Australia"
+        description = SYNTHETIC_DESCRIPTIONS[n % len(SYNTHETIC_DESCRIPTIONS)]
+        if website == 'linkedin':
+            href = f"{config['base_url']}/jobs/view/{n}"
+            cards.append(
+                f'<div class="job-search-card"><h3 class="base-search-card__title">{title}</h3>'
+                f'<h4 class="base-search-card__subtitle">{company}</h4>'
+                f'<span class="job-search-card__location">{place}</span>'
+                f'<a class="base-card__full-link" href="{href}"></a></div>'
+            )
+            detail = f'<div class="show-more-less-html__markup">{description}</div><p>Requirements: Python, SQL</p>'
+        elif website == 'indeed':
+            href = f"{config['base_url']}/viewjob?jk={n}"
+            cards.append(
+                f'<div data-jk="{n}"><h2 data-testid="job-title">{title}</h2>'
+                f'<span data-testid="company-name">{company}</span>'
+                f'<div data-testid="job-location">{place}</div>'
+                f'<a data-jk="{n}" href="/viewjob?jk={n}"></a></div>'
+            )
+            detail = f'<div id="jobDescriptionText" class="jobsearch-jobDescriptionText">{description}</div>'
+        elif website == 'remoteok':
+            href = f"{config['base_url']}/remote-jobs/{n}"
+            cards.append(
+                f'<tr class="job"><td class="position"><h2>{title}</h2></td>'
+                f'<td class="company"><h3>{company}</h3><div class="location">{place}</div></td>'
+                f'<td><a class="preventLink" href="/remote-jobs/{n}"></a></td></tr>'
+            )
+            detail = f'<div class="description">{description}</div>'
+        else:
+            raise ValueError(f"No synthetic page template for {website}")
+        details.append((href, f"<html><body>{detail}</body></html>"))
+
+    wrapper = '<table>{}</table>' if website == 'remoteok' else '<div>{}</div>'
+    return f"<html><body>{wrapper.format(''.join(cards))}</body></html>", details
+
+
+def make_synthetic_fixtures(scraper, store: FixtureStore, websites: List[str], categories: List[str],
+                            location: str, jobs_per_page: int):
+    """Fill a fixture store with synthetic search and detail pages for every site/category"""
+    offset = 0
+    for website in websites:
+        config = scraper.website_configs[website]
+        for category in categories:
+            search_url = config['base_url'] + config['job_search_path'].format(category, location)
+            search_html, details = _synthetic_site_pages(website, config, jobs_per_page, offset)
+            store.save(search_url, 200, search_html.encode('utf-8'))
+            for detail_url, detail_html in details:
+                store.save(detail_url, 200, detail_html.encode('utf-8'))
+            offset += jobs_per_page
+
+
+def peak_rss_mb() -> Optional[float]:
+    """Peak resident set size of this process in MB (None where unsupported, e.g. Windows)"""
+    try:
+        import resource
+    except ImportError:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is bytes on macOS and kilobytes on Linux
+    return round(peak / (1024 * 1024) if sys.platform == 'darwin' else peak / 1024, 2)
+
+
+def _round(value: Optional[float]) -> Optional[float]:
+    return round(value, 6) if value is not None else None
+
+
+def run_benchmark(scraper_class, store: FixtureStore, websites: List[str], categories: List[str], location: str,
+                  max_jobs: int, latency: float = 0.0, jitter: float = 0.0, error_rate: float = 0.0,
+                  seed: Optional[int] = None, transport: str = 'requests') -> Dict:
+    """Run scrape_all_websites end to end against a stand-in server and summarize it"""
+    scraper = scraper_class(transport=transport)
+    scraper.metrics = ScrapeMetrics(keep_samples=True)
+    scraper.request_delay = 0
+    scraper.site_delay = 0
+
+    with StandInServer(store, latency=latency, jitter=jitter, error_rate=error_rate, seed=seed) as server:
+        install_stand_in(scraper, server.url)
+        started = time.perf_counter()
+        jobs = scraper.scrape_all_websites(websites, categories, location, max_jobs)
+        elapsed = time.perf_counter() - started
+
+    job_latency = scraper.metrics.merged_histogram('job')
+    fetch_latency = scraper.metrics.merged_histogram('detail_fetch')
+    responses = scraper.metrics.to_dict()['counters'].get('responses', [])
+    return {
+        'jobs': len(jobs),
+        'elapsed_seconds': round(elapsed, 4),
+        'jobs_per_second': round(len(jobs) / elapsed, 2) if elapsed else None,
+        'job_latency_p50_seconds': _round(job_latency.quantile(0.5)),
+        'job_latency_p99_seconds': _round(job_latency.quantile(0.99)),
+        'detail_fetch_p50_seconds': _round(fetch_latency.quantile(0.5)),
+        'requests': sum(entry['value'] for entry in responses),
+        'peak_rss_mb': peak_rss_mb()
+    }
+
+
+# Runs in a fresh interpreter; times are seconds since the parent launched it
+STARTUP_PROBE = """
+import json, sys, time
+marks = {'interpreter': time.time()}
+started, module, server_url, website, category, transport = sys.argv[1:]
+import importlib
+scraper_module = importlib.import_module(module)
+marks['import'] = time.time()
+scraper = scraper_module.JobScraper(transport=transport)
+marks['construct'] = time.time()
+scraper.request_delay = 0
+from fixture_replay import install_stand_in
+install_stand_in(scraper, server_url)
+fetch, fetch_async = scraper._fetch, scraper._fetch_async
+def first_fetch(*args, **kwargs):
+    marks.setdefault('first_request', time.time())
+    return fetch(*args, **kwargs)
+async def first_fetch_async(*args, **kwargs):
+    marks.setdefault('first_request', time.time())
+    return await fetch_async(*args, **kwargs)
+scraper._fetch, scraper._fetch_async = first_fetch, first_fetch_async
+scraper.scrape_website(website, [category], '', 1)
+marks['first_job'] = time.time()
+print(json.dumps({stage: round(mark - float(started), 4) for stage, mark in marks.items()}))
+"""
+
+
+def measure_startup(module: str, store: FixtureStore, website: str, category: str,
+                    transport: str = 'requests') -> Dict:
+    """Cold-start timeline of one short scraper invocation in a fresh interpreter"""
+    with StandInServer(store) as server:
+        output = subprocess.run(
+            [sys.executable, '-c', STARTUP_PROBE, repr(time.time()), module, server.url, website, category, transport],
+            cwd=os.path.dirname(os.path.abspath(__file__)), capture_output=True, text=True, check=True
+        ).stdout
+    return json.loads(output.strip().splitlines()[-1])
+
+
+def record_fixtures(scraper_class, directory: str, websites: List[str], categories: List[str], location: str, max_jobs: int):
+    """Scrape live sites once, capturing every response into a fixture directory"""
+    scraper = scraper_class()
+    install_recorder(scraper, directory)
+    jobs = scraper.scrape_all_websites(websites, categories, location, max_jobs)
+    logger.info(f"Recorded fixtures for {len(jobs)} jobs into {directory}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Offline end-to-end scraper benchmark")
+    parser.add_argument('--module', default='JD_scrapper', help="module providing JobScraper (JD_scrapper or jd_aus)")
+    parser.add_argument('--fixtures', default='bench_fixtures', help="fixture directory to replay from")
+    parser.add_argument('--record', action='store_true', help="record fixtures from the live sites first")
+    parser.add_argument('--synthetic', type=int, default=0, metavar='N', help="generate N synthetic jobs per search page first")
+    parser.add_argument('--websites', nargs='+', default=['linkedin', 'indeed'])
+    parser.add_argument('--categories', nargs='+', default=['Python'])
+    parser.add_argument('--location', default='Australia')
+    parser.add_argument('--max-jobs', type=int, default=25)
+    parser.add_argument('--latency', type=float, default=0.0, help="injected per-request latency in seconds")
+    parser.add_argument('--jitter', type=float, default=0.0, help="extra random latency up to this many seconds")
+    parser.add_argument('--error-rate', type=float, default=0.0, help="probability of an injected HTTP error")
+    parser.add_argument('--seed', type=int, default=None)
+    parser.add_argument('--transport', choices=['requests', 'httpx'], default='requests')
+    parser.add_argument('--repeat', type=int, default=1)
+    parser.add_argument('--startup', action='store_true',
+                        help="measure cold-start time to the first request and first job instead of throughput")
+    parser.add_argument('--json', dest='json_path', default=None, help="write results to this JSON file")
+    args = parser.parse_args(argv)
+
+    scraper_class = importlib.import_module(args.module).JobScraper
+    store = FixtureStore(args.fixtures)
+
+    if args.record:
+        record_fixtures(scraper_class, args.fixtures, args.websites, args.categories, args.location, args.max_jobs)
+    if args.synthetic:
+        make_synthetic_fixtures(scraper_class(), store, args.websites, args.categories, args.location, args.synthetic)
+
+    results = []
+    for run in range(args.repeat if args.startup else 0):
+        result = measure_startup(args.module, store, args.websites[0], args.categories[0], args.transport)
+        results.append(result)
+        print(f"Run {run + 1}: " + ', '.join(f"{stage}={seconds * 1000:.0f}ms" for stage, seconds in result.items()))
+
+    for run in range(0 if args.startup else args.repeat):
+        result = run_benchmark(scraper_class, store, args.websites, args.categories, args.location, args.max_jobs,
+                               args.latency, args.jitter, args.error_rate, args.seed, args.transport)
+        results.append(result)
+        print(f"Run {run + 1}: {result['jobs']} jobs in {result['elapsed_seconds']}s "
+              f"({result['jobs_per_second']} jobs/sec), per-job p50={result['job_latency_p50_seconds']}s "
+              f"p99={result['job_latency_p99_seconds']}s, peak RSS={result['peak_rss_mb']} MB")
+
+    if args.json_path:
+        with open(args.json_path, 'w', encoding='utf-8') as f:
+            json.dump(results, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
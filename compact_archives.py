@@ -0,0 +1,160 @@
+import argparse
+import heapq
+import json
+import os
+import shutil
+import tempfile
+from itertools import groupby
+from typing import Callable, Dict, Iterable, Iterator, List, Optional
+import logging
+
+from job_archive import ArchiveWriter, SplitArchiveWriter, canonical_url, content_hash, iter_archive, stable_job_id
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+# Records held in memory per sorted run; bounds memory regardless of archive size
+DEFAULT_RUN_SIZE = 50000
+
+# Maximum number of runs merged at once; more runs are merged in several passes
+MAX_FAN_IN = 64
+
+SORT_KEYS: Dict[str, Callable[[Dict], List]] = {
+    'scraped_date': lambda record: [record['job'].get('scraped_date') or '', record['job_id']],
+    'job_id': lambda record: [record['job_id']],
+    'url': lambda record: [record['url_key'], record['job_id']],
+}
+
+
+class ExternalSorter:
+    """Sort an arbitrarily large stream of JSON records through temporary run files"""
+
+    def __init__(self, tmp_dir: str, run_size: int = DEFAULT_RUN_SIZE, fan_in: int = MAX_FAN_IN):
+        self.tmp_dir = tmp_dir
+        self.run_size = run_size
+        self.fan_in = fan_in
+        self._run_count = 0
+
+    def _new_run_path(self) -> str:
+        self._run_count += 1
+        return os.path.join(self.tmp_dir, f"run-{self._run_count:06d}.jsonl")
+
+    def _write_run(self, items: Iterable) -> str:
+        path = self._new_run_path()
+        with open(path, 'w', encoding='utf-8') as f:
+            for item in items:
+                f.write(json.dumps(item, ensure_ascii=False) + '\n')
+        return path
+
+    @staticmethod
+    def _read_run(path: str) -> Iterator:
+        with open(path, 'r', encoding='utf-8') as f:
+            for line in f:
+                yield json.loads(line)
+
+    def _merge(self, paths: List[str]) -> Iterator:
+        """Merge sorted runs; each run line is [sort_key, record]"""
+        return heapq.merge(*(self._read_run(path) for path in paths), key=lambda item: item[0])
+
+    def sort(self, records: Iterable[Dict], key: Callable[[Dict], List]) -> Iterator[Dict]:
+        runs = []
+        buffer = []
+        for record in records:
+            buffer.append([key(record), record])
+            if len(buffer) >= self.run_size:
+                buffer.sort(key=lambda item: item[0])
+                runs.append(self._write_run(buffer))
+                buffer = []
+
+        if not runs:
+            buffer.sort(key=lambda item: item[0])
+            for _, record in buffer:
+                yield record
+            return
+        if buffer:
+            buffer.sort(key=lambda item: item[0])
+            runs.append(self._write_run(buffer))
+            buffer = []
+
+        # Multi-pass merge keeps the number of open files bounded
+        while len(runs) > self.fan_in:
+            merged = []
+            for start in range(0, len(runs), self.fan_in):
+                group = runs[start:start + self.fan_in]
+                merged.append(self._write_run(self._merge(group)))
+                for path in group:
+                    os.remove(path)
+            runs = merged
+
+        for _, record in self._merge(runs):
+            yield record
+        for path in runs:
+            os.remove(path)
+
+
+def keep_newest(sorted_records: Iterable[Dict], group_field: str) -> Iterator[Dict]:
+    """Collapse adjacent records sharing ``group_field``, keeping the newest scraped_date"""
+    for _, group in groupby(sorted_records, key=lambda record: record[group_field]):
+        yield max(group, key=lambda record: record['job'].get('scraped_date') or '')
+
+
+def load_records(paths: Iterable[str]) -> Iterator[Dict]:
+    """Stream every job of every archive, tagged with its dedupe keys and stable ID"""
+    for path in paths:
+        count = 0
+        for _, job in iter_archive(path):
+            digest = content_hash(job)
+            yield {
+                'job_id': stable_job_id(job),
+                'url_key': canonical_url(job.get('url')) or digest,
+                'content_key': digest,
+                'job': job
+            }
+            count += 1
+        logger.info(f"Read {count} jobs from {path}")
+
+
+def compact_archives(paths: List[str], output: str, sort_by: str = 'scraped_date', jsonl: bool = False,
+                     run_size: int = DEFAULT_RUN_SIZE, tmp_dir: Optional[str] = None, split: bool = False) -> int:
+    """Merge archives into one deduplicated, sorted archive; returns the number of jobs written.
+
+    Jobs are deduplicated first by canonical URL, then by content hash, keeping
+    the most recently scraped copy each time. Every pass is an external merge
+    sort, so memory stays bounded by ``run_size`` records. ``split`` writes a
+    split archive (JSONL metadata plus a text blob) for lazy readers.
+    """
+    work_dir = tempfile.mkdtemp(prefix='compact-', dir=tmp_dir)
+    try:
+        sorter = ExternalSorter(work_dir, run_size)
+        by_url = keep_newest(sorter.sort(load_records(paths), lambda r: [r['url_key'], r['job'].get('scraped_date') or '']), 'url_key')
+        by_content = keep_newest(sorter.sort(by_url, lambda r: [r['content_key'], r['job'].get('scraped_date') or '']), 'content_key')
+        ordered = sorter.sort(by_content, SORT_KEYS[sort_by])
+
+        with (SplitArchiveWriter(output) if split else ArchiveWriter(output, jsonl=jsonl)) as writer:
+            for record in ordered:
+                writer.write(record['job_id'], record['job'])
+            written = writer.count
+    finally:
+        shutil.rmtree(work_dir, ignore_errors=True)
+
+    logger.info(f"Wrote {written} unique jobs to {output}")
+    return written
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Merge scraped job archives into one deduplicated archive")
+    parser.add_argument('archives', nargs='+', help="archives written by save_to_json (or JSON Lines)")
+    parser.add_argument('-o', '--output', required=True)
+    parser.add_argument('--sort-by', choices=sorted(SORT_KEYS), default='scraped_date')
+    parser.add_argument('--jsonl', action='store_true', help="write JSON Lines instead of the save_to_json layout")
+    parser.add_argument('--split', action='store_true',
+                        help="write JSONL metadata plus a <output>.text blob so text fields load lazily")
+    parser.add_argument('--run-size', type=int, default=DEFAULT_RUN_SIZE, help="records per in-memory sort run")
+    parser.add_argument('--tmp-dir', default=None, help="directory for temporary sort runs")
+    args = parser.parse_args(argv)
+
+    compact_archives(args.archives, args.output, args.sort_by, args.jsonl, args.run_size, args.tmp_dir, args.split)
+
+
+if __name__ == "__main__":
+    main()
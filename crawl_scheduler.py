@@ -0,0 +1,277 @@
+import argparse
+import heapq
+import importlib
+import json
+import os
+import time
+from collections import deque
+from dataclasses import asdict, dataclass
+from typing import Dict, List, Optional, Tuple
+import logging
+
+from fingerprint_store import FingerprintStore
+from job_archive import canonical_url
+from job_store import DEFAULT_STORE_DB, JobStore
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+DEFAULT_STATE_FILE = 'crawl_scheduler_state.json'
+
+# Requests each site may receive per rolling hour, unless overridden per site
+DEFAULT_HOURLY_BUDGET = 120
+
+# Recrawl intervals: a task yielding REFERENCE_YIELD new jobs per request is due every
+# MIN_INTERVAL; lower yields wait proportionally longer, up to MAX_INTERVAL
+MIN_INTERVAL = 30 * 60
+MAX_INTERVAL = 7 * 24 * 3600
+REFERENCE_YIELD = 0.5
+
+# One crawl says little about a search: until it has WARMUP_CRAWLS crawls, a task is
+# recrawled within WARMUP_INTERVAL even when it has yielded nothing so far
+WARMUP_CRAWLS = 3
+WARMUP_INTERVAL = 24 * 3600
+
+# Weight of the latest crawl in the yield moving average
+YIELD_ALPHA = 0.3
+
+BUDGET_WINDOW = 3600
+
+
+@dataclass
+class SearchTask:
+    """One (location, site, category) search and what crawling it has yielded so far"""
+    location: str
+    site: str
+    category: str
+    yield_ewma: Optional[float] = None  # new jobs per request; None until first crawled
+    last_crawled: float = 0.0
+    next_due: float = 0.0
+    crawls: int = 0
+    requests: int = 0
+    new_jobs: int = 0
+    last_requests: int = 0
+
+    @property
+    def key(self) -> str:
+        return f"{self.location}|{self.site}|{self.category}"
+
+    def score(self, now: float) -> float:
+        """Expected new jobs waiting: observed yield times time since the last crawl"""
+        if self.yield_ewma is None:
+            return float('inf')
+        return self.yield_ewma * (now - self.last_crawled)
+
+
+class CrawlScheduler:
+    """Continuous crawl that spends requests where new jobs keep appearing.
+
+    Tasks wait in a heap keyed by their next due time; high-yield tasks get
+    short recrawl intervals, dead ones drift towards MAX_INTERVAL. Among due
+    tasks the one with the highest yield × time since last crawl runs first,
+    as long as its site has budget left in the rolling hour. New jobs are
+    those whose URL the JobStore has not seen. Task statistics and recent
+    request counts are saved after every crawl, so restarts resume the
+    schedule.
+    """
+
+    def __init__(self, scraper, store: JobStore, state_path: str = DEFAULT_STATE_FILE,
+                 hourly_budget: int = DEFAULT_HOURLY_BUDGET, site_budgets: Optional[Dict[str, int]] = None,
+                 max_jobs: int = 20):
+        self.scraper = scraper
+        self.store = store
+        self.state_path = state_path
+        self.hourly_budget = hourly_budget
+        self.site_budgets = site_budgets or {}
+        self.max_jobs = max_jobs
+        self.tasks: Dict[str, SearchTask] = {}
+        self._spent: Dict[str, deque] = {}  # site -> (timestamp, requests) within the budget window
+        self._waiting: List[Tuple[float, str]] = []
+        self._ready: Dict[str, SearchTask] = {}
+        self.load()
+
+    def load(self):
+        if not os.path.exists(self.state_path):
+            return
+        with open(self.state_path, 'r', encoding='utf-8') as f:
+            state = json.load(f)
+        self.tasks = {task.key: task for task in (SearchTask(**fields) for fields in state['tasks'])}
+        self._spent = {site: deque(tuple(entry) for entry in entries) for site, entries in state['spent'].items()}
+
+    def save(self):
+        """Persist task statistics and budget usage (written to a temporary file, then swapped in)"""
+        state = {
+            'tasks': [asdict(task) for task in self.tasks.values()],
+            'spent': {site: list(entries) for site, entries in self._spent.items()}
+        }
+        tmp_path = self.state_path + '.tmp'
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(state, f, indent=2)
+        os.replace(tmp_path, self.state_path)
+
+    def schedule(self, sites: List[str], categories: List[str], locations: List[str]):
+        """Queue every combination; combinations never crawled are due immediately"""
+        self._waiting = []
+        self._ready = {}
+        for location in locations:
+            for site in sites:
+                if self.scraper.sites.get(site) is None:
+                    logger.error(f"Website {site} not supported")
+                    continue
+                for category in categories:
+                    task = SearchTask(location, site, category)
+                    task = self.tasks.setdefault(task.key, task)
+                    heapq.heappush(self._waiting, (task.next_due, task.key))
+
+    def interval(self, task: SearchTask) -> float:
+        if not task.yield_ewma:
+            interval = MAX_INTERVAL
+        else:
+            interval = min(max(MIN_INTERVAL * REFERENCE_YIELD / task.yield_ewma, MIN_INTERVAL), MAX_INTERVAL)
+        if task.crawls < WARMUP_CRAWLS:
+            interval = min(interval, WARMUP_INTERVAL)
+        return interval
+
+    def _budget_wait(self, site: str, cost: int, now: float) -> float:
+        """Seconds until the site can spend ``cost`` more requests within its hourly budget"""
+        spent = self._spent.setdefault(site, deque())
+        while spent and spent[0][0] <= now - BUDGET_WINDOW:
+            spent.popleft()
+        budget = self.site_budgets.get(site, self.hourly_budget)
+        used = sum(count for _, count in spent)
+        if used == 0 or used + cost <= budget:
+            return 0.0
+        # Oldest spending expires first; wait until enough of it has left the window
+        for timestamp, count in spent:
+            used -= count
+            if used + cost <= budget or used == 0:
+                return timestamp + BUDGET_WINDOW - now
+        return BUDGET_WINDOW
+
+    def next_task(self, now: float) -> Tuple[Optional[SearchTask], float]:
+        """Best due task its site can afford, or None and how long to wait for one"""
+        while self._waiting and self._waiting[0][0] <= now:
+            _, key = heapq.heappop(self._waiting)
+            self._ready[key] = self.tasks[key]
+
+        wait = self._waiting[0][0] - now if self._waiting else MAX_INTERVAL
+        for task in sorted(self._ready.values(), key=lambda task: task.score(now), reverse=True):
+            budget_wait = self._budget_wait(task.site, task.last_requests or self.max_jobs + 1, now)
+            if budget_wait <= 0:
+                del self._ready[task.key]
+                return task, 0.0
+            wait = min(wait, budget_wait)
+        return None, wait
+
+    def crawl(self, task: SearchTask) -> int:
+        """Run one search task; returns how many jobs it found that the store did not have"""
+        started = time.time()
+        # Every attempt costs budget, including timeouts and connection errors that never got a response
+        requests_before = self.scraper.metrics.total('requests', site=task.site)
+        try:
+            jobs = [job.to_dict() for job in self.scraper.scrape_website(task.site, [task.category], task.location, self.max_jobs)]
+        finally:
+            # Charged even when the crawl raises, so a failing site cannot exceed its budget
+            requests = int(self.scraper.metrics.total('requests', site=task.site) - requests_before)
+            self._spent.setdefault(task.site, deque()).append((started, requests))
+
+        new_urls = set()
+        for job in jobs:
+            key = canonical_url(job.get('url'))
+            if key not in new_urls and not self.store.has_url(job.get('url')):
+                new_urls.add(key)
+        self.store.add_many(jobs)
+
+        observed = len(new_urls) / max(requests, 1)
+        task.yield_ewma = observed if task.yield_ewma is None else YIELD_ALPHA * observed + (1 - YIELD_ALPHA) * task.yield_ewma
+        task.last_crawled = started
+        task.crawls += 1
+        task.next_due = started + self.interval(task)
+        task.requests += requests
+        task.new_jobs += len(new_urls)
+        task.last_requests = requests
+        heapq.heappush(self._waiting, (task.next_due, task.key))
+
+        self.scraper.metrics.inc('scheduler_new_jobs', len(new_urls), site=task.site)
+        logger.info(f"{task.key}: {len(new_urls)} new of {len(jobs)} jobs for {requests} requests, "
+                    f"next crawl in {self.interval(task) / 3600:.1f}h")
+        return len(new_urls)
+
+    def run(self, max_crawls: Optional[int] = None, max_sleep: float = 60.0) -> int:
+        """Crawl due tasks until ``max_crawls`` (forever by default); returns the crawls made"""
+        crawls = 0
+        while max_crawls is None or crawls < max_crawls:
+            task, wait = self.next_task(time.time())
+            if task is None:
+                time.sleep(min(wait, max_sleep))
+                continue
+            try:
+                self.crawl(task)
+            except Exception as e:
+                logger.error(f"Crawl of {task.key} failed: {str(e)}")
+                task.next_due = time.time() + MIN_INTERVAL
+                heapq.heappush(self._waiting, (task.next_due, task.key))
+            self.save()
+            crawls += 1
+        return crawls
+
+
+def _parse_site_budgets(values: List[str]) -> Dict[str, int]:
+    budgets = {}
+    for value in values:
+        site, _, budget = value.partition('=')
+        budgets[site] = int(budget)
+    return budgets
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Continuous crawl prioritized by new-job yield and staleness")
+    parser.add_argument('--state', default=DEFAULT_STATE_FILE, help="JSON file with task statistics and budget usage")
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    run = commands.add_parser('run', help="crawl due searches until interrupted")
+    run.add_argument('--module', default='jd_aus', help="module providing JobScraper (jd_aus or JD_scrapper)")
+    run.add_argument('--sites', nargs='+', required=True)
+    run.add_argument('--categories', nargs='+', required=True)
+    run.add_argument('--locations', nargs='+', default=[''])
+    run.add_argument('--store', default=DEFAULT_STORE_DB, help="JobStore database used to tell new jobs apart")
+    run.add_argument('--max-jobs', type=int, default=20, help="job cards taken per search")
+    run.add_argument('--budget', type=int, default=DEFAULT_HOURLY_BUDGET, help="requests per site per hour")
+    run.add_argument('--site-budget', nargs='*', default=[], metavar='SITE=N', help="per-site hourly budget overrides")
+    run.add_argument('--max-crawls', type=int, default=None, help="stop after this many searches")
+    run.add_argument('--fingerprint-db', default=None, help="skip job pages whose search card is unchanged since the last fetch")
+
+    commands.add_parser('status', help="show every task's yield and schedule")
+    args = parser.parse_args(argv)
+
+    if args.command == 'status':
+        if not os.path.exists(args.state):
+            print(f"No scheduler state in {args.state}")
+            return
+        with open(args.state, 'r', encoding='utf-8') as f:
+            tasks = [SearchTask(**fields) for fields in json.load(f)['tasks']]
+        now = time.time()
+        for task in sorted(tasks, key=lambda task: task.next_due):
+            yield_text = '-' if task.yield_ewma is None else f"{task.yield_ewma:.3f}"
+            due = 'now' if task.next_due <= now else f"in {(task.next_due - now) / 3600:.1f}h"
+            print(f"{task.key:<50} yield {yield_text:>6}  crawls {task.crawls:>4}  new {task.new_jobs:>5}  "
+                  f"requests {task.requests:>6}  due {due}")
+        return
+
+    scraper = importlib.import_module(args.module).JobScraper()
+    if args.fingerprint_db:
+        scraper.fingerprints = FingerprintStore(args.fingerprint_db)
+    with JobStore(args.store) as store:
+        scheduler = CrawlScheduler(scraper, store, args.state, args.budget, _parse_site_budgets(args.site_budget),
+                                   args.max_jobs)
+        scheduler.schedule(args.sites, args.categories, args.locations)
+        try:
+            scheduler.run(args.max_crawls)
+        except KeyboardInterrupt:
+            logger.info("Stopping scheduler")
+        finally:
+            scheduler.save()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,227 @@
+import argparse
+import importlib
+import multiprocessing
+import os
+import socket
+import time
+from typing import List
+from urllib.parse import urlparse
+import logging
+
+from fingerprint_store import FingerprintStore
+from enrichment_cache import EnrichmentCache
+from html_archive import HtmlArchive
+from job_archive import ArchiveWriter, canonical_url, stable_job_id
+from work_queue import Task, WorkQueue
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+DEFAULT_QUEUE_DB = 'crawl_queue.db'
+
+
+def enqueue_searches(queue: WorkQueue, scraper, sites: List[str], categories: List[str], locations: List[str],
+                     max_jobs: int) -> int:
+    """Shard the crawl into one search task per (location, site, category).
+
+    Only the first result page is queued; workers queue each following page
+    while the search still needs cards, so no request goes to pages past max_jobs.
+    """
+    # A new generation re-queues searches (and later their job pages) finished by earlier crawls
+    generation = queue.start_generation()
+    added = 0
+    for location in locations:
+        for site in sites:
+            adapter = scraper.sites.get(site)
+            if adapter is None:
+                logger.error(f"Website {site} not supported")
+                continue
+            for category in categories:
+                url = adapter.search_urls(category, location)[0]
+                payload = {'site': site, 'category': category, 'location': location, 'url': url, 'max_jobs': max_jobs,
+                           'page': 0, 'cards': 0}
+                added += queue.put('search', f"search:{url}", payload, generation)
+    return added
+
+
+class CrawlWorker:
+    """Runs JobScraper against the shared queue until there is no work left"""
+
+    def __init__(self, queue: WorkQueue, scraper, worker_id: str, lease_seconds: float = 120.0, max_attempts: int = 3):
+        self.queue = queue
+        self.scraper = scraper
+        self.worker_id = worker_id
+        self.lease_seconds = lease_seconds
+        self.max_attempts = max_attempts
+
+    def _throttle(self, adapter, url: str):
+        """Wait for the next global request slot of the URL's host, with the site's delay"""
+        delay = self.scraper.request_delay if self.scraper.request_delay is not None else adapter.request_delay
+        wait = self.queue.reserve_slot(urlparse(url).netloc, delay)
+        if wait > 0:
+            self.scraper._sleep(wait, adapter.name)
+
+    def _handle_search(self, payload, generation: int = 0):
+        adapter = self.scraper.sites.get(payload['site'])
+        self._throttle(adapter, payload['url'])
+        response = self.scraper._fetch(payload['url'], adapter.name, 'search_fetch')
+        with self.scraper.metrics.timer('search_parse', adapter.name):
+            cards = self.scraper._parse_job_cards(response.content, adapter)
+        # Cards of earlier pages count towards max_jobs, as in a sequential scrape
+        cards = cards[:payload['max_jobs'] - payload.get('cards', 0)]
+        # Unchanged cards are skipped: the results table still holds the job from an earlier crawl
+        for card in self.scraper._changed_cards(cards, adapter.name):
+            # Detail URLs are deduped across every search of the same crawl that lists them
+            self.queue.put('detail', f"detail:{canonical_url(card['url'])}",
+                           {'site': adapter.name, 'category': payload['category'], 'card': card}, generation)
+
+        # Queue the next result page only while the search needs more cards and this page had some
+        collected = payload.get('cards', 0) + len(cards)
+        page = payload.get('page', 0) + 1
+        urls = adapter.search_urls(payload['category'], payload['location'])
+        if cards and collected < payload['max_jobs'] and page < len(urls):
+            self.queue.put('search', f"search:{urls[page]}",
+                           {**payload, 'url': urls[page], 'page': page, 'cards': collected}, generation)
+
+    def _handle_detail(self, payload):
+        adapter = self.scraper.sites.get(payload['site'])
+        card = payload['card']
+        self._throttle(adapter, card['url'])
+        response = self.scraper._fetch(card['url'], adapter.name, 'detail_fetch')
+        with self.scraper.metrics.timer('detail_parse', adapter.name):
+            details = self.scraper._parse_job_details(response.content, adapter)
+        job = self.scraper._build_job(card, details, adapter.name)
+        self.scraper._remember_card(card, details, job)
+        if job:
+            job_dict = job.to_dict()
+            if self.queue.add_result(stable_job_id(job_dict), job_dict, self.worker_id):
+                self.scraper.metrics.record_job(adapter.name, payload['category'])
+
+    def process(self, task: Task):
+        if self.scraper.sites.get(task.payload['site']) is None:
+            raise ValueError(f"Website {task.payload['site']} not supported")
+        if task.kind == 'search':
+            self._handle_search(task.payload, task.generation)
+        else:
+            self._handle_detail(task.payload)
+
+    def run(self, idle_timeout: float = 10.0, poll_interval: float = 0.5) -> int:
+        """Lease and process tasks; stops once the queue has been drained for ``idle_timeout`` seconds"""
+        processed = 0
+        idle_since = None
+        while True:
+            task = self.queue.lease(self.worker_id, self.lease_seconds)
+            if task is None:
+                # Make archived pages visible in the index while waiting for work
+                self.scraper._flush_archive()
+                idle_since = idle_since or time.monotonic()
+                if not self.queue.has_unfinished() or time.monotonic() - idle_since > idle_timeout:
+                    return processed
+                time.sleep(poll_interval)
+                continue
+            idle_since = None
+            try:
+                self.process(task)
+                self.queue.ack(task, self.worker_id)
+            except Exception as e:
+                logger.error(f"Task {task.id} ({task.kind}) failed: {str(e)}")
+                self.queue.nack(task, self.worker_id, str(e), self.max_attempts)
+            processed += 1
+
+
+def run_worker(db_path: str, module: str, idle_timeout: float, lease_seconds: float, fingerprint_db: str = None,
+               enrichment_db: str = None, html_archive: str = None):
+    """Entry point of one worker process"""
+    worker_id = f"{socket.gethostname()}-{os.getpid()}"
+    scraper = importlib.import_module(module).JobScraper()
+    if fingerprint_db:
+        scraper.fingerprints = FingerprintStore(fingerprint_db)
+    if enrichment_db:
+        scraper.enrichment_cache = EnrichmentCache(enrichment_db)
+    if html_archive:
+        scraper.html_archive = HtmlArchive(html_archive)
+    queue = WorkQueue(db_path)
+    try:
+        processed = CrawlWorker(queue, scraper, worker_id, lease_seconds).run(idle_timeout)
+    finally:
+        queue.close()
+        if scraper.enrichment_cache is not None:
+            scraper.enrichment_cache.close()
+        if scraper.html_archive is not None:
+            scraper.html_archive.close()
+    logger.info(f"Worker {worker_id} processed {processed} tasks")
+    scraper.metrics.to_json(f"scrape_metrics_{worker_id}.json")
+
+
+def run_workers(db_path: str, module: str, processes: int, idle_timeout: float, lease_seconds: float,
+                fingerprint_db: str = None, enrichment_db: str = None, html_archive: str = None):
+    workers = [
+        multiprocessing.Process(target=run_worker,
+                                args=(db_path, module, idle_timeout, lease_seconds, fingerprint_db, enrichment_db,
+                                      html_archive))
+        for _ in range(processes)
+    ]
+    for worker in workers:
+        worker.start()
+    for worker in workers:
+        worker.join()
+
+
+def export_results(queue: WorkQueue, filename: str) -> int:
+    """Write every deduped result in the save_to_json layout, keyed by stable job ID"""
+    with ArchiveWriter(filename) as writer:
+        for job_key, job in queue.iter_results():
+            writer.write(job_key, job)
+        count = writer.count
+    logger.info(f"Saved {count} jobs to {filename}")
+    return count
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Sharded crawl: a coordinator fills a shared queue, workers drain it")
+    parser.add_argument('--db', default=DEFAULT_QUEUE_DB, help="SQLite queue database shared by all workers")
+    parser.add_argument('--module', default='jd_aus', help="module providing JobScraper (jd_aus or JD_scrapper)")
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    enqueue = commands.add_parser('enqueue', help="shard (location, site, category) searches into the queue")
+    enqueue.add_argument('--sites', nargs='+', required=True)
+    enqueue.add_argument('--categories', nargs='+', required=True)
+    enqueue.add_argument('--locations', nargs='+', default=[''])
+    enqueue.add_argument('--max-jobs', type=int, default=20, help="job cards taken per search, across its result pages")
+
+    work = commands.add_parser('work', help="run worker processes until the queue is drained")
+    work.add_argument('--processes', type=int, default=os.cpu_count() or 1)
+    work.add_argument('--idle-timeout', type=float, default=10.0)
+    work.add_argument('--lease-seconds', type=float, default=120.0)
+    work.add_argument('--fingerprint-db', default=None, help="skip job pages whose search card is unchanged since the last fetch")
+    work.add_argument('--enrichment-db', default=None, help="reuse tech stack and category results for repeated job text")
+    work.add_argument('--html-archive', default=None, help="archive directory keeping every fetched page for re-parsing")
+
+    export = commands.add_parser('export', help="write collected jobs to a JSON archive")
+    export.add_argument('-o', '--output', default='scraped_jobs_distributed.json')
+
+    commands.add_parser('status', help="show task and result counts")
+    args = parser.parse_args(argv)
+
+    if args.command == 'work':
+        run_workers(args.db, args.module, args.processes, args.idle_timeout, args.lease_seconds, args.fingerprint_db,
+                    args.enrichment_db, args.html_archive)
+        return
+
+    queue = WorkQueue(args.db)
+    try:
+        if args.command == 'enqueue':
+            scraper = importlib.import_module(args.module).JobScraper()
+            added = enqueue_searches(queue, scraper, args.sites, args.categories, args.locations, args.max_jobs)
+            print(f"Queued {added} search tasks")
+        elif args.command == 'export':
+            export_results(queue, args.output)
+        elif args.command == 'status':
+            for name, count in sorted(queue.stats().items()):
+                print(f"  {name}: {count}")
+    finally:
+        queue.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,107 @@
+import hashlib
+import json
+import sqlite3
+import time
+from typing import Dict, List, Optional, Tuple
+
+from tech_matcher import TechMatcher
+
+DEFAULT_CACHE_DB = 'enrichment_cache.db'
+
+# Entries kept before the least recently used ones are evicted
+DEFAULT_MAX_ENTRIES = 200000
+
+# Inserts between checks of the entry count
+EVICT_EVERY = 1000
+
+# Cache hits whose LRU refresh is held in memory before being written in one statement
+TOUCH_BATCH_SIZE = 1000
+
+
+def enrichment_version(categories: Dict[str, List[str]], matcher: TechMatcher) -> str:
+    """Hash of the categories and the matcher's keyword configuration; changing either starts a fresh set of entries"""
+    config = {'categories': categories, 'tech': matcher.config_key}
+    return hashlib.sha1(json.dumps(config, sort_keys=True).encode('utf-8')).hexdigest()[:16]
+
+
+def enrichment_key(version: str, title: str, description: str, requirements: str) -> str:
+    """Content hash of a job's text under one configuration version.
+
+    Takes the cleaned text that enrichment reads, so markup-only changes to a page still hit.
+    """
+    text = '\x1f'.join((version, title or '', description or '', requirements or ''))
+    return hashlib.sha1(text.encode('utf-8')).hexdigest()
+
+
+class EnrichmentCache:
+    """Technology stack and category per job text, persisted across runs (SQLite, LRU-bounded).
+
+    Keys include the configuration version, so entries computed with other
+    categories or keywords never match and age out through LRU eviction.
+    """
+
+    def __init__(self, path: str = DEFAULT_CACHE_DB, max_entries: int = DEFAULT_MAX_ENTRIES):
+        self.max_entries = max_entries
+        self.conn = sqlite3.connect(path, timeout=30.0, isolation_level=None)
+        self.conn.execute('PRAGMA journal_mode=WAL')
+        self.conn.execute('PRAGMA synchronous=NORMAL')
+        self.conn.execute(
+            """CREATE TABLE IF NOT EXISTS enrichment (
+                   key TEXT PRIMARY KEY,
+                   technology_stack TEXT NOT NULL,
+                   category TEXT NOT NULL,
+                   last_used REAL NOT NULL
+               )"""
+        )
+        self.conn.execute('CREATE INDEX IF NOT EXISTS enrichment_last_used ON enrichment (last_used)')
+        self._inserts = 0
+        self._touched = {}  # key -> last_used not yet written
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key: str) -> Optional[Tuple[List[str], str]]:
+        """Cached (technology_stack, category), refreshing the entry's LRU position on the next flush"""
+        row = self.conn.execute('SELECT technology_stack, category FROM enrichment WHERE key = ?', (key,)).fetchone()
+        if row is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        self._touched[key] = time.time()
+        if len(self._touched) >= TOUCH_BATCH_SIZE:
+            self.flush()
+        return json.loads(row[0]), row[1]
+
+    def put(self, key: str, technology_stack: List[str], category: str):
+        self.conn.execute(
+            'INSERT OR REPLACE INTO enrichment (key, technology_stack, category, last_used) VALUES (?, ?, ?, ?)',
+            (key, json.dumps(technology_stack), category, time.time())
+        )
+        self._touched.pop(key, None)
+        self._inserts += 1
+        if self._inserts % EVICT_EVERY == 0:
+            self.evict()
+
+    def flush(self):
+        """Write the pending LRU refreshes of cache hits in one transaction"""
+        if not self._touched:
+            return
+        touched = [(last_used, key) for key, last_used in self._touched.items()]
+        self._touched = {}
+        self.conn.execute('BEGIN')
+        self.conn.executemany('UPDATE enrichment SET last_used = ? WHERE key = ?', touched)
+        self.conn.execute('COMMIT')
+
+    def evict(self) -> int:
+        """Drop least recently used entries beyond max_entries; returns how many were dropped"""
+        self.flush()
+        excess = self.conn.execute('SELECT COUNT(*) FROM enrichment').fetchone()[0] - self.max_entries
+        if excess <= 0:
+            return 0
+        self.conn.execute(
+            'DELETE FROM enrichment WHERE key IN (SELECT key FROM enrichment ORDER BY last_used LIMIT ?)', (excess,)
+        )
+        return excess
+
+    def close(self):
+        self.evict()
+        self.conn.close()
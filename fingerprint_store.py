@@ -0,0 +1,69 @@
+import hashlib
+import json
+import re
+import sqlite3
+import time
+from typing import Dict, Optional
+
+from job_archive import canonical_url
+
+# Re-fetch a job page at least this often even when its search card is unchanged
+DEFAULT_MAX_AGE = 7 * 24 * 3600
+
+CARD_FINGERPRINT_FIELDS = ('title', 'company', 'location', 'listed_date', 'snippet')
+
+_WHITESPACE = re.compile(r'\s+')
+
+
+def card_fingerprint(card: Dict) -> str:
+    """Cheap hash of what a search result card shows about a job"""
+    parts = [_WHITESPACE.sub(' ', str(card.get(field) or '')).strip().lower() for field in CARD_FINGERPRINT_FIELDS]
+    return hashlib.sha1('\x1f'.join(parts).encode('utf-8')).hexdigest()
+
+
+class FingerprintStore:
+    """Last seen card fingerprint, detail fetch time and built listing per job URL (SQLite).
+
+    The listing is kept so a scrape that skips an unchanged job page can
+    still return the job instead of dropping it.
+    """
+
+    def __init__(self, path: str, max_age: float = DEFAULT_MAX_AGE):
+        self.max_age = max_age
+        self.conn = sqlite3.connect(path, timeout=30.0, isolation_level=None)
+        self.conn.execute('PRAGMA journal_mode=WAL')
+        self.conn.execute(
+            """CREATE TABLE IF NOT EXISTS card_fingerprints (
+                   url_key TEXT PRIMARY KEY,
+                   fingerprint TEXT NOT NULL,
+                   fetched_at REAL NOT NULL,
+                   job TEXT
+               )"""
+        )
+        columns = {row[1] for row in self.conn.execute('PRAGMA table_info(card_fingerprints)')}
+        if 'job' not in columns:
+            # Stores created before listings were kept; their rows are refetched once
+            self.conn.execute('ALTER TABLE card_fingerprints ADD COLUMN job TEXT')
+
+    def unchanged_job(self, url: str, fingerprint: str, now: Optional[float] = None) -> Optional[Dict]:
+        """Stored listing of an unchanged card with details younger than max_age, else None"""
+        row = self.conn.execute(
+            'SELECT fingerprint, fetched_at, job FROM card_fingerprints WHERE url_key = ?', (canonical_url(url),)
+        ).fetchone()
+        if row is None or row[2] is None:
+            return None
+        now = time.time() if now is None else now
+        if row[0] != fingerprint or now - row[1] >= self.max_age:
+            return None
+        return json.loads(row[2])
+
+    def record(self, url: str, fingerprint: str, job: Optional[Dict] = None, fetched_at: Optional[float] = None):
+        """Remember the card fingerprint and the listing built after its detail page was fetched"""
+        self.conn.execute(
+            'INSERT OR REPLACE INTO card_fingerprints (url_key, fingerprint, fetched_at, job) VALUES (?, ?, ?, ?)',
+            (canonical_url(url), fingerprint, time.time() if fetched_at is None else fetched_at,
+             json.dumps(job, ensure_ascii=False) if job is not None else None)
+        )
+
+    def close(self):
+        self.conn.close()
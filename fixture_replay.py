@@ -0,0 +1,231 @@
+import hashlib
+import json
+import os
+import random
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, Iterator, Optional
+from urllib.parse import parse_qs, quote, urlparse
+import logging
+
+import requests
+
+logger = logging.getLogger(__name__)
+
+
+def fixture_key(url: str) -> str:
+    """Stable file name stem for a URL"""
+    return hashlib.sha1(url.encode('utf-8')).hexdigest()
+
+
+class FixtureStore:
+    """Directory of recorded responses: <key>.json metadata next to a <key>.body payload"""
+
+    def __init__(self, directory: str):
+        self.directory = directory
+        os.makedirs(directory, exist_ok=True)
+
+    def _paths(self, url: str):
+        key = fixture_key(url)
+        return os.path.join(self.directory, f"{key}.json"), os.path.join(self.directory, f"{key}.body")
+
+    def save(self, url: str, status_code: int, content: bytes, content_type: str = 'text/html; charset=utf-8'):
+        meta_path, body_path = self._paths(url)
+        with open(body_path, 'wb') as f:
+            f.write(content)
+        with open(meta_path, 'w', encoding='utf-8') as f:
+            json.dump({'url': url, 'status_code': status_code, 'content_type': content_type}, f, indent=2)
+
+    def load(self, url: str) -> Optional[Dict]:
+        """Return the recorded response for a URL, or None if it was never captured"""
+        meta_path, body_path = self._paths(url)
+        if not os.path.exists(meta_path):
+            return None
+        with open(meta_path, 'r', encoding='utf-8') as f:
+            meta = json.load(f)
+        with open(body_path, 'rb') as f:
+            meta['content'] = f.read()
+        return meta
+
+    def urls(self) -> Iterator[str]:
+        for name in sorted(os.listdir(self.directory)):
+            if name.endswith('.json'):
+                with open(os.path.join(self.directory, name), 'r', encoding='utf-8') as f:
+                    yield json.load(f)['url']
+
+
+def _build_response(url: str, status_code: int, content: bytes, content_type: str) -> requests.Response:
+    response = requests.Response()
+    response.url = url
+    response.status_code = status_code
+    response._content = content
+    response.headers['Content-Type'] = content_type
+    response.encoding = 'utf-8'
+    return response
+
+
+class RecordingSession(requests.Session):
+    """Session that performs real requests and writes every GET response to a FixtureStore"""
+
+    def __init__(self, store: FixtureStore):
+        super().__init__()
+        self.store = store
+
+    def request(self, method, url, *args, **kwargs):
+        response = super().request(method, url, *args, **kwargs)
+        if method.upper() == 'GET':
+            self.store.save(url, response.status_code, response.content,
+                            response.headers.get('Content-Type', 'text/html; charset=utf-8'))
+        return response
+
+
+class ReplaySession(requests.Session):
+    """Session that answers GETs from a FixtureStore without touching the network.
+
+    URLs that were never recorded come back as 404 so the scraper's normal
+    error handling runs.
+    """
+
+    def __init__(self, store: FixtureStore):
+        super().__init__()
+        self.store = store
+
+    def request(self, method, url, *args, **kwargs):
+        fixture = self.store.load(url)
+        if fixture is None:
+            logger.warning(f"No fixture recorded for {url}")
+            return _build_response(url, 404, b'', 'text/plain')
+        return _build_response(url, fixture['status_code'], fixture['content'], fixture['content_type'])
+
+
+class StandInSession(requests.Session):
+    """Session that sends every request to a local StandInServer instead of the real host"""
+
+    def __init__(self, server_url: str):
+        super().__init__()
+        self.server_url = server_url.rstrip('/')
+
+    def request(self, method, url, *args, **kwargs):
+        return super().request(method, f"{self.server_url}/replay?url={quote(url, safe='')}", *args, **kwargs)
+
+
+def make_stand_in_async_transport(server_url: str):
+    """httpx async transport sending every request to a StandInServer (for transport='httpx')"""
+    import httpx
+
+    class StandInAsyncTransport(httpx.AsyncHTTPTransport):
+        async def handle_async_request(self, request):
+            target = str(request.url)
+            request.url = httpx.URL(f"{server_url.rstrip('/')}/replay", params={'url': target})
+            response = await super().handle_async_request(request)
+            # Report the original URL so redirects and relative links resolve as on the real site
+            request.url = httpx.URL(target)
+            return response
+
+    return StandInAsyncTransport()
+
+
+class StandInServer:
+    """Local HTTP server replaying a FixtureStore with injected latency and errors.
+
+    Each request sleeps ``latency`` seconds plus up to ``jitter`` seconds, and
+    fails with ``error_status`` with probability ``error_rate``.
+    """
+
+    def __init__(self, store: FixtureStore, host: str = '127.0.0.1', port: int = 0,
+                 latency: float = 0.0, jitter: float = 0.0, error_rate: float = 0.0,
+                 error_status: int = 503, seed: Optional[int] = None):
+        self.store = store
+        self.latency = latency
+        self.jitter = jitter
+        self.error_rate = error_rate
+        self.error_status = error_status
+        self._random = random.Random(seed)
+        self._random_lock = threading.Lock()
+        self._httpd = ThreadingHTTPServer((host, port), self._make_handler())
+        self._httpd.daemon_threads = True
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def url(self) -> str:
+        host, port = self._httpd.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def _make_handler(self):
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = 'HTTP/1.1'
+            # Headers and body go out in separate writes; with Nagle on, every
+            # keep-alive request would stall on the client's delayed ACK
+            disable_nagle_algorithm = True
+
+            def do_GET(self):
+                with server._random_lock:
+                    delay = server.latency + server._random.random() * server.jitter
+                    fail = server._random.random() < server.error_rate
+                if delay:
+                    time.sleep(delay)
+
+                target = parse_qs(urlparse(self.path).query).get('url', [None])[0]
+                fixture = server.store.load(target) if target else None
+                if fail:
+                    self._send(server.error_status, b'injected error', 'text/plain')
+                elif fixture is None:
+                    self._send(404, b'no fixture', 'text/plain')
+                else:
+                    self._send(fixture['status_code'], fixture['content'], fixture['content_type'])
+
+            def _send(self, status, body, content_type):
+                self.send_response(status)
+                self.send_header('Content-Type', content_type)
+                self.send_header('Content-Length', str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format, *args):
+                logger.debug(format % args)
+
+        return Handler
+
+    def start(self) -> 'StandInServer':
+        self._thread = threading.Thread(target=self._httpd.serve_forever, name='stand-in-server', daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._httpd.shutdown()
+        self._httpd.server_close()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+
+def _swap_session(scraper, session: requests.Session) -> requests.Session:
+    session.headers.update(scraper.session.headers)
+    scraper.session = session
+    return session
+
+
+def install_recorder(scraper, directory: str) -> RecordingSession:
+    """Make a JobScraper record every response it fetches into ``directory``"""
+    return _swap_session(scraper, RecordingSession(FixtureStore(directory)))
+
+
+def install_replay(scraper, directory: str) -> ReplaySession:
+    """Make a JobScraper answer every request from fixtures in ``directory``"""
+    return _swap_session(scraper, ReplaySession(FixtureStore(directory)))
+
+
+def install_stand_in(scraper, server_url: str) -> StandInSession:
+    """Route every JobScraper request, sync or async, through a running StandInServer"""
+    if getattr(scraper, 'transport', 'requests') == 'httpx':
+        scraper.async_transport = make_stand_in_async_transport(server_url)
+    return _swap_session(scraper, StandInSession(server_url))
@@ -0,0 +1,429 @@
+import argparse
+import gzip
+import importlib
+import json
+import os
+import sqlite3
+import time
+import zlib
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+from itertools import islice
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Tuple
+import logging
+
+from job_archive import ArchiveWriter, canonical_url, stable_job_id
+from structured_data import find_job_posting
+
+try:
+    import zstandard
+except ImportError:  # optional; records are gzip-compressed without it
+    zstandard = None
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+DEFAULT_ARCHIVE_DIR = 'html_archive'
+
+# A writer starts a new segment file once its current one reaches this size
+DEFAULT_SEGMENT_BYTES = 256 * 1024 * 1024
+
+# Index rows buffered before one transaction
+INDEX_BATCH_SIZE = 100
+
+# Records parsed per worker task during re-parsing
+REPARSE_CHUNK_SIZE = 200
+
+# Worker tasks submitted ahead of the one being collected, per process
+REPARSE_TASKS_AHEAD = 2
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS records (
+    id INTEGER PRIMARY KEY,
+    url_key TEXT NOT NULL,
+    url TEXT NOT NULL,
+    fetched_at REAL NOT NULL,
+    website TEXT NOT NULL,
+    stage TEXT NOT NULL,
+    status_code INTEGER NOT NULL,
+    segment TEXT NOT NULL,
+    offset INTEGER NOT NULL,
+    length INTEGER NOT NULL,
+    codec TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS records_url ON records (url_key, fetched_at);
+CREATE INDEX IF NOT EXISTS records_fetched_at ON records (fetched_at);
+"""
+
+_RECORD_COLUMNS = 'url, fetched_at, website, stage, status_code, segment, offset, length, codec'
+
+
+def compress(data: bytes, codec: str, compressor=None) -> bytes:
+    """One record; pass a reusable ``ZstdCompressor`` to avoid building one per zstd record"""
+    if codec == 'zst':
+        return (compressor or zstandard.ZstdCompressor(level=9)).compress(data)
+    return gzip.compress(data, compresslevel=6, mtime=0)
+
+
+def decompress(data: bytes, codec: str, decompressor=None) -> bytes:
+    if codec == 'zst':
+        if zstandard is None:
+            raise RuntimeError("zstandard is required to read zstd records")
+        return (decompressor or zstandard.ZstdDecompressor()).decompress(data)
+    return zlib.decompress(data, 16 + zlib.MAX_WBITS)
+
+
+class HtmlArchive:
+    """Append-only archive of raw fetched pages for offline re-parsing.
+
+    Every response becomes one independently compressed record (a zstd frame
+    when zstandard is installed, a gzip member otherwise) holding a JSON
+    header line and the body, so the segment files are valid .zst/.gz streams
+    and any record can be read alone. Each writing process appends to its own
+    segment files; a shared SQLite index maps URL and fetch time to
+    (segment, offset, length).
+    """
+
+    def __init__(self, directory: str = DEFAULT_ARCHIVE_DIR, codec: Optional[str] = None,
+                 segment_bytes: int = DEFAULT_SEGMENT_BYTES):
+        self.directory = directory
+        self.codec = codec or ('zst' if zstandard is not None else 'gz')
+        self.segment_bytes = segment_bytes
+        os.makedirs(os.path.join(directory, 'segments'), exist_ok=True)
+        self.conn = sqlite3.connect(os.path.join(directory, 'index.db'), timeout=30.0, isolation_level=None)
+        self.conn.execute('PRAGMA journal_mode=WAL')
+        self.conn.execute('PRAGMA synchronous=NORMAL')
+        self.conn.executescript(SCHEMA)
+        self._segment = None
+        self._segment_name = None
+        self._pending: List[Tuple] = []
+        self._readers: Dict[str, object] = {}
+        # Compression contexts are reused across records
+        self._compressor = zstandard.ZstdCompressor(level=9) if self.codec == 'zst' else None
+        self._decompressor = zstandard.ZstdDecompressor() if zstandard is not None else None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def _open_segment(self):
+        if self._segment is not None:
+            self._segment.close()
+        stamp = datetime.now().strftime('%Y%m%d-%H%M%S')
+        self._segment_name = f"{stamp}-{os.getpid()}-{id(self):x}.{self.codec}"
+        self._segment = open(os.path.join(self.directory, 'segments', self._segment_name), 'ab')
+
+    def write(self, url: str, website: str, stage: str, status_code: int, content: bytes,
+              content_type: Optional[str] = None, fetched_at: Optional[float] = None):
+        """Append one fetched response"""
+        fetched_at = time.time() if fetched_at is None else fetched_at
+        header = {'url': url, 'fetched_at': fetched_at, 'website': website, 'stage': stage,
+                  'status_code': status_code, 'content_type': content_type}
+        record = compress(json.dumps(header).encode('utf-8') + b'\n' + content, self.codec, self._compressor)
+
+        if self._segment is None or self._segment.tell() >= self.segment_bytes:
+            self._open_segment()
+        offset = self._segment.tell()
+        self._segment.write(record)
+        self._pending.append((canonical_url(url), url, fetched_at, website, stage, status_code,
+                              self._segment_name, offset, len(record), self.codec))
+        if len(self._pending) >= INDEX_BATCH_SIZE:
+            self.flush()
+
+    def flush(self):
+        """Make buffered records visible in the index (data is flushed first)"""
+        if not self._pending:
+            return
+        self._segment.flush()
+        self.conn.execute('BEGIN')
+        self.conn.executemany(
+            f"INSERT INTO records (url_key, {_RECORD_COLUMNS}) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+            self._pending
+        )
+        self.conn.execute('COMMIT')
+        self._pending = []
+
+    def close(self):
+        self.flush()
+        if self._segment is not None:
+            self._segment.close()
+            self._segment = None
+        for reader in self._readers.values():
+            reader.close()
+        self._readers = {}
+        self.conn.close()
+
+    def read(self, entry: Dict) -> Dict:
+        """Header fields plus ``content`` of an indexed record"""
+        reader = self._readers.get(entry['segment'])
+        if reader is None:
+            reader = self._readers[entry['segment']] = open(
+                os.path.join(self.directory, 'segments', entry['segment']), 'rb'
+            )
+        reader.seek(entry['offset'])
+        header, _, content = decompress(
+            reader.read(entry['length']), entry['codec'], self._decompressor
+        ).partition(b'\n')
+        record = json.loads(header)
+        record['content'] = content
+        return record
+
+    def _entries(self, sql: str, params) -> Iterator[Dict]:
+        self.flush()
+        columns = [column.strip() for column in _RECORD_COLUMNS.split(',')]
+        for row in self.conn.execute(sql, params):
+            yield dict(zip(columns, row))
+
+    def get(self, url: str, at: Optional[float] = None) -> Optional[Dict]:
+        """Latest record of a URL fetched at or before ``at`` (default: latest overall)"""
+        entries = list(self._entries(
+            f"SELECT {_RECORD_COLUMNS} FROM records WHERE url_key = ? AND fetched_at <= ? "
+            "ORDER BY fetched_at DESC LIMIT 1",
+            (canonical_url(url), time.time() if at is None else at)
+        ))
+        return self.read(entries[0]) if entries else None
+
+    def history(self, url: str) -> List[Dict]:
+        """Index entries of every fetch of a URL, oldest first"""
+        return list(self._entries(
+            f"SELECT {_RECORD_COLUMNS} FROM records WHERE url_key = ? ORDER BY fetched_at", (canonical_url(url),)
+        ))
+
+    def entries(self, stage: Optional[str] = None, website: Optional[str] = None, since: Optional[float] = None,
+                until: Optional[float] = None, latest_only: bool = False) -> Iterator[Dict]:
+        """Index entries of successful fetches matching the filters, in segment order for sequential reads"""
+        clauses = ['status_code = 200']
+        params = []
+        for column, value in (('stage', stage), ('website', website)):
+            if value is not None:
+                clauses.append(f"{column} = ?")
+                params.append(value)
+        if since is not None:
+            clauses.append('fetched_at >= ?')
+            params.append(since)
+        if until is not None:
+            clauses.append('fetched_at < ?')
+            params.append(until)
+        where = ' AND '.join(clauses)
+        if latest_only:
+            # One record per URL: the newest fetch inside the window. With MAX(), SQLite takes the
+            # bare id column from the row holding the maximum, whatever order records were indexed in
+            where += f" AND id IN (SELECT id FROM (SELECT id, MAX(fetched_at) FROM records WHERE {where} GROUP BY url_key))"
+            params = params * 2
+        return self._entries(f"SELECT {_RECORD_COLUMNS} FROM records WHERE {where} ORDER BY segment, offset", params)
+
+
+_worker_archive: Optional[HtmlArchive] = None
+_worker_scraper = None
+
+
+def _init_worker(directory: str, module: str):
+    """Pool initializer: one archive reader and one offline scraper per worker process"""
+    global _worker_archive, _worker_scraper
+    _worker_archive = HtmlArchive(directory)
+    _worker_scraper = importlib.import_module(module).JobScraper()
+
+
+def _parse_search_chunk(entries: List[Dict]) -> List[Dict]:
+    cards = []
+    for entry in entries:
+        adapter = _worker_scraper.sites.get(entry['website'])
+        if adapter is None:
+            continue
+        try:
+            page_cards = _worker_scraper._parse_job_cards(_worker_archive.read(entry)['content'], adapter)
+        except Exception as e:
+            logger.error(f"Error re-parsing {entry['url']}: {str(e)}")
+            continue
+        for card in page_cards:
+            card['website'] = entry['website']
+            card['fetched_at'] = entry['fetched_at']
+        cards.extend(page_cards)
+    return cards
+
+
+def _page_card(content: bytes, url: str) -> Optional[Dict]:
+    """Card fields from a detail page alone, for jobs whose search page was not archived.
+
+    Title and company come from the page's JSON-LD JobPosting when it has one, otherwise
+    the title from its og:title or <title>. Location is left to the detail fields.
+    """
+    clean_text = _worker_scraper.clean_text
+    posting = find_job_posting(content) or {}
+    title = posting.get('title')
+    company = posting.get('hiringOrganization')
+    if isinstance(company, dict):
+        company = company.get('name')
+    if not isinstance(title, str) or not title.strip():
+        from bs4 import BeautifulSoup
+        soup = BeautifulSoup(content, 'html.parser')
+        meta = soup.find('meta', attrs={'property': 'og:title'})
+        title = meta.get('content') if meta else (soup.title.get_text() if soup.title else None)
+    if not title or not clean_text(title):
+        return None
+    return {
+        'title': clean_text(title),
+        'company': (clean_text(company) if isinstance(company, str) else '') or 'Not specified',
+        'location': 'Not specified',
+        'has_location': False,
+        'url': url
+    }
+
+
+def _parse_detail_chunk(tasks: List[Tuple[Dict, Optional[Dict]]]) -> List[Dict]:
+    jobs = []
+    for entry, card in tasks:
+        adapter = _worker_scraper.sites.get(entry['website'])
+        if adapter is None:
+            continue
+        try:
+            content = _worker_archive.read(entry)['content']
+            details = _worker_scraper._parse_job_details(content, adapter)
+            if card is None:
+                card = _page_card(content, entry['url'])
+                if card is None:
+                    logger.info(f"Skipping {entry['url']}: no archived search card and no title on the page")
+                    continue
+            job = _worker_scraper._build_job(card, details, entry['website'])
+        except Exception as e:
+            logger.error(f"Error re-parsing {entry['url']}: {str(e)}")
+            continue
+        if job:
+            job = job.to_dict()
+            job['scraped_date'] = datetime.fromtimestamp(entry['fetched_at']).isoformat()
+            jobs.append(job)
+    return jobs
+
+
+def _chunks(items: Iterable, size: int) -> Iterator[List]:
+    items = iter(items)
+    chunk = list(islice(items, size))
+    while chunk:
+        yield chunk
+        chunk = list(islice(items, size))
+
+
+def _imap(pool: ProcessPoolExecutor, fn: Callable, chunks: Iterable, ahead: int) -> Iterator:
+    """``pool.map`` over a lazy iterable, keeping at most ``ahead`` tasks in flight"""
+    pending = deque()
+    for chunk in chunks:
+        pending.append(pool.submit(fn, chunk))
+        if len(pending) >= ahead:
+            yield pending.popleft().result()
+    while pending:
+        yield pending.popleft().result()
+
+
+def reparse(directory: str, module: str, output: str, processes: Optional[int] = None,
+            website: Optional[str] = None, since: Optional[float] = None, until: Optional[float] = None) -> int:
+    """Run the current card and detail extractors over archived pages and write the jobs to an archive.
+
+    Search pages are parsed first to recover each job's card (title,
+    company, location) into a temporary table, then the newest archived
+    detail page of every job is parsed and combined with its newest card,
+    or with fields from the page itself when no card was archived. Index
+    entries and cards are streamed, never held in memory all at once. No
+    request is made.
+    """
+    processes = processes or os.cpu_count() or 1
+    ahead = processes * REPARSE_TASKS_AHEAD
+    archive = HtmlArchive(directory)
+    # A TEMP table lives in this connection's temporary database, which spills to disk
+    archive.conn.execute(
+        'CREATE TEMP TABLE reparse_cards (url_key TEXT PRIMARY KEY, fetched_at REAL NOT NULL, card TEXT NOT NULL)'
+    )
+    search_pages = detail_pages = page_only = 0
+
+    def search_entries():
+        nonlocal search_pages
+        for entry in archive.entries('search_fetch', website, since, until):
+            search_pages += 1
+            yield entry
+
+    def detail_tasks():
+        nonlocal detail_pages, page_only
+        for entry in archive.entries('detail_fetch', website, since, until, latest_only=True):
+            detail_pages += 1
+            row = archive.conn.execute(
+                'SELECT card FROM reparse_cards WHERE url_key = ?', (canonical_url(entry['url']),)
+            ).fetchone()
+            if row is None:
+                page_only += 1
+            yield entry, json.loads(row[0]) if row else None
+
+    try:
+        with ProcessPoolExecutor(max_workers=processes, initializer=_init_worker, initargs=(directory, module)) as pool:
+            # The newest card of each URL wins
+            archive.conn.execute('BEGIN')
+            for page_cards in _imap(pool, _parse_search_chunk, _chunks(search_entries(), REPARSE_CHUNK_SIZE), ahead):
+                archive.conn.executemany(
+                    'INSERT INTO reparse_cards (url_key, fetched_at, card) VALUES (?, ?, ?) '
+                    'ON CONFLICT (url_key) DO UPDATE SET fetched_at = excluded.fetched_at, card = excluded.card '
+                    'WHERE excluded.fetched_at >= reparse_cards.fetched_at',
+                    [(canonical_url(card['url']), card['fetched_at'], json.dumps(card)) for card in page_cards]
+                )
+            archive.conn.execute('COMMIT')
+
+            with ArchiveWriter(output) as writer:
+                for jobs in _imap(pool, _parse_detail_chunk, _chunks(detail_tasks(), REPARSE_CHUNK_SIZE), ahead):
+                    for job in jobs:
+                        writer.write(stable_job_id(job), job)
+                count = writer.count
+    finally:
+        archive.close()
+    if page_only:
+        logger.info(f"Built {page_only} detail pages without an archived search card from page fields alone")
+    logger.info(f"Re-parsed {count} jobs from {search_pages} search and {detail_pages} detail pages into {output}")
+    return count
+
+
+def _timestamp(value: Optional[str]) -> Optional[float]:
+    return datetime.fromisoformat(value).timestamp() if value else None
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Archive of raw fetched pages, re-parsed offline with the current extractors")
+    parser.add_argument('--archive', default=DEFAULT_ARCHIVE_DIR, help="archive directory")
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    reparse_parser = commands.add_parser('reparse', help="rebuild jobs from archived pages without network access")
+    reparse_parser.add_argument('--module', default='jd_aus', help="module providing JobScraper (jd_aus or JD_scrapper)")
+    reparse_parser.add_argument('-o', '--output', default='scraped_jobs_reparsed.json')
+    reparse_parser.add_argument('--processes', type=int, default=os.cpu_count() or 1)
+    reparse_parser.add_argument('--website')
+    reparse_parser.add_argument('--since', help="ISO date or datetime")
+    reparse_parser.add_argument('--until', help="ISO date or datetime")
+
+    show = commands.add_parser('show', help="print the archived body of a URL")
+    show.add_argument('url')
+    show.add_argument('--at', help="latest fetch at or before this ISO datetime")
+
+    commands.add_parser('status', help="show record counts per website and stage")
+    args = parser.parse_args(argv)
+
+    if args.command == 'reparse':
+        reparse(args.archive, args.module, args.output, args.processes, args.website,
+                _timestamp(args.since), _timestamp(args.until))
+        return
+
+    with HtmlArchive(args.archive) as archive:
+        if args.command == 'show':
+            record = archive.get(args.url, _timestamp(args.at))
+            if record is None:
+                print(f"{args.url} is not archived")
+            else:
+                print(record['content'].decode('utf-8', errors='replace'))
+        else:
+            rows = archive.conn.execute(
+                'SELECT website, stage, COUNT(*), MIN(fetched_at), MAX(fetched_at) FROM records GROUP BY website, stage'
+            ).fetchall()
+            for site, stage, count, first, last in rows:
+                print(f"{site:<12} {stage:<14} {count:>8}  {datetime.fromtimestamp(first):%Y-%m-%d} .. "
+                      f"{datetime.fromtimestamp(last):%Y-%m-%d}")
+
+
+if __name__ == "__main__":
+    main()
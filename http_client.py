@@ -0,0 +1,136 @@
+import importlib.util
+import socket
+import threading
+import time
+import weakref
+from typing import Dict, Optional
+import logging
+
+import requests
+from requests.adapters import HTTPAdapter
+
+logger = logging.getLogger(__name__)
+
+# Host pools kept by one adapter, and keep-alive connections kept per host pool
+DEFAULT_POOL_CONNECTIONS = 20
+DEFAULT_POOL_MAXSIZE = 20
+
+# Connections checked out at once across every pool of a session: a slot is held from
+# sending a request until its response body is fully read or the response is closed
+DEFAULT_MAX_TOTAL = 100
+
+DEFAULT_DNS_TTL = 300.0
+
+# urllib3 only decodes brotli when brotli or brotlicffi is installed
+BROTLI_AVAILABLE = any(importlib.util.find_spec(name) is not None for name in ('brotli', 'brotlicffi'))
+ACCEPT_ENCODING = 'gzip, deflate, br' if BROTLI_AVAILABLE else 'gzip, deflate'
+
+
+class BoundedAdapter(HTTPAdapter):
+    """HTTPAdapter whose requests share one semaphore, capping sockets in use across all hosts.
+
+    A slot is taken when a request is sent and given back when urllib3 returns
+    the connection to its pool, i.e. once the body has been read to the end or
+    the response is closed. Streamed downloads therefore hold their slot while
+    the body is consumed. A response dropped without being read or closed
+    frees its slot when it is garbage collected.
+    """
+
+    def __init__(self, limiter: threading.BoundedSemaphore, **kwargs):
+        self.limiter = limiter
+        super().__init__(**kwargs)
+
+    def send(self, request, **kwargs):
+        self.limiter.acquire()
+        try:
+            response = super().send(request, **kwargs)
+        except BaseException:
+            self.limiter.release()
+            raise
+
+        # A finalizer runs at most once, so the slot is released exactly once
+        # whether the connection is released, the response closed, or collected
+        raw = response.raw
+        release_slot = weakref.finalize(raw, self.limiter.release)
+        release_conn = raw.release_conn
+
+        def release():
+            try:
+                release_conn()
+            finally:
+                release_slot()
+
+        raw.release_conn = release
+        return response
+
+
+def make_session(headers: Optional[Dict[str, str]] = None, pool_connections: int = DEFAULT_POOL_CONNECTIONS,
+                 pool_maxsize: int = DEFAULT_POOL_MAXSIZE, max_total: int = DEFAULT_MAX_TOTAL,
+                 pool_sizes: Optional[Dict[str, int]] = None, dns_ttl: Optional[float] = DEFAULT_DNS_TTL) -> requests.Session:
+    """A requests.Session tuned for many requests to a few hosts.
+
+    Connections are kept alive in per-host pools of ``pool_maxsize``
+    (``pool_sizes`` overrides it per URL prefix, e.g.
+    ``{'https://i.redd.it': 32}``), all requests share a cap of ``max_total``
+    connections in use (held until each response is read or closed),
+    responses are negotiated compressed, and DNS answers are cached
+    process-wide for ``dns_ttl`` seconds. Idle keep-alive sockets are not
+    counted; they are bounded by the pool sizes instead.
+    """
+    if dns_ttl:
+        install_dns_cache(dns_ttl)
+
+    limiter = threading.BoundedSemaphore(max_total)
+    session = requests.Session()
+    adapter = BoundedAdapter(limiter, pool_connections=pool_connections, pool_maxsize=pool_maxsize)
+    session.mount('https://', adapter)
+    session.mount('http://', adapter)
+    for prefix, size in (pool_sizes or {}).items():
+        session.mount(prefix, BoundedAdapter(limiter, pool_connections=1, pool_maxsize=size))
+
+    session.headers.update({'Accept-Encoding': ACCEPT_ENCODING, 'Connection': 'keep-alive'})
+    if headers:
+        session.headers.update(headers)
+    return session
+
+
+class DNSCache:
+    """TTL cache in front of socket.getaddrinfo, shared by every connection in the process"""
+
+    def __init__(self, ttl: float = DEFAULT_DNS_TTL):
+        self.ttl = ttl
+        self._cache: Dict[tuple, tuple] = {}
+        self._lock = threading.Lock()
+        self._resolve = socket.getaddrinfo
+
+    def getaddrinfo(self, host, port, family=0, type=0, proto=0, flags=0):
+        key = (host, port, family, type, proto, flags)
+        now = time.monotonic()
+        with self._lock:
+            cached = self._cache.get(key)
+        if cached is not None and cached[0] > now:
+            return cached[1]
+        result = self._resolve(host, port, family, type, proto, flags)
+        with self._lock:
+            self._cache[key] = (now + self.ttl, result)
+        return result
+
+    def clear(self):
+        with self._lock:
+            self._cache.clear()
+
+
+_dns_cache: Optional[DNSCache] = None
+_dns_lock = threading.Lock()
+
+
+def install_dns_cache(ttl: float = DEFAULT_DNS_TTL) -> DNSCache:
+    """Patch socket.getaddrinfo with a process-wide DNS cache (once; later calls only adjust the TTL)"""
+    global _dns_cache
+    with _dns_lock:
+        if _dns_cache is None:
+            _dns_cache = DNSCache(ttl)
+            socket.getaddrinfo = _dns_cache.getaddrinfo
+        else:
+            _dns_cache.ttl = ttl
+    return _dns_cache
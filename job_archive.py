@@ -0,0 +1,336 @@
+import hashlib
+import json
+import re
+from collections import Counter
+from collections.abc import Mapping
+from typing import Dict, Iterable, Iterator, List, Optional, TextIO, Tuple
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+
+# Query parameters job boards add per impression; they do not identify the posting
+TRACKING_PARAMS = {'position', 'pagenum', 'refid', 'trackingid', 'trk', 'from', 'ref', 'src'}
+
+# Boards whose country subdomains (au.linkedin.com, uk.indeed.com) serve the same posting
+COUNTRY_SUBDOMAIN_HOSTS = {'linkedin.com', 'indeed.com'}
+
+# Long text fields that split archives keep in a separate blob, read only on access
+TEXT_FIELDS = ('description', 'requirements')
+
+# Suffix of the text blob that sits next to a split archive's metadata file
+TEXT_BLOB_SUFFIX = '.text'
+
+_decoder = json.JSONDecoder()
+_WHITESPACE = re.compile(r'\s+')
+
+
+def canonical_url(url: Optional[str]) -> str:
+    """Normalize a job URL so the same posting always maps to the same string"""
+    if not url:
+        return ''
+    parts = urlsplit(url.strip())
+    query = [
+        (key, value) for key, value in parse_qsl(parts.query, keep_blank_values=True)
+        if key.lower() not in TRACKING_PARAMS and not key.lower().startswith('utm_')
+    ]
+    host = parts.netloc.lower()
+    subdomain, _, domain = host.partition('.')
+    if domain in COUNTRY_SUBDOMAIN_HOSTS and len(subdomain) == 2:
+        host = 'www.' + domain
+    return urlunsplit((parts.scheme.lower(), host, parts.path.rstrip('/'), urlencode(sorted(query)), ''))
+
+
+def content_hash(job: Dict) -> str:
+    """Hash of the fields that make two postings the same job, ignoring whitespace and case"""
+    parts = [
+        _WHITESPACE.sub(' ', str(job.get(key) or '')).strip().lower()
+        for key in ('title', 'company', 'location', 'description')
+    ]
+    return hashlib.sha1('\x1f'.join(parts).encode('utf-8')).hexdigest()
+
+
+def job_identity(job: Dict) -> str:
+    """Dedup identity of a job: its canonical URL, or the content hash without one"""
+    return canonical_url(job.get('url')) or content_hash(job)
+
+
+def identity_job_id(identity: str) -> str:
+    return 'JD' + hashlib.sha1(identity.encode('utf-8')).hexdigest()[:16]
+
+
+def stable_job_id(job: Dict) -> str:
+    """Archive-independent job ID: derived from the canonical URL, or the content hash without one"""
+    return identity_job_id(job_identity(job))
+
+
+class _StreamDecoder:
+    """Incremental JSON tokenizer over a text file, holding at most one record in memory"""
+
+    def __init__(self, f: TextIO, chunk_size: int):
+        self.f = f
+        self.chunk_size = chunk_size
+        self.buf = ''
+        self.pos = 0
+        self.eof = False
+
+    def _fill(self, size: Optional[int] = None) -> bool:
+        data = self.f.read(size or self.chunk_size)
+        if not data:
+            self.eof = True
+            return False
+        self.buf = self.buf[self.pos:] + data
+        self.pos = 0
+        return True
+
+    def peek(self) -> str:
+        """Next non-whitespace character without consuming it ('' at end of file)"""
+        while True:
+            while self.pos < len(self.buf) and self.buf[self.pos].isspace():
+                self.pos += 1
+            if self.pos < len(self.buf):
+                return self.buf[self.pos]
+            if not self._fill():
+                return ''
+
+    def expect(self, chars: str) -> str:
+        char = self.peek()
+        if not char or char not in chars:
+            raise ValueError(f"Expected one of {chars!r}, found {char!r}")
+        self.pos += 1
+        return char
+
+    def value(self):
+        self.peek()
+        size = self.chunk_size
+        while True:
+            try:
+                obj, end = _decoder.raw_decode(self.buf, self.pos)
+            except json.JSONDecodeError:
+                # Value continues past the buffer; grow reads geometrically to stay linear
+                if not self._fill(size):
+                    raise
+                size *= 2
+                continue
+            # A number ending exactly at the buffer edge may still be truncated
+            if end == len(self.buf) and not self.eof and self._fill(size):
+                continue
+            self.pos = end
+            return obj
+
+
+def iter_archive(path: str, chunk_size: int = 1 << 16) -> Iterator[Tuple[str, Dict]]:
+    """Stream (key, job) pairs from an archive without loading it whole.
+
+    Understands the ``save_to_json`` layout (an object of ``JD001 -> job``),
+    a plain JSON array of jobs, JSON Lines with one job per line, and split
+    archives written by SplitArchiveWriter.
+    """
+    with open(path, 'r', encoding='utf-8') as f:
+        stream = _StreamDecoder(f, chunk_size)
+        first = stream.peek()
+        if first == '{':
+            # Either a save_to_json object (values are job objects) or the first line of a JSONL file
+            stream.expect('{')
+            if stream.peek() == '}':
+                return
+            key = stream.value()
+            stream.expect(':')
+            job = stream.value()
+            if isinstance(job, dict):
+                yield from _iter_object(stream, key, job)
+                return
+            f.seek(0)
+            for key, job in _iter_jsonl(f, path):
+                yield key, job.to_dict() if isinstance(job, LazyJob) else job
+        elif first == '[':
+            stream.expect('[')
+            index = 0
+            while stream.peek() not in (']', ''):
+                yield str(index), stream.value()
+                index += 1
+                if stream.expect(',]') == ']':
+                    break
+        elif first:
+            raise ValueError(f"{path} is not a job archive")
+
+
+def _iter_object(stream: _StreamDecoder, key: str, job: Dict) -> Iterator[Tuple[str, Dict]]:
+    while True:
+        yield key, job
+        if stream.expect(',}') == '}':
+            return
+        key = stream.value()
+        stream.expect(':')
+        job = stream.value()
+
+
+def _iter_jsonl(f: TextIO, path: str) -> Iterator[Tuple[str, Dict]]:
+    """JSONL records; lines of a split archive come back as LazyJob"""
+    blob = None
+    try:
+        for line_number, line in enumerate(f, 1):
+            line = line.strip()
+            if not line:
+                continue
+            job = json.loads(line)
+            key = job.pop('job_id', None) or str(line_number)
+            text_fields = job.pop('_text', None)
+            if text_fields is not None:
+                blob = blob or TextBlob(path + TEXT_BLOB_SUFFIX)
+                job = LazyJob(job, text_fields, blob)
+            yield key, job
+    finally:
+        if blob is not None:
+            blob.close()
+
+
+def iter_lazy_archive(path: str) -> Iterator[Tuple[str, Mapping]]:
+    """Stream (key, job) pairs, leaving text fields of split archives unread until accessed.
+
+    Other layouts are streamed as plain dicts by iter_archive, so memory stays
+    bounded by one record either way. ``JobListing(**job.to_dict())`` rebuilds
+    a full listing from a LazyJob.
+    """
+    with open(path, 'r', encoding='utf-8') as f:
+        first = f.read(1)
+        f.seek(0)
+        # Metadata lines are short; a bounded read keeps minified archives from loading whole
+        if first == '{' and '"_text"' in f.readline(1 << 20):
+            f.seek(0)
+            yield from _iter_jsonl(f, path)
+            return
+    yield from iter_archive(path)
+
+
+def iter_jobs(paths: Iterable[str], lazy: bool = False) -> Iterator[Dict]:
+    """Stream every job from several archives, file by file"""
+    for path in paths:
+        for _, job in (iter_lazy_archive(path) if lazy else iter_archive(path)):
+            yield job
+
+
+def summarize_jobs(jobs: Iterable[Mapping]) -> Dict:
+    """Job, category, site and technology counts in one pass; never touches text fields"""
+    categories = Counter()
+    sites = Counter()
+    technologies = Counter()
+    total = 0
+    for job in jobs:
+        total += 1
+        categories[job.get('category')] += 1
+        sites[job.get('source_website')] += 1
+        technologies.update(job.get('technology_stack') or [])
+    return {'jobs': total, 'categories': categories, 'sites': sites, 'technologies': technologies}
+
+
+class TextBlob:
+    """Random-access reader for a split archive's text blob, reopened on demand"""
+
+    def __init__(self, path: str):
+        self.path = path
+        self.f = None
+
+    def read(self, offset: int, length: int) -> str:
+        if self.f is None or self.f.closed:
+            self.f = open(self.path, 'rb')
+        self.f.seek(offset)
+        return self.f.read(length).decode('utf-8')
+
+    def close(self):
+        if self.f is not None:
+            self.f.close()
+
+
+class LazyJob(Mapping):
+    """Read-only job record whose long text fields are decoded from the blob on first access"""
+
+    __slots__ = ('_fields', '_unread', '_blob')
+
+    def __init__(self, fields: Dict, text_fields: List[str], blob: TextBlob):
+        self._fields = fields  # text fields hold [offset, length] until read
+        self._unread = set(text_fields)
+        self._blob = blob
+
+    def __getitem__(self, key):
+        value = self._fields[key]
+        if key in self._unread:
+            value = self._fields[key] = self._blob.read(*value)
+            self._unread.discard(key)
+        return value
+
+    def __iter__(self):
+        return iter(self._fields)
+
+    def __len__(self):
+        return len(self._fields)
+
+    def to_dict(self) -> Dict:
+        return {key: self[key] for key in self._fields}
+
+
+class ArchiveWriter:
+    """Write an archive incrementally in the ``save_to_json`` layout (or JSONL)"""
+
+    def __init__(self, path: str, jsonl: bool = False):
+        self.jsonl = jsonl
+        self.count = 0
+        self.f = open(path, 'w', encoding='utf-8')
+        if not jsonl:
+            self.f.write('{')
+
+    def write(self, key: str, job: Dict):
+        if self.jsonl:
+            self.f.write(json.dumps({'job_id': key, **job}, ensure_ascii=False) + '\n')
+        else:
+            body = json.dumps(job, indent=2, ensure_ascii=False).replace('\n', '\n  ')
+            self.f.write(f"{',' if self.count else ''}\n  {json.dumps(key)}: {body}")
+        self.count += 1
+
+    def close(self):
+        if not self.jsonl:
+            self.f.write('\n}' if self.count else '}')
+        self.f.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+class SplitArchiveWriter:
+    """Write a split archive: JSONL metadata plus a text blob addressed by byte offsets.
+
+    Each metadata line holds the short fields of a job, with description and
+    requirements replaced by ``[offset, length]`` into ``<path>.text``, so
+    passes over categories or technologies never decode the long texts.
+    """
+
+    def __init__(self, path: str):
+        self.count = 0
+        self.f = open(path, 'w', encoding='utf-8')
+        self.text = open(path + TEXT_BLOB_SUFFIX, 'wb')
+        self.offset = 0
+
+    def write(self, key: str, job: Dict):
+        record = {'job_id': key}
+        text_fields = []
+        for field, value in job.items():
+            if field in TEXT_FIELDS and isinstance(value, str):
+                data = value.encode('utf-8')
+                self.text.write(data)
+                value = [self.offset, len(data)]
+                self.offset += len(data)
+                text_fields.append(field)
+            record[field] = value
+        record['_text'] = text_fields
+        self.f.write(json.dumps(record, ensure_ascii=False) + '\n')
+        self.count += 1
+
+    def close(self):
+        self.f.close()
+        self.text.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
@@ -0,0 +1,259 @@
+import json
+import sqlite3
+from typing import Dict, Iterable, Iterator, List, Optional
+import logging
+
+from job_archive import ArchiveWriter, canonical_url, identity_job_id, job_identity
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_STORE_DB = 'jobs.db'
+
+# Rows buffered before one executemany transaction
+DEFAULT_BATCH_SIZE = 500
+
+# Column order matches JobListing.to_dict() of JD_scrapper
+JOB_FIELDS = ('title', 'company', 'location', 'description', 'requirements', 'salary', 'category',
+              'technology_stack', 'url', 'posted_date', 'scraped_date', 'source_website')
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    id INTEGER PRIMARY KEY,
+    url_key TEXT NOT NULL UNIQUE,
+    job_id TEXT NOT NULL,
+    title TEXT,
+    company TEXT,
+    location TEXT,
+    description TEXT,
+    requirements TEXT,
+    salary TEXT,
+    category TEXT,
+    technology_stack TEXT,
+    url TEXT,
+    posted_date TEXT,
+    scraped_date TEXT,
+    source_website TEXT
+);
+CREATE INDEX IF NOT EXISTS jobs_url ON jobs (url);
+CREATE INDEX IF NOT EXISTS jobs_category ON jobs (category);
+CREATE INDEX IF NOT EXISTS jobs_source_website ON jobs (source_website);
+CREATE INDEX IF NOT EXISTS jobs_location ON jobs (location);
+CREATE INDEX IF NOT EXISTS jobs_scraped_date ON jobs (scraped_date);
+CREATE TABLE IF NOT EXISTS job_technologies (
+    technology TEXT NOT NULL,
+    job INTEGER NOT NULL REFERENCES jobs (id) ON DELETE CASCADE,
+    PRIMARY KEY (technology, job)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS job_technologies_job ON job_technologies (job);
+"""
+
+# External-content FTS5 table kept in sync with jobs by triggers
+FTS_SCHEMA = """
+CREATE VIRTUAL TABLE IF NOT EXISTS jobs_fts USING fts5(
+    title, description, requirements, content='jobs', content_rowid='id'
+);
+CREATE TRIGGER IF NOT EXISTS jobs_fts_insert AFTER INSERT ON jobs BEGIN
+    INSERT INTO jobs_fts (rowid, title, description, requirements)
+    VALUES (new.id, new.title, new.description, new.requirements);
+END;
+CREATE TRIGGER IF NOT EXISTS jobs_fts_delete AFTER DELETE ON jobs BEGIN
+    INSERT INTO jobs_fts (jobs_fts, rowid, title, description, requirements)
+    VALUES ('delete', old.id, old.title, old.description, old.requirements);
+END;
+CREATE TRIGGER IF NOT EXISTS jobs_fts_update AFTER UPDATE ON jobs BEGIN
+    INSERT INTO jobs_fts (jobs_fts, rowid, title, description, requirements)
+    VALUES ('delete', old.id, old.title, old.description, old.requirements);
+    INSERT INTO jobs_fts (rowid, title, description, requirements)
+    VALUES (new.id, new.title, new.description, new.requirements);
+END;
+"""
+
+_UPSERT = f"""
+INSERT INTO jobs (url_key, job_id, {', '.join(JOB_FIELDS)})
+VALUES ({', '.join('?' * (len(JOB_FIELDS) + 2))})
+ON CONFLICT (url_key) DO UPDATE SET
+    {', '.join(f'{field} = excluded.{field}' for field in JOB_FIELDS)}
+"""
+
+
+def fts_query(text: str) -> str:
+    """FTS5 query matching every word of ``text``.
+
+    Each word is quoted, so punctuation such as ``c++`` or ``node.js`` is
+    searched literally instead of being parsed as query syntax. ``OR``
+    between two words and a trailing ``*`` (prefix search) are kept.
+    """
+    words = text.split()
+    terms = []
+    for position, word in enumerate(words):
+        if word == 'OR' and terms and terms[-1] != 'OR' and position < len(words) - 1:
+            terms.append('OR')
+            continue
+        prefix = word.endswith('*') and len(word) > 1
+        if prefix:
+            word = word[:-1]
+        terms.append('"' + word.replace('"', '""') + '"' + ('*' if prefix else ''))
+    return ' '.join(terms)
+
+
+class JobStore:
+    """Scraped jobs in one SQLite database, upserted by canonical URL.
+
+    Inserts are buffered and written ``batch_size`` rows per transaction.
+    Category, site, location and date filters hit plain indexes, technology
+    filters go through the normalized job_technologies table, and text
+    search uses an FTS5 index over title, description and requirements.
+    """
+
+    def __init__(self, path: str = DEFAULT_STORE_DB, batch_size: int = DEFAULT_BATCH_SIZE):
+        self.path = path
+        self.batch_size = batch_size
+        self.conn = sqlite3.connect(path, timeout=30.0, isolation_level=None)
+        self.conn.execute('PRAGMA journal_mode=WAL')
+        self.conn.execute('PRAGMA synchronous=NORMAL')
+        self.conn.execute('PRAGMA foreign_keys=ON')
+        self.conn.executescript(SCHEMA)
+        try:
+            self.conn.executescript(FTS_SCHEMA)
+            self.fts = True
+        except sqlite3.OperationalError as e:
+            # SQLite builds without FTS5 fall back to LIKE scans for text search
+            logger.warning(f"FTS5 unavailable, text search will scan descriptions: {str(e)}")
+            self.fts = False
+        self._pending: List[Dict] = []
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def close(self):
+        self.flush()
+        self.conn.close()
+
+    def add(self, job: Dict):
+        """Queue one job (a JobListing dict); written on the next flush"""
+        self._pending.append(job)
+        if len(self._pending) >= self.batch_size:
+            self.flush()
+
+    def add_many(self, jobs: Iterable[Dict]) -> int:
+        count = 0
+        for job in jobs:
+            self.add(job)
+            count += 1
+        self.flush()
+        return count
+
+    def flush(self):
+        """Write every queued job in one transaction, replacing older rows for the same URL"""
+        if not self._pending:
+            return
+        # The last copy of a URL within one batch wins, as it would across batches
+        latest = {job_identity(job): job for job in self._pending}
+        rows = []
+        tech_rows = []
+        for url_key, job in latest.items():
+            values = [job.get(field) for field in JOB_FIELDS]
+            values[JOB_FIELDS.index('technology_stack')] = json.dumps(job.get('technology_stack') or [])
+            rows.append([url_key, identity_job_id(url_key)] + values)
+            tech_rows.extend((tech, url_key) for tech in set(job.get('technology_stack') or []))
+
+        self.conn.execute('BEGIN')
+        try:
+            self.conn.executemany(_UPSERT, rows)
+            self.conn.executemany(
+                'DELETE FROM job_technologies WHERE job = (SELECT id FROM jobs WHERE url_key = ?)',
+                [(row[0],) for row in rows]
+            )
+            self.conn.executemany(
+                'INSERT OR IGNORE INTO job_technologies (technology, job) SELECT ?, id FROM jobs WHERE url_key = ?',
+                tech_rows
+            )
+            self.conn.execute('COMMIT')
+        except BaseException:
+            self.conn.execute('ROLLBACK')
+            raise
+        self._pending = []
+
+    def has_url(self, url: str) -> bool:
+        """Dedup check: True if a job with this canonical URL is stored"""
+        self.flush()
+        row = self.conn.execute('SELECT 1 FROM jobs WHERE url_key = ?', (canonical_url(url),)).fetchone()
+        return row is not None
+
+    def get(self, url: str) -> Optional[Dict]:
+        self.flush()
+        row = self.conn.execute(
+            f"SELECT {', '.join(JOB_FIELDS)} FROM jobs WHERE url_key = ?", (canonical_url(url),)
+        ).fetchone()
+        return self._row_to_job(row) if row else None
+
+    def count(self) -> int:
+        self.flush()
+        return self.conn.execute('SELECT COUNT(*) FROM jobs').fetchone()[0]
+
+    @staticmethod
+    def _row_to_job(row) -> Dict:
+        job = dict(zip(JOB_FIELDS, row))
+        job['technology_stack'] = json.loads(job['technology_stack'] or '[]')
+        return job
+
+    def _where(self, category: Optional[str] = None, source_website: Optional[str] = None,
+               location: Optional[str] = None, since: Optional[str] = None, until: Optional[str] = None,
+               technology: Optional[str] = None, text: Optional[str] = None):
+        clauses = []
+        params = []
+        for column, value in (('category', category), ('source_website', source_website), ('location', location)):
+            if value is not None:
+                clauses.append(f"{column} = ?")
+                params.append(value)
+        if since is not None:
+            clauses.append('scraped_date >= ?')
+            params.append(since)
+        if until is not None:
+            clauses.append('scraped_date < ?')
+            params.append(until)
+        if technology is not None:
+            clauses.append('id IN (SELECT job FROM job_technologies WHERE technology = ?)')
+            params.append(technology)
+        if text is not None:
+            if self.fts:
+                clauses.append('id IN (SELECT rowid FROM jobs_fts WHERE jobs_fts MATCH ?)')
+                params.append(fts_query(text))
+            else:
+                clauses.append('(title LIKE ? OR description LIKE ? OR requirements LIKE ?)')
+                params.extend([f"%{text}%"] * 3)
+        return (' WHERE ' + ' AND '.join(clauses)) if clauses else '', params
+
+    def query(self, category: Optional[str] = None, source_website: Optional[str] = None,
+              location: Optional[str] = None, since: Optional[str] = None, until: Optional[str] = None,
+              technology: Optional[str] = None, text: Optional[str] = None,
+              limit: Optional[int] = None) -> Iterator[Dict]:
+        """Stream stored jobs matching every given filter, oldest first.
+
+        ``since``/``until`` bound scraped_date (ISO strings), ``technology``
+        matches an entry of technology_stack, and ``text`` must match every
+        word in title, description or requirements (see ``fts_query``).
+        """
+        self.flush()
+        where, params = self._where(category, source_website, location, since, until, technology, text)
+        sql = f"SELECT {', '.join(JOB_FIELDS)} FROM jobs{where} ORDER BY id"
+        if limit is not None:
+            sql += ' LIMIT ?'
+            params.append(limit)
+        for row in self.conn.execute(sql, params):
+            yield self._row_to_job(row)
+
+    def export_json(self, filename: str, **filters) -> int:
+        """Write matching jobs in the save_to_json layout, keyed by stable job ID"""
+        self.flush()
+        where, params = self._where(**filters)
+        rows = self.conn.execute(f"SELECT job_id, {', '.join(JOB_FIELDS)} FROM jobs{where} ORDER BY id", params)
+        with ArchiveWriter(filename) as writer:
+            for row in rows:
+                writer.write(row[0], self._row_to_job(row[1:]))
+            count = writer.count
+        logger.info(f"Exported {count} jobs to {filename}")
+        return count
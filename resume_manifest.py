@@ -0,0 +1,192 @@
+import argparse
+import json
+import os
+import struct
+import time
+from typing import Dict, Iterator, List, Optional, Tuple
+
+DEFAULT_MANIFEST = os.path.join('resumes', 'manifest.jsonl')
+
+IMAGE_EXTENSIONS = ('.jpg', '.jpeg', '.png', '.gif', '.webp')
+
+# JPEG start-of-frame markers carry the dimensions (C4, C8 and CC are not frames)
+_JPEG_SOF_MARKERS = {0xC0, 0xC1, 0xC2, 0xC3, 0xC5, 0xC6, 0xC7, 0xC9, 0xCA, 0xCB, 0xCD, 0xCE, 0xCF}
+
+
+def sniff_format(header: bytes) -> Optional[str]:
+    """Real image format from the file's magic bytes, whatever its extension says"""
+    if header.startswith(b'\x89PNG\r\n\x1a\n'):
+        return 'png'
+    if header.startswith(b'\xff\xd8\xff'):
+        return 'jpeg'
+    if header[:6] in (b'GIF87a', b'GIF89a'):
+        return 'gif'
+    if header[:4] == b'RIFF' and header[8:12] == b'WEBP':
+        return 'webp'
+    return None
+
+
+def _jpeg_size(f) -> Optional[Tuple[int, int]]:
+    """Walk JPEG segment headers, seeking over their bodies, until a start-of-frame"""
+    f.seek(2)
+    while True:
+        byte = f.read(1)
+        while byte and byte != b'\xff':
+            byte = f.read(1)
+        while byte == b'\xff':
+            byte = f.read(1)
+        if not byte:
+            return None
+        marker = byte[0]
+        if marker in (0xD8, 0x01) or 0xD0 <= marker <= 0xD7:
+            continue  # markers without a length field
+        length_bytes = f.read(2)
+        if len(length_bytes) < 2:
+            return None
+        length = struct.unpack('>H', length_bytes)[0]
+        if marker in _JPEG_SOF_MARKERS:
+            frame = f.read(5)
+            if len(frame) < 5:
+                return None
+            height, width = struct.unpack('>HH', frame[1:5])
+            return width, height
+        if marker in (0xD9, 0xDA):
+            return None  # end of image or start of scan before any frame header
+        f.seek(length - 2, os.SEEK_CUR)
+
+
+def _webp_size(header: bytes) -> Optional[Tuple[int, int]]:
+    chunk = header[12:16]
+    if chunk == b'VP8 ' and len(header) >= 30:
+        width, height = struct.unpack('<HH', header[26:30])
+        return width & 0x3FFF, height & 0x3FFF
+    if chunk == b'VP8L' and len(header) >= 25:
+        bits = int.from_bytes(header[21:25], 'little')
+        return (bits & 0x3FFF) + 1, ((bits >> 14) & 0x3FFF) + 1
+    if chunk == b'VP8X' and len(header) >= 30:
+        return int.from_bytes(header[24:27], 'little') + 1, int.from_bytes(header[27:30], 'little') + 1
+    return None
+
+
+def image_info(path: str) -> Dict:
+    """Format, dimensions and size of an image file, read from its header only"""
+    width = height = None
+    with open(path, 'rb') as f:
+        header = f.read(32)
+        image_format = sniff_format(header)
+        if image_format == 'png' and header[12:16] == b'IHDR':
+            width, height = struct.unpack('>II', header[16:24])
+        elif image_format == 'gif':
+            width, height = struct.unpack('<HH', header[6:10])
+        elif image_format == 'webp':
+            width, height = _webp_size(header) or (None, None)
+        elif image_format == 'jpeg':
+            width, height = _jpeg_size(f) or (None, None)
+    return {
+        'format': image_format,
+        'width': width,
+        'height': height,
+        'bytes': os.path.getsize(path)
+    }
+
+
+class ResumeManifest:
+    """Append-only JSON Lines index of downloaded resume images.
+
+    One entry per recorded file (a later entry for the same file wins), so
+    later stages can filter and batch the corpus without opening any image.
+    """
+
+    def __init__(self, path: str = DEFAULT_MANIFEST):
+        self.path = path
+
+    def record(self, filepath: str, url: Optional[str] = None, permalink: Optional[str] = None) -> Dict:
+        """Sniff a downloaded file and append its entry"""
+        entry = {
+            'file': os.path.basename(filepath),
+            **image_info(filepath),
+            'url': url,
+            'permalink': permalink,
+            'recorded': time.strftime('%Y-%m-%dT%H:%M:%S')
+        }
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        with open(self.path, 'a', encoding='utf-8') as f:
+            f.write(json.dumps(entry, ensure_ascii=False) + '\n')
+        return entry
+
+    def entries(self) -> Dict[str, Dict]:
+        """Latest entry per file"""
+        latest = {}
+        if not os.path.exists(self.path):
+            return latest
+        with open(self.path, 'r', encoding='utf-8') as f:
+            for line in f:
+                line = line.strip()
+                if line:
+                    entry = json.loads(line)
+                    latest[entry['file']] = entry
+        return latest
+
+    def select(self, image_format: Optional[str] = None, min_width: Optional[int] = None,
+               min_height: Optional[int] = None, max_bytes: Optional[int] = None) -> Iterator[Dict]:
+        """Entries matching every given filter"""
+        for entry in self.entries().values():
+            if image_format is not None and entry['format'] != image_format:
+                continue
+            if min_width is not None and (entry['width'] or 0) < min_width:
+                continue
+            if min_height is not None and (entry['height'] or 0) < min_height:
+                continue
+            if max_bytes is not None and entry['bytes'] > max_bytes:
+                continue
+            yield entry
+
+    def batches(self, size: int, **filters) -> Iterator[List[Dict]]:
+        batch = []
+        for entry in self.select(**filters):
+            batch.append(entry)
+            if len(batch) == size:
+                yield batch
+                batch = []
+        if batch:
+            yield batch
+
+    def index_folder(self, folder: str) -> int:
+        """Record every image in a folder that has no entry yet; returns how many were added"""
+        known = self.entries()
+        added = 0
+        for name in sorted(os.listdir(folder)):
+            if name in known or not name.lower().endswith(IMAGE_EXTENSIONS):
+                continue
+            self.record(os.path.join(folder, name))
+            added += 1
+        return added
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Index downloaded resume images by format, size and source post")
+    parser.add_argument('--manifest', default=DEFAULT_MANIFEST)
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    index = commands.add_parser('index', help="record images downloaded before the manifest existed")
+    index.add_argument('folder', nargs='?', default='resumes')
+
+    select = commands.add_parser('list', help="print matching manifest entries as JSON Lines")
+    select.add_argument('--format', dest='image_format', choices=['png', 'jpeg', 'gif', 'webp'])
+    select.add_argument('--min-width', type=int)
+    select.add_argument('--min-height', type=int)
+    select.add_argument('--max-bytes', type=int)
+    args = parser.parse_args(argv)
+
+    manifest = ResumeManifest(args.manifest)
+    if args.command == 'index':
+        print(f"Indexed {manifest.index_folder(args.folder)} images into {args.manifest}")
+    else:
+        for entry in manifest.select(args.image_format, args.min_width, args.min_height, args.max_bytes):
+            print(json.dumps(entry, ensure_ascii=False))
+
+
+if __name__ == "__main__":
+    main()
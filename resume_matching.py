@@ -0,0 +1,297 @@
+import argparse
+import json
+import os
+from typing import Dict, Iterable, List, Optional, Tuple
+import logging
+
+import numpy as np
+
+from job_archive import iter_jobs, stable_job_id
+from tech_matcher import TechMatcher, get_tech_matcher
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+DEFAULT_INDEX_DIR = 'job_index'
+
+METRICS = ('jaccard', 'tfidf')
+
+# Jobs scored per matrix product; with RESUME_BLOCK this bounds the score matrix (~64 MB)
+JOB_BLOCK = 8192
+RESUME_BLOCK = 2048
+
+# Blocks with at most this many new candidates per top-k slot are merged sparsely instead of partitioned
+SPARSE_MERGE_FACTOR = 4
+
+# Jobs encoded per vectorized update of the index
+ADD_BATCH_SIZE = 10000
+
+
+def resume_skills(text: str, matcher: Optional[TechMatcher] = None) -> List[str]:
+    """Technology vocabulary terms mentioned in resume text (e.g. OCR output)"""
+    return (matcher or get_tech_matcher()).extract('', text, '')
+
+
+class JobIndex:
+    """Incremental bit-vector index of job technology stacks for resume matching.
+
+    Every job's technology_stack is one row of a packed bit matrix over the
+    technology vocabulary (case-insensitive, so 'Aws' and 'AWS' share a
+    column). Adding jobs only encodes the new ones and updates the document
+    frequencies. Scoring unpacks blocks of jobs and computes Jaccard or
+    TF-IDF cosine similarity for all resumes with one matrix product per
+    block, keeping a running top-k per resume.
+    """
+
+    def __init__(self, directory: str = DEFAULT_INDEX_DIR):
+        self.directory = directory
+        self.vocabulary: List[str] = []
+        self._columns: Dict[str, int] = {}
+        self.job_ids: List[str] = []
+        self._job_rows: Dict[str, int] = {}
+        self.jobs_meta: List[Dict] = []  # title, company, url per row
+        self.bits = np.zeros((0, 0), dtype=np.uint8)
+        self.doc_freq = np.zeros(0, dtype=np.int64)
+        self.load()
+
+        if not self.vocabulary:
+            # Seed the columns with every label the tech matcher can emit
+            for labels in get_tech_matcher().labels.values():
+                for label in labels:
+                    self._column(label)
+
+    @property
+    def _meta_path(self) -> str:
+        return os.path.join(self.directory, 'index.json')
+
+    @property
+    def _arrays_path(self) -> str:
+        return os.path.join(self.directory, 'index.npz')
+
+    def __len__(self):
+        return len(self.job_ids)
+
+    def load(self):
+        if not os.path.exists(self._meta_path):
+            return
+        with open(self._meta_path, 'r', encoding='utf-8') as f:
+            meta = json.load(f)
+        self.vocabulary = meta['vocabulary']
+        self._columns = {term.lower(): column for column, term in enumerate(self.vocabulary)}
+        self.job_ids = meta['job_ids']
+        self._job_rows = {job_id: row for row, job_id in enumerate(self.job_ids)}
+        self.jobs_meta = meta['jobs']
+        with np.load(self._arrays_path) as arrays:
+            self.bits = arrays['bits']
+            self.doc_freq = arrays['doc_freq']
+
+    def save(self):
+        """Persist the index (written to temporary files, then swapped in)"""
+        os.makedirs(self.directory, exist_ok=True)
+        arrays_tmp = self._arrays_path + '.tmp.npz'
+        np.savez(arrays_tmp, bits=self.bits, doc_freq=self.doc_freq)
+        meta_tmp = self._meta_path + '.tmp'
+        with open(meta_tmp, 'w', encoding='utf-8') as f:
+            json.dump({'vocabulary': self.vocabulary, 'job_ids': self.job_ids, 'jobs': self.jobs_meta}, f)
+        os.replace(arrays_tmp, self._arrays_path)
+        os.replace(meta_tmp, self._meta_path)
+
+    def _column(self, term: str) -> int:
+        key = term.lower()
+        column = self._columns.get(key)
+        if column is None:
+            column = self._columns[key] = len(self.vocabulary)
+            self.vocabulary.append(term)
+        return column
+
+    def _grow_columns(self):
+        """Widen the packed bit matrix and frequency vector after the vocabulary grew"""
+        width = (len(self.vocabulary) + 7) // 8
+        if self.bits.shape[1] < width:
+            self.bits = np.pad(self.bits, ((0, 0), (0, width - self.bits.shape[1])))
+        if len(self.doc_freq) < len(self.vocabulary):
+            self.doc_freq = np.pad(self.doc_freq, (0, len(self.vocabulary) - len(self.doc_freq)))
+
+    def encode(self, skill_lists: Iterable[Iterable[str]], grow: bool = False) -> np.ndarray:
+        """Dense 0/1 float32 matrix of skill lists; unknown terms are dropped unless ``grow``"""
+        rows = []
+        columns = []
+        count = 0
+        for row, skills in enumerate(skill_lists):
+            count += 1
+            for skill in skills:
+                column = self._column(skill) if grow else self._columns.get(skill.lower())
+                if column is not None:
+                    rows.append(row)
+                    columns.append(column)
+        matrix = np.zeros((count, len(self.vocabulary)), dtype=np.float32)
+        matrix[rows, columns] = 1.0
+        return matrix
+
+    def _add_batch(self, batch: List[Tuple[str, Dict]]):
+        dense = self.encode([job.get('technology_stack') or [] for _, job in batch], grow=True)
+        self._grow_columns()
+        packed = np.packbits(dense.astype(bool), axis=1)
+        packed = np.pad(packed, ((0, 0), (0, self.bits.shape[1] - packed.shape[1])))
+        self.bits = np.concatenate([self.bits, packed]) if len(self.bits) else packed
+        self.doc_freq[:dense.shape[1]] += dense.sum(axis=0).astype(np.int64)
+        for job_id, job in batch:
+            self._job_rows[job_id] = len(self.job_ids)
+            self.job_ids.append(job_id)
+            self.jobs_meta.append({key: job.get(key) for key in ('title', 'company', 'location', 'url')})
+
+    def add(self, jobs: Iterable[Dict]) -> int:
+        """Index jobs not indexed before; returns how many were added"""
+        added = 0
+        batch = {}
+        for job in jobs:
+            job_id = stable_job_id(job)
+            if job_id in self._job_rows or job_id in batch:
+                continue
+            batch[job_id] = job
+            if len(batch) >= ADD_BATCH_SIZE:
+                self._add_batch(list(batch.items()))
+                added += len(batch)
+                batch = {}
+        if batch:
+            self._add_batch(list(batch.items()))
+            added += len(batch)
+        self._grow_columns()
+        return added
+
+    def _job_block(self, start: int, end: int) -> np.ndarray:
+        return np.unpackbits(self.bits[start:end], axis=1, count=len(self.vocabulary)).astype(np.float32)
+
+    def top_k(self, skill_lists: List[List[str]], k: int = 10, metric: str = 'jaccard',
+              job_block: int = JOB_BLOCK, resume_block: int = RESUME_BLOCK) -> Tuple[np.ndarray, np.ndarray]:
+        """Best ``k`` job rows and scores per resume, best first; rows are -1 where fewer jobs exist"""
+        if metric not in METRICS:
+            raise ValueError(f"Unknown metric {metric}")
+        resumes = self.encode(skill_lists)
+        n_resumes = len(resumes)
+        best_scores = np.full((n_resumes, k), -np.inf, dtype=np.float32)
+        best_rows = np.full((n_resumes, k), -1, dtype=np.int64)
+        if not n_resumes or not len(self):
+            return best_rows, best_scores
+
+        resume_sizes = resumes.sum(axis=1)
+        if metric == 'tfidf':
+            idf = np.log((1 + len(self)) / (1 + self.doc_freq[:len(self.vocabulary)])).astype(np.float32) + 1
+            resumes = resumes * idf
+            resumes /= np.maximum(np.linalg.norm(resumes, axis=1, keepdims=True), 1e-12)
+
+        for job_start in range(0, len(self), job_block):
+            jobs = self._job_block(job_start, job_start + job_block)
+            if metric == 'tfidf':
+                jobs *= idf
+                jobs /= np.maximum(np.linalg.norm(jobs, axis=1, keepdims=True), 1e-12)
+            else:
+                job_sizes = jobs.sum(axis=1)
+
+            for resume_start in range(0, n_resumes, resume_block):
+                resume_end = min(resume_start + resume_block, n_resumes)
+                scores = resumes[resume_start:resume_end] @ jobs.T
+                if metric == 'jaccard':
+                    # intersection / (|resume| + |job| - intersection), in place to avoid temporaries
+                    union = np.subtract(job_sizes[None, :], scores)
+                    union += resume_sizes[resume_start:resume_end, None]
+                    np.maximum(union, 1, out=union)
+                    scores /= union
+
+                # Only scores beating their row's current k-th best can enter the top-k
+                kth = best_scores[resume_start:resume_end].min(axis=1)
+                above = scores > kth[:, None]
+                hit_rows, hit_columns = np.nonzero(above)
+                if not len(hit_rows):
+                    continue
+                if len(hit_rows) <= SPARSE_MERGE_FACTOR * k * len(scores):
+                    self._merge_hits(best_rows, best_scores, resume_start, resume_end, hit_rows,
+                                     hit_columns + job_start, scores[hit_rows, hit_columns])
+                    continue
+
+                improving = np.flatnonzero(above.any(axis=1))
+                block = scores if len(improving) == len(scores) else scores[improving]
+                take = min(k, block.shape[1])
+                candidates = np.argpartition(block, -take, axis=1)[:, -take:]
+                merged_scores = np.concatenate([best_scores[resume_start + improving],
+                                                np.take_along_axis(block, candidates, axis=1)], axis=1)
+                merged_rows = np.concatenate([best_rows[resume_start + improving], candidates + job_start], axis=1)
+                keep = np.argpartition(merged_scores, -k, axis=1)[:, -k:]
+                best_scores[resume_start + improving] = np.take_along_axis(merged_scores, keep, axis=1)
+                best_rows[resume_start + improving] = np.take_along_axis(merged_rows, keep, axis=1)
+
+        order = np.argsort(-best_scores, axis=1, kind='stable')
+        return np.take_along_axis(best_rows, order, axis=1), np.take_along_axis(best_scores, order, axis=1)
+
+    @staticmethod
+    def _merge_hits(best_rows: np.ndarray, best_scores: np.ndarray, start: int, end: int,
+                    hit_rows: np.ndarray, hit_jobs: np.ndarray, hit_scores: np.ndarray):
+        """Fold a few scattered (resume, job, score) hits into the running top-k of rows start:end"""
+        k = best_rows.shape[1]
+        owners = np.concatenate([np.repeat(np.arange(end - start), k), hit_rows])
+        merged_scores = np.concatenate([best_scores[start:end].ravel(), hit_scores])
+        merged_jobs = np.concatenate([best_rows[start:end].ravel(), hit_jobs])
+        order = np.lexsort((-merged_scores, owners))
+        owners = owners[order]
+        # Every row already holds k entries, so the first k after sorting are exactly its new top-k
+        rank = np.arange(len(order)) - np.searchsorted(owners, owners)
+        keep = order[rank < k]
+        best_scores[start:end] = merged_scores[keep].reshape(-1, k)
+        best_rows[start:end] = merged_jobs[keep].reshape(-1, k)
+
+    def match(self, skill_lists: List[List[str]], k: int = 10, metric: str = 'jaccard') -> List[List[Dict]]:
+        """Top-k matching jobs per resume as dicts with job_id, score, title, company, location and url"""
+        rows, scores = self.top_k(skill_lists, k, metric)
+        return [
+            [
+                {'job_id': self.job_ids[row], 'score': round(float(score), 4), **self.jobs_meta[row]}
+                for row, score in zip(row_list, score_list) if row >= 0 and score > 0
+            ]
+            for row_list, score_list in zip(rows, scores)
+        ]
+
+
+def load_resumes(path: str, matcher: Optional[TechMatcher] = None) -> List[Dict]:
+    """Resumes from JSON Lines; each line has ``skills`` or ``text`` to extract them from"""
+    resumes = []
+    with open(path, 'r', encoding='utf-8') as f:
+        for line_number, line in enumerate(f, 1):
+            line = line.strip()
+            if not line:
+                continue
+            resume = json.loads(line)
+            if 'skills' not in resume:
+                resume['skills'] = resume_skills(resume.get('text') or '', matcher)
+            resume.setdefault('file', str(line_number))
+            resumes.append(resume)
+    return resumes
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Match resumes to scraped jobs by technology stack")
+    parser.add_argument('--index', default=DEFAULT_INDEX_DIR, help="index directory")
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    add = commands.add_parser('add', help="index jobs from archives (already indexed jobs are skipped)")
+    add.add_argument('archives', nargs='+')
+
+    match = commands.add_parser('match', help="print the top jobs for every resume as JSON Lines")
+    match.add_argument('resumes', help="JSON Lines with 'skills' or 'text' per resume")
+    match.add_argument('-k', type=int, default=10)
+    match.add_argument('--metric', choices=METRICS, default='jaccard')
+    args = parser.parse_args(argv)
+
+    index = JobIndex(args.index)
+    if args.command == 'add':
+        added = index.add(iter_jobs(args.archives, lazy=True))
+        index.save()
+        print(f"Indexed {added} new jobs ({len(index)} total)")
+    else:
+        resumes = load_resumes(args.resumes)
+        matches = index.match([resume['skills'] for resume in resumes], args.k, args.metric)
+        for resume, jobs in zip(resumes, matches):
+            print(json.dumps({'file': resume['file'], 'skills': resume['skills'], 'matches': jobs}, ensure_ascii=False))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,270 @@
+import json
+import math
+import threading
+import time
+from bisect import bisect_left
+from contextlib import contextmanager
+from typing import Dict, List, Optional, Tuple
+import logging
+
+logger = logging.getLogger(__name__)
+
+# Latency buckets in seconds, shared by every stage histogram
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+
+METRIC_PREFIX = 'jd_scraper'
+
+
+class Histogram:
+    """Fixed-bucket latency histogram (Prometheus style, cumulative on export)"""
+
+    def __init__(self, buckets=DEFAULT_BUCKETS, keep_samples: bool = False):
+        self.buckets = tuple(buckets)
+        self.counts = [0] * (len(self.buckets) + 1)  # last slot is +Inf
+        self.sum = 0.0
+        self.count = 0
+        self.samples: Optional[List[float]] = [] if keep_samples else None
+
+    def observe(self, value: float):
+        self.counts[bisect_left(self.buckets, value)] += 1
+        self.sum += value
+        self.count += 1
+        if self.samples is not None:
+            self.samples.append(value)
+
+    def quantile(self, q: float) -> Optional[float]:
+        """Quantile of the observed values.
+
+        Exact (nearest-rank) when raw samples are kept, otherwise the upper
+        bound of the bucket containing the quantile.
+        """
+        if not self.count:
+            return None
+        if self.samples:
+            ordered = sorted(self.samples)
+            return ordered[min(len(ordered) - 1, max(0, math.ceil(q * len(ordered)) - 1))]
+        rank = q * self.count
+        seen = 0
+        for bound, count in zip(self.buckets + (float('inf'),), self.counts):
+            seen += count
+            if seen >= rank:
+                return bound
+        return float('inf')
+
+    def to_dict(self) -> Dict:
+        return {
+            'count': self.count,
+            'sum': round(self.sum, 6),
+            'mean': round(self.sum / self.count, 6) if self.count else None,
+            'p50': self.quantile(0.5),
+            'p99': self.quantile(0.99),
+            'buckets': {str(bound): count for bound, count in zip(self.buckets + ('+Inf',), self.counts)}
+        }
+
+
+class ScrapeMetrics:
+    """Per-stage latency histograms and counters for a scrape run.
+
+    Stages are free-form names such as ``search_fetch``, ``detail_fetch``,
+    ``detail_parse``, ``enrichment`` or ``sleep``, labelled by site and
+    optionally by category. Counters carry arbitrary string labels. With
+    ``keep_samples`` every raw latency is retained for exact percentiles,
+    which is meant for benchmarks rather than long-running crawls.
+    """
+
+    def __init__(self, buckets=DEFAULT_BUCKETS, keep_samples: bool = False):
+        self.buckets = buckets
+        self.keep_samples = keep_samples
+        self.started = time.time()
+        self._lock = threading.Lock()
+        self._histograms: Dict[Tuple[str, str, str], Histogram] = {}
+        self._counters: Dict[str, Dict[Tuple[Tuple[str, str], ...], float]] = {}
+        self._exporter: Optional[threading.Thread] = None
+        self._stop_export = threading.Event()
+
+    def observe(self, stage: str, seconds: float, site: str = '', category: str = ''):
+        """Record one latency sample for a stage"""
+        key = (stage, site, category)
+        with self._lock:
+            histogram = self._histograms.get(key)
+            if histogram is None:
+                histogram = self._histograms[key] = Histogram(self.buckets, self.keep_samples)
+            histogram.observe(seconds)
+
+    @contextmanager
+    def timer(self, stage: str, site: str = '', category: str = ''):
+        """Time the enclosed block and record it under the given stage"""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(stage, time.perf_counter() - start, site, category)
+
+    def histogram(self, stage: str, site: str = '', category: str = '') -> Optional[Histogram]:
+        with self._lock:
+            return self._histograms.get((stage, site, category))
+
+    def merged_histogram(self, stage: str) -> Histogram:
+        """Combine one stage's histograms across every site and category"""
+        merged = Histogram(self.buckets, self.keep_samples)
+        with self._lock:
+            for (name, _, _), histogram in self._histograms.items():
+                if name != stage:
+                    continue
+                merged.counts = [a + b for a, b in zip(merged.counts, histogram.counts)]
+                merged.sum += histogram.sum
+                merged.count += histogram.count
+                if merged.samples is not None and histogram.samples is not None:
+                    merged.samples.extend(histogram.samples)
+        return merged
+
+    def inc(self, name: str, value: float = 1, **labels):
+        """Increment a labelled counter"""
+        key = tuple(sorted((k, str(v)) for k, v in labels.items()))
+        with self._lock:
+            series = self._counters.setdefault(name, {})
+            series[key] = series.get(key, 0) + value
+
+    def total(self, name: str, **labels) -> float:
+        """Sum of a counter over every series carrying all the given labels"""
+        wanted = {(k, str(v)) for k, v in labels.items()}
+        with self._lock:
+            return sum(value for key, value in self._counters.get(name, {}).items() if wanted.issubset(key))
+
+    def record_response(self, site: str, status_code: int, num_bytes: int):
+        """Record the status code and payload size of an HTTP response"""
+        self.inc('responses', site=site, status=status_code)
+        self.inc('bytes_downloaded', num_bytes, site=site)
+
+    def record_request_error(self, site: str, error: BaseException):
+        """Record a request that failed without a response, e.g. a timeout or connection error"""
+        self.inc('request_errors', site=site, error=type(error).__name__)
+
+    def record_job(self, site: str, category: str):
+        """Record one job kept by the scraper"""
+        self.inc('jobs', site=site, category=category)
+
+    def jobs_per_second(self) -> Dict[str, float]:
+        """Jobs/sec for each site and category, over the time spent scraping it"""
+        rates = {}
+        with self._lock:
+            jobs = dict(self._counters.get('jobs', {}))
+            durations = {
+                (site, category): histogram.sum
+                for (stage, site, category), histogram in self._histograms.items()
+                if stage == 'category'
+            }
+        for labels, count in jobs.items():
+            label_map = dict(labels)
+            site, category = label_map.get('site', ''), label_map.get('category', '')
+            elapsed = durations.get((site, category)) or (time.time() - self.started)
+            rates[f"{site}/{category}"] = round(count / elapsed, 4) if elapsed else 0.0
+        return rates
+
+    def to_dict(self) -> Dict:
+        """Snapshot every metric as plain JSON-serializable data"""
+        with self._lock:
+            stages = [
+                {'stage': stage, 'site': site, 'category': category, **histogram.to_dict()}
+                for (stage, site, category), histogram in sorted(self._histograms.items())
+            ]
+            counters = {
+                name: [{'labels': dict(labels), 'value': value} for labels, value in sorted(series.items())]
+                for name, series in sorted(self._counters.items())
+            }
+        return {
+            'started': self.started,
+            'elapsed_seconds': round(time.time() - self.started, 3),
+            'stages': stages,
+            'counters': counters,
+            'jobs_per_second': self.jobs_per_second()
+        }
+
+    def to_json(self, filename: Optional[str] = None) -> str:
+        """Export metrics as JSON, optionally writing them to a file"""
+        text = json.dumps(self.to_dict(), indent=2)
+        if filename:
+            with open(filename, 'w', encoding='utf-8') as f:
+                f.write(text)
+        return text
+
+    def to_prometheus(self, filename: Optional[str] = None) -> str:
+        """Export metrics in the Prometheus text exposition format"""
+        lines = []
+        with self._lock:
+            histograms = sorted(self._histograms.items())
+            counters = {name: dict(series) for name, series in self._counters.items()}
+
+        if histograms:
+            name = f"{METRIC_PREFIX}_stage_seconds"
+            lines.append(f"# HELP {name} Latency of each scrape stage")
+            lines.append(f"# TYPE {name} histogram")
+            for (stage, site, category), histogram in histograms:
+                labels = _format_labels((('stage', stage), ('site', site), ('category', category)))
+                cumulative = 0
+                for bound, count in zip(histogram.buckets + ('+Inf',), histogram.counts):
+                    cumulative += count
+                    bucket_labels = _format_labels((('stage', stage), ('site', site), ('category', category), ('le', str(bound))))
+                    lines.append(f"{name}_bucket{bucket_labels} {cumulative}")
+                lines.append(f"{name}_sum{labels} {histogram.sum:.6f}")
+                lines.append(f"{name}_count{labels} {histogram.count}")
+
+        for counter, series in sorted(counters.items()):
+            name = f"{METRIC_PREFIX}_{counter}_total"
+            lines.append(f"# TYPE {name} counter")
+            for labels, value in sorted(series.items()):
+                lines.append(f"{name}{_format_labels(labels)} {_format_value(value)}")
+
+        name = f"{METRIC_PREFIX}_jobs_per_second"
+        lines.append(f"# TYPE {name} gauge")
+        for key, rate in sorted(self.jobs_per_second().items()):
+            site, _, category = key.partition('/')
+            lines.append(f"{name}{_format_labels((('site', site), ('category', category)))} {rate}")
+
+        text = '\n'.join(lines) + '\n'
+        if filename:
+            with open(filename, 'w', encoding='utf-8') as f:
+                f.write(text)
+        return text
+
+    def start_interval_export(self, interval: float, json_path: Optional[str] = None, prometheus_path: Optional[str] = None):
+        """Rewrite the export files every ``interval`` seconds from a daemon thread"""
+        if self._exporter is not None:
+            return
+
+        def run():
+            while not self._stop_export.wait(interval):
+                self.export(json_path, prometheus_path)
+
+        self._stop_export.clear()
+        self._exporter = threading.Thread(target=run, name='scrape-metrics-export', daemon=True)
+        self._exporter.start()
+
+    def stop_interval_export(self):
+        if self._exporter is not None:
+            self._stop_export.set()
+            self._exporter.join()
+            self._exporter = None
+
+    def export(self, json_path: Optional[str] = None, prometheus_path: Optional[str] = None):
+        """Write JSON and/or Prometheus exports"""
+        try:
+            if json_path:
+                self.to_json(json_path)
+            if prometheus_path:
+                self.to_prometheus(prometheus_path)
+        except OSError as e:
+            logger.error(f"Error exporting metrics: {str(e)}")
+
+
+def _format_labels(labels) -> str:
+    pairs = [f'{key}="{_escape_label(value)}"' for key, value in labels if value != '']
+    return '{' + ','.join(pairs) + '}' if pairs else ''
+
+
+def _escape_label(value) -> str:
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+def _format_value(value: float) -> str:
+    return str(int(value)) if float(value).is_integer() else repr(value)
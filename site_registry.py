@@ -0,0 +1,219 @@
+import json
+import os
+import re
+import threading
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Callable, Dict, List, Optional, Pattern
+import logging
+
+# soupsieve (which pulls in bs4) is imported when the first site file is compiled
+if TYPE_CHECKING:
+    import soupsieve
+
+logger = logging.getLogger(__name__)
+
+# Directory holding one declarative JSON file per job board
+DEFAULT_SITES_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'sites')
+
+# listed_date and snippet are optional; they only feed the card change fingerprint
+CARD_FIELDS = ('title', 'company', 'location', 'link', 'listed_date', 'snippet')
+
+
+@dataclass
+class SiteAdapter:
+    """One job board, compiled from its declarative site file.
+
+    CSS selectors are compiled once with soupsieve when the file is loaded, so
+    scraping never re-parses selector strings or branches on the site name.
+    """
+    name: str
+    config: Dict
+    card_matcher: 'soupsieve.SoupSieve'
+    field_matchers: Dict[str, 'soupsieve.SoupSieve']
+    description_matchers: List['soupsieve.SoupSieve']
+    salary_matchers: List['soupsieve.SoupSieve']
+    parse_salary: bool
+    requirements_patterns: List[Pattern]
+    json_ld: bool = True
+    page_param: str = ''
+    page_size: int = 0
+    max_pages: int = 1
+    request_delay: float = 1.0
+    concurrency: int = 1
+    mtime: float = 0.0
+    path: str = ''
+
+    @property
+    def base_url(self) -> str:
+        return self.config['base_url']
+
+    def search_urls(self, category: str, location: str) -> List[str]:
+        """Search page URLs for a category, one per results page"""
+        first = self.base_url + self.config['job_search_path'].format(category, location)
+        urls = [first]
+        if self.page_param and self.page_size:
+            for page in range(1, self.max_pages):
+                urls.append(first + self.page_param.format(page * self.page_size))
+        return urls
+
+    def select_cards(self, soup) -> List:
+        return self.card_matcher.select(soup)
+
+    def select_field(self, card, name: str):
+        matcher = self.field_matchers.get(name)
+        return matcher.select_one(card) if matcher is not None else None
+
+    def extract_details(self, soup, clean_text: Callable[[str], str],
+                        extract_salary: Callable[[str], Optional[str]]) -> Dict:
+        """Apply the site's detail-page rules to a parsed job page"""
+        description = ""
+        requirements = ""
+        salary = None
+
+        for matcher in self.description_matchers:
+            desc_elem = matcher.select_one(soup)
+            if desc_elem:
+                description = clean_text(desc_elem.get_text(strip=True))
+                break
+
+        # Requirements are the parent block of the first text node mentioning a keyword
+        for pattern in self.requirements_patterns:
+            req_section = soup.find(string=pattern)
+            if req_section:
+                parent = req_section.parent
+                if parent:
+                    requirements = clean_text(parent.get_text(strip=True))
+                    break
+
+        for matcher in self.salary_matchers:
+            salary_elem = matcher.select_one(soup)
+            if salary_elem:
+                salary_text = salary_elem.get_text(strip=True)
+                salary = extract_salary(salary_text) if self.parse_salary else salary_text
+                break
+        if salary is None:
+            salary = extract_salary(description)
+
+        return {
+            'description': description,
+            'requirements': requirements,
+            'salary': salary
+        }
+
+
+def compile_adapter(config: Dict, path: str = '', mtime: float = 0.0) -> SiteAdapter:
+    """Validate a site definition and compile its selectors"""
+    import soupsieve
+
+    name = config.get('name')
+    if not name:
+        raise ValueError(f"Site file {path or '<inline>'} has no 'name'")
+    for key in ('base_url', 'job_search_path', 'selectors'):
+        if key not in config:
+            raise ValueError(f"Site '{name}' is missing '{key}'")
+
+    selectors = config['selectors']
+    if 'job_cards' not in selectors:
+        raise ValueError(f"Site '{name}' has no 'job_cards' selector")
+
+    details = config.get('details', {})
+    pagination = config.get('pagination', {})
+    rate_limit = config.get('rate_limit', {})
+    try:
+        return SiteAdapter(
+            name=name,
+            config=config,
+            card_matcher=soupsieve.compile(selectors['job_cards']),
+            field_matchers={key: soupsieve.compile(selectors[key]) for key in CARD_FIELDS if selectors.get(key)},
+            description_matchers=[soupsieve.compile(s) for s in details.get('description', [])],
+            salary_matchers=[soupsieve.compile(s) for s in details.get('salary', [])],
+            parse_salary=details.get('parse_salary', True),
+            requirements_patterns=[re.compile(re.escape(k), re.IGNORECASE) for k in details.get('requirements_keywords', [])],
+            json_ld=details.get('json_ld', True),
+            page_param=pagination.get('param', ''),
+            page_size=pagination.get('page_size', 0),
+            max_pages=max(1, pagination.get('max_pages', 1)),
+            request_delay=rate_limit.get('request_delay', 1.0),
+            concurrency=max(1, config.get('concurrency', 1)),
+            mtime=mtime,
+            path=path
+        )
+    except soupsieve.SelectorSyntaxError as e:
+        raise ValueError(f"Site '{name}' has an invalid selector: {str(e)}") from e
+
+
+class SiteRegistry:
+    """Site adapters loaded from a directory of ``*.json`` site files.
+
+    ``reload_if_changed`` recompiles only files whose mtime moved and picks up
+    added or removed files, so definitions can be edited while a crawler runs.
+    A file that fails to load keeps its previous adapter.
+    """
+
+    def __init__(self, directory: str = DEFAULT_SITES_DIR):
+        self.directory = directory
+        self._adapters: Dict[str, SiteAdapter] = {}
+        self._lock = threading.Lock()
+        self.reload_if_changed()
+
+    def _site_files(self) -> Dict[str, float]:
+        files = {}
+        for entry in os.scandir(self.directory):
+            if entry.is_file() and entry.name.endswith('.json'):
+                files[entry.path] = entry.stat().st_mtime
+        return files
+
+    def reload_if_changed(self) -> bool:
+        """Recompile changed site files; returns True if anything changed"""
+        files = self._site_files()
+        with self._lock:
+            known = {adapter.path: adapter for adapter in self._adapters.values()}
+            adapters = {}
+            changed = set(known) != set(files)
+            for path, mtime in sorted(files.items()):
+                current = known.get(path)
+                if current is not None and current.mtime == mtime:
+                    adapters[current.name] = current
+                    continue
+                try:
+                    with open(path, 'r', encoding='utf-8') as f:
+                        adapter = compile_adapter(json.load(f), path, mtime)
+                except (OSError, ValueError) as e:
+                    logger.error(f"Error loading site file {path}: {str(e)}")
+                    if current is not None:
+                        adapters[current.name] = current
+                    continue
+                if adapter.name in adapters:
+                    logger.error(f"Duplicate site name '{adapter.name}' in {path}")
+                    continue
+                adapters[adapter.name] = adapter
+                changed = True
+            self._adapters = adapters
+        return changed
+
+    def get(self, name: str) -> Optional[SiteAdapter]:
+        return self._adapters.get(name)
+
+    def names(self) -> List[str]:
+        return sorted(self._adapters)
+
+    def __contains__(self, name: str) -> bool:
+        return name in self._adapters
+
+    def configs(self) -> Dict[str, Dict]:
+        """Raw site definitions keyed by name (the old ``website_configs`` shape)"""
+        return {name: adapter.config for name, adapter in self._adapters.items()}
+
+
+_registries: Dict[str, SiteRegistry] = {}
+_registries_lock = threading.Lock()
+
+
+def get_registry(directory: str = DEFAULT_SITES_DIR) -> SiteRegistry:
+    """Process-wide registry per directory, so every JobScraper shares one compiled set"""
+    directory = os.path.abspath(directory)
+    with _registries_lock:
+        registry = _registries.get(directory)
+        if registry is None:
+            registry = _registries[directory] = SiteRegistry(directory)
+        return registry
@@ -0,0 +1,155 @@
+import html
+import json
+import re
+from typing import Callable, Dict, Iterator, Optional
+
+# Matches <script type="application/ld+json"> blocks directly in the raw page bytes
+JSON_LD_PATTERN = re.compile(
+    rb'<script[^>]*type\s*=\s*["\']application/ld\+json["\'][^>]*>(.*?)</script\s*>',
+    re.IGNORECASE | re.DOTALL
+)
+TAG_PATTERN = re.compile(r'<[^>]+>')
+BLOCK_TAG_PATTERN = re.compile(r'<\s*(?:br|/p|/li|/div|/h\d)\b[^>]*>', re.IGNORECASE)
+
+CURRENCY_SYMBOLS = {'USD': '$', 'AUD': '$', 'CAD': '$', 'NZD': '$', 'SGD': '$', 'EUR': '€', 'GBP': '£'}
+
+
+def iter_json_ld(content: bytes) -> Iterator:
+    """Yield every parseable JSON-LD object embedded in a page, without building a DOM"""
+    for match in JSON_LD_PATTERN.finditer(content):
+        payload = match.group(1).strip()
+        # Some boards wrap the payload in HTML comments or CDATA markers
+        for marker in (b'<!--', b'-->', b'<![CDATA[', b']]>'):
+            payload = payload.replace(marker, b'')
+        try:
+            yield json.loads(payload)
+        except ValueError:
+            continue
+
+
+def _iter_nodes(data) -> Iterator[Dict]:
+    if isinstance(data, list):
+        for item in data:
+            yield from _iter_nodes(item)
+    elif isinstance(data, dict):
+        yield data
+        if '@graph' in data:
+            yield from _iter_nodes(data['@graph'])
+
+
+def _is_job_posting(node: Dict) -> bool:
+    node_type = node.get('@type')
+    if isinstance(node_type, list):
+        return 'JobPosting' in node_type
+    return node_type == 'JobPosting'
+
+
+def find_job_posting(content: bytes) -> Optional[Dict]:
+    """Return the first schema.org JobPosting embedded in the page, if any"""
+    if b'ld+json' not in content:
+        return None
+    for data in iter_json_ld(content):
+        for node in _iter_nodes(data):
+            if _is_job_posting(node):
+                return node
+    return None
+
+
+def html_to_text(value: str) -> str:
+    """Flatten the HTML fragments JobPosting descriptions usually carry.
+
+    Entities are decoded once, after the tags are gone, so escaped text such as ``&lt;T&gt;`` stays text.
+    """
+    text = BLOCK_TAG_PATTERN.sub(' ', value or '')
+    return html.unescape(TAG_PATTERN.sub('', text))
+
+
+def _as_text(value) -> str:
+    """Flatten a string, list or schema.org object into plain text"""
+    if not value:
+        return ''
+    if isinstance(value, str):
+        return value
+    if isinstance(value, list):
+        return ' '.join(filter(None, (_as_text(item) for item in value)))
+    if isinstance(value, dict):
+        return _as_text(value.get('description') or value.get('name') or value.get('value'))
+    return str(value)
+
+
+def _format_amount(amount, symbol: str) -> str:
+    try:
+        number = float(amount)
+    except (TypeError, ValueError):
+        return f"{symbol}{amount}"
+    return f"{symbol}{number:,.0f}" if number.is_integer() else f"{symbol}{number:,.2f}"
+
+
+def format_base_salary(base_salary) -> Optional[str]:
+    """Render a schema.org MonetaryAmount the way salaries are stored elsewhere, e.g. '$90,000 - $120,000'"""
+    if not base_salary:
+        return None
+    if not isinstance(base_salary, dict):
+        return str(base_salary)
+
+    currency = base_salary.get('currency', '')
+    symbol = CURRENCY_SYMBOLS.get(currency, f"{currency} " if currency else '$')
+    value = base_salary.get('value')
+    unit = ''
+    if isinstance(value, dict):
+        unit = value.get('unitText', '')
+        low, high = value.get('minValue'), value.get('maxValue')
+        single = value.get('value')
+    else:
+        low = high = None
+        single = value
+
+    if low is not None and high is not None and low != high:
+        salary = f"{_format_amount(low, symbol)} - {_format_amount(high, symbol)}"
+    elif low is not None or high is not None or single is not None:
+        salary = _format_amount(next(v for v in (single, low, high) if v is not None), symbol)
+    else:
+        return None
+
+    if unit and unit.upper() != 'YEAR':
+        salary += f" per {unit.lower()}"
+    return salary
+
+
+def _format_address(address) -> str:
+    if isinstance(address, list):
+        return '; '.join(filter(None, (_format_address(entry) for entry in address)))
+    if not isinstance(address, dict):
+        return _as_text(address)
+    parts = [address.get(key) for key in ('addressLocality', 'addressRegion', 'addressCountry')]
+    return ', '.join(_as_text(part) for part in parts if part)
+
+
+def format_job_location(job_location) -> str:
+    """Join the address parts of a JobPosting's jobLocation; several addresses are separated by '; '"""
+    if isinstance(job_location, list):
+        job_location = job_location[0] if job_location else None
+    if not isinstance(job_location, dict):
+        return _as_text(job_location)
+    return _format_address(job_location.get('address', job_location))
+
+
+def job_posting_details(posting: Dict, clean_text: Callable[[str], str],
+                        extract_salary: Callable[[str], Optional[str]]) -> Dict:
+    """Map a JobPosting onto the detail fields the scrapers return"""
+    description = clean_text(html_to_text(_as_text(posting.get('description'))))
+    requirements = clean_text(html_to_text(' '.join(filter(None, (
+        _as_text(posting.get(key)) for key in ('qualifications', 'experienceRequirements', 'skills')
+    )))))
+    salary = format_base_salary(posting.get('baseSalary')) or extract_salary(description)
+
+    details = {
+        'description': description,
+        'requirements': requirements,
+        'salary': salary,
+        'posted_date': posting.get('datePosted') or None
+    }
+    location = format_job_location(posting.get('jobLocation'))
+    if location:
+        details['location'] = clean_text(location)
+    return details
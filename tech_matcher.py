@@ -0,0 +1,294 @@
+import hashlib
+import json
+import os
+import re
+from collections import deque
+from itertools import islice
+from typing import Dict, Iterable, Iterator, List, Optional, Sequence, Set, Union
+import logging
+
+logger = logging.getLogger(__name__)
+
+# Technology keywords extracted from job text; each match is reported as keyword.title()
+TECH_STACK_KEYWORDS = frozenset({
+    # Programming Languages
+    'python', 'java', 'javascript', 'typescript', 'c#', 'c++', 'c', 'php', 'ruby', 'go', 'rust', 'swift', 'kotlin', 'scala', 'r',
+
+    # Web Frameworks
+    'django', 'flask', 'fastapi', 'react', 'angular', 'vue', 'node.js', 'express', 'laravel', 'spring', 'ruby on rails',
+
+    # Databases
+    'mysql', 'postgresql', 'mongodb', 'sqlite', 'oracle', 'sql server', 'redis', 'cassandra', 'dynamodb', 'elasticsearch',
+
+    # Cloud & DevOps
+    'aws', 'azure', 'gcp', 'docker', 'kubernetes', 'jenkins', 'terraform', 'ansible', 'github actions', 'gitlab ci',
+
+    # Tools & Technologies
+    'git', 'linux', 'unix', 'nginx', 'apache', 'rabbitmq', 'kafka', 'spark', 'hadoop', 'airflow',
+
+    # Testing & Quality
+    'pytest', 'junit', 'selenium', 'cypress', 'jest', 'mocha', 'postman',
+
+    # Data Science & ML
+    'pandas', 'numpy', 'scikit-learn', 'tensorflow', 'pytorch', 'keras', 'jupyter', 'tableau', 'power bi',
+
+    # Mobile
+    'android', 'ios', 'react native', 'flutter', 'xamarin',
+
+    # Other
+    'microservices', 'rest api', 'graphql', 'websockets', 'oauth', 'jwt', 'ci/cd', 'agile', 'scrum'
+})
+
+# Special handling for common variations
+TECH_VARIATIONS = {
+    'nodejs': 'Node.js',
+    'node js': 'Node.js',
+    'reactjs': 'React',
+    'react.js': 'React',
+    'vuejs': 'Vue',
+    'vue.js': 'Vue',
+    'angularjs': 'Angular',
+    'c sharp': 'C#',
+    'dot net': '.NET',
+    'dotnet': '.NET',
+    'postgresql': 'PostgreSQL',
+    'mongo db': 'MongoDB',
+    'sql server': 'SQL Server',
+    'amazon web services': 'AWS',
+    'google cloud': 'GCP',
+    'machine learning': 'Machine Learning',
+    'artificial intelligence': 'AI',
+    'deep learning': 'Deep Learning'
+}
+
+# Jobs sent to a worker process per task; large enough to amortize pickling
+DEFAULT_CHUNK_SIZE = 500
+
+# Batches smaller than this are tagged in-process; a pool costs more than it saves
+MIN_PARALLEL_JOBS = 2000
+
+# Compiled matcher tables are cached here, one file per keyword configuration
+DEFAULT_CACHE_DIR = os.path.join(os.path.expanduser('~'), '.cache', 'jd_scraper')
+
+CACHE_FORMAT = 2
+
+
+def config_hash(keywords: Iterable[str], variations: Dict[str, str]) -> str:
+    """Hash of a keyword configuration; a changed list gets a fresh cache entry"""
+    config = {'format': CACHE_FORMAT, 'keywords': sorted(k.lower() for k in keywords), 'variations': sorted(variations.items())}
+    return hashlib.sha1(json.dumps(config).encode('utf-8')).hexdigest()[:16]
+
+
+def _trie_pattern(terms: Iterable[str]) -> str:
+    """Alternation of ``term\\b`` over all terms, factored into a character trie.
+
+    At every node longer continuations are tried before the term ending
+    there, so the longest matching term wins.
+    """
+    trie: Dict = {}
+    for term in terms:
+        node = trie
+        for char in term:
+            node = node.setdefault(char, {})
+        node[''] = {}
+
+    def render(node: Dict) -> str:
+        alternatives = [re.escape(char) + render(child) for char, child in sorted(node.items()) if char]
+        if '' in node:
+            alternatives.append(r'\b')
+        return alternatives[0] if len(alternatives) == 1 else '(?:' + '|'.join(alternatives) + ')'
+
+    return render(trie)
+
+
+def build_tables(keywords: Iterable[str], variations: Dict[str, str]) -> Dict:
+    """Pattern source and lookup tables for one combined matcher.
+
+    Every term (keyword or variation) sits in one trie-shaped alternation
+    behind ``\\b`` and inside a lookahead, so matches may overlap. At one
+    position only the longest term is reported; shorter terms matching at the
+    same position are string prefixes of it and are listed under ``prefixes``
+    to be checked individually.
+    """
+    labels: Dict[str, List[str]] = {}
+    for keyword in keywords:
+        labels.setdefault(keyword.lower(), []).append(keyword.title())
+    for variation, standard in variations.items():
+        labels.setdefault(variation, []).append(standard)
+
+    terms = sorted(labels, key=lambda term: (-len(term), term))
+    prefixes = {
+        term: [other for other in terms if other != term and term.startswith(other)]
+        for term in terms
+    }
+    return {
+        'pattern': r'\b(?=(' + _trie_pattern(terms) + '))',
+        'labels': labels,
+        'prefixes': {term: others for term, others in prefixes.items() if others}
+    }
+
+
+class TechMatcher:
+    """Finds every technology keyword and variation in one scan over the text.
+
+    Same results as searching ``\\bkeyword\\b`` once per keyword, but the text
+    is walked once by a single precompiled pattern.
+    """
+
+    def __init__(self, tables: Dict, config_key: Optional[str] = None):
+        self.tables = tables
+        # Identifies the keyword configuration, e.g. for cache keys; hashed from the tables if not given
+        self.config_key = config_key or hashlib.sha1(json.dumps(tables, sort_keys=True).encode('utf-8')).hexdigest()[:16]
+        self.pattern = re.compile(tables['pattern'])
+        self.labels = tables['labels']
+        self.prefix_patterns = {
+            term: [(other, re.compile(r'\b' + re.escape(other) + r'\b')) for other in others]
+            for term, others in tables['prefixes'].items()
+        }
+
+    def find(self, text: str) -> Set[str]:
+        """Labels of every term in already lowercased text"""
+        found = set()
+        seen_terms = set()
+        for match in self.pattern.finditer(text):
+            term = match.group(1)
+            if term not in seen_terms:
+                seen_terms.add(term)
+                found.update(self.labels[term])
+            for other, other_pattern in self.prefix_patterns.get(term, ()):
+                if other not in seen_terms and other_pattern.match(text, match.start()):
+                    seen_terms.add(other)
+                    found.update(self.labels[other])
+        return found
+
+    def extract(self, title: str, description: str, requirements: str) -> List[str]:
+        full_text = f"{title} {description} {requirements}".lower()
+        return sorted(self.find(full_text))
+
+
+class KeywordSet(set):
+    """Keyword set that counts its in-place edits, so a matcher built from it can tell it is stale in O(1)"""
+    version = 0
+
+
+def _counting_edit(name: str):
+    edit = getattr(set, name)
+
+    def method(self, *args):
+        result = edit(self, *args)
+        self.version += 1
+        return result
+    method.__name__ = name
+    return method
+
+
+for _name in ('add', 'discard', 'remove', 'pop', 'clear', 'update', 'difference_update', 'intersection_update',
+              'symmetric_difference_update', '__ior__', '__iand__', '__isub__', '__ixor__'):
+    setattr(KeywordSet, _name, _counting_edit(_name))
+
+
+_matchers: Dict[str, TechMatcher] = {}
+
+
+def get_tech_matcher(keywords: Iterable[str] = TECH_STACK_KEYWORDS, variations: Optional[Dict[str, str]] = None,
+                     cache_dir: Optional[str] = '') -> TechMatcher:
+    """Matcher for a keyword configuration, built once per process and cached on disk across runs.
+
+    ``cache_dir`` defaults to DEFAULT_CACHE_DIR, read at call time; None keeps the tables in memory only.
+    """
+    variations = TECH_VARIATIONS if variations is None else variations
+    cache_dir = DEFAULT_CACHE_DIR if cache_dir == '' else cache_dir
+    key = config_hash(keywords, variations)
+    matcher = _matchers.get(key)
+    if matcher is not None:
+        return matcher
+
+    tables = None
+    cache_path = os.path.join(cache_dir, f"tech_matcher-{key}.json") if cache_dir else None
+    if cache_path and os.path.exists(cache_path):
+        try:
+            with open(cache_path, 'r', encoding='utf-8') as f:
+                tables = json.load(f)
+        except (OSError, ValueError) as e:
+            logger.warning(f"Ignoring unreadable matcher cache {cache_path}: {str(e)}")
+    if tables is None:
+        tables = build_tables(keywords, variations)
+        if cache_path:
+            try:
+                os.makedirs(cache_dir, exist_ok=True)
+                tmp_path = f"{cache_path}.{os.getpid()}.tmp"
+                with open(tmp_path, 'w', encoding='utf-8') as f:
+                    json.dump(tables, f)
+                os.replace(tmp_path, cache_path)
+            except OSError as e:
+                logger.warning(f"Could not write matcher cache {cache_path}: {str(e)}")
+
+    matcher = _matchers[key] = TechMatcher(tables, key)
+    return matcher
+
+
+_worker_matcher: Optional[TechMatcher] = None
+
+
+def _init_worker(tables: Dict):
+    """Pool initializer: compile the matcher once per worker process"""
+    global _worker_matcher
+    _worker_matcher = TechMatcher(tables)
+
+
+def _extract_chunk(chunk: List[Sequence[str]]) -> List[List[str]]:
+    return [_worker_matcher.extract(*texts) for texts in chunk]
+
+
+def _job_texts(job: Union[Dict, Sequence[str]]) -> tuple:
+    if isinstance(job, dict):
+        return job.get('title') or '', job.get('description') or '', job.get('requirements') or ''
+    return tuple(text or '' for text in job)
+
+
+def iter_technology_stacks(jobs: Iterable[Union[Dict, Sequence[str]]], matcher: Optional[TechMatcher] = None,
+                           processes: Optional[int] = None, chunk_size: int = DEFAULT_CHUNK_SIZE) -> Iterator[List[str]]:
+    """Tech stack of every job, in input order.
+
+    Jobs are dicts with title/description/requirements or
+    ``(title, description, requirements)`` tuples. With more than one process
+    the jobs are chunked across a process pool whose workers each compile the
+    matcher once; only a few chunks per worker are in flight, so the input
+    may be a stream larger than memory.
+    """
+    matcher = matcher or get_tech_matcher()
+    processes = processes or os.cpu_count() or 1
+    texts = (_job_texts(job) for job in jobs)
+
+    first = list(islice(texts, MIN_PARALLEL_JOBS))
+    if processes == 1 or len(first) < MIN_PARALLEL_JOBS:
+        for job_texts in first:
+            yield matcher.extract(*job_texts)
+        for job_texts in texts:
+            yield matcher.extract(*job_texts)
+        return
+
+    def chunks():
+        yield from (first[start:start + chunk_size] for start in range(0, len(first), chunk_size))
+        while True:
+            chunk = list(islice(texts, chunk_size))
+            if not chunk:
+                return
+            yield chunk
+
+    # Imported here: the process pool machinery is only needed for large batches
+    from concurrent.futures import ProcessPoolExecutor
+    with ProcessPoolExecutor(max_workers=processes, initializer=_init_worker, initargs=(matcher.tables,)) as pool:
+        pending = deque()
+        for chunk in chunks():
+            pending.append(pool.submit(_extract_chunk, chunk))
+            if len(pending) >= processes * 2:
+                yield from pending.popleft().result()
+        while pending:
+            yield from pending.popleft().result()
+
+
+def extract_technology_stacks(jobs: Iterable[Union[Dict, Sequence[str]]], matcher: Optional[TechMatcher] = None,
+                              processes: Optional[int] = None, chunk_size: int = DEFAULT_CHUNK_SIZE) -> List[List[str]]:
+    """Batch counterpart of JobScraper.extract_technology_stack; results keep the input order"""
+    return list(iter_technology_stacks(jobs, matcher, processes, chunk_size))
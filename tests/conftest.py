@@ -0,0 +1,16 @@
+import os
+import sys
+
+import pytest
+
+# The scraper modules live at the repository root
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+@pytest.fixture(autouse=True)
+def matcher_cache_dir(tmp_path_factory, monkeypatch):
+    """Compiled matcher tables go to a temporary directory instead of ~/.cache/jd_scraper"""
+    import tech_matcher
+    cache_dir = str(tmp_path_factory.getbasetemp() / 'matcher_cache')
+    monkeypatch.setattr(tech_matcher, 'DEFAULT_CACHE_DIR', cache_dir)
+    return cache_dir
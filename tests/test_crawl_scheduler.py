@@ -0,0 +1,125 @@
+import logging
+import time
+from collections import deque
+
+import pytest
+
+import crawl_scheduler
+from crawl_scheduler import BUDGET_WINDOW, MAX_INTERVAL, MIN_INTERVAL, WARMUP_INTERVAL, CrawlScheduler, SearchTask
+from job_store import JobStore
+from scrape_metrics import ScrapeMetrics
+
+NOW = 1_000_000.0
+
+
+class StubJob:
+    def __init__(self, url):
+        self.url = url
+
+    def to_dict(self):
+        return {'title': 'Python Developer', 'company': 'Acme', 'url': self.url, 'category': 'Python',
+                'technology_stack': ['Python'], 'scraped_date': '2025-07-14T10:00:00', 'source_website': 'linkedin'}
+
+
+class StubScraper:
+    """Scraper with canned results per site: each crawl costs ``requests`` and returns ``urls``"""
+
+    def __init__(self):
+        self.sites = {'linkedin': object(), 'indeed': object()}
+        self.metrics = ScrapeMetrics()
+        self.results = {}
+        self.error = None
+
+    def scrape_website(self, site, categories, location, max_jobs):
+        requests, urls = self.results.get(site, (1, []))
+        self.metrics.inc('requests', requests, site=site)
+        if self.error is not None:
+            raise self.error
+        return [StubJob(url) for url in urls]
+
+
+@pytest.fixture
+def scheduler(tmp_path):
+    with JobStore(str(tmp_path / 'jobs.db')) as store:
+        yield CrawlScheduler(StubScraper(), store, str(tmp_path / 'state.json'), hourly_budget=10, max_jobs=4)
+
+
+def crawled(scheduler, site, category, yield_ewma, last_crawled, next_due=0.0, last_requests=5):
+    task = SearchTask('', site, category, yield_ewma=yield_ewma, last_crawled=last_crawled,
+                      next_due=next_due, crawls=5, last_requests=last_requests)
+    scheduler.tasks[task.key] = task
+    return task
+
+
+def test_due_tasks_run_new_first_then_by_yield_times_staleness(scheduler):
+    crawled(scheduler, 'linkedin', 'AI', yield_ewma=0.5, last_crawled=NOW - 1000)  # score 500
+    crawled(scheduler, 'linkedin', 'Data', yield_ewma=0.1, last_crawled=NOW - 8000)  # score 800
+    crawled(scheduler, 'indeed', 'AI', yield_ewma=1.0, last_crawled=NOW - 100, next_due=NOW + 600)  # not due
+    scheduler.schedule(['linkedin', 'indeed', 'unknown'], ['AI', 'Data', 'Python'], [''])
+
+    order = []
+    for _ in range(5):
+        task, wait = scheduler.next_task(NOW)
+        order.append(task.key)
+        assert wait == 0.0
+    # Never-crawled tasks have an infinite score and come first, in any order among themselves
+    assert set(order[:3]) == {'|linkedin|Python', '|indeed|Python', '|indeed|Data'}
+    assert order[3:] == ['|linkedin|Data', '|linkedin|AI']
+    assert scheduler.next_task(NOW) == (None, 600)
+    assert scheduler.next_task(NOW + 600)[0].key == '|indeed|AI'
+
+
+def test_budget_waits_for_the_oldest_spending_to_leave_the_window(scheduler):
+    scheduler._spent['linkedin'] = deque([(NOW - 3000, 4), (NOW - 1000, 4)])
+    assert scheduler._budget_wait('linkedin', 2, NOW) == 0.0
+    assert scheduler._budget_wait('linkedin', 3, NOW) == NOW - 3000 + BUDGET_WINDOW - NOW
+    assert scheduler._budget_wait('linkedin', 7, NOW) == NOW - 1000 + BUDGET_WINDOW - NOW
+    # Spending older than the window is dropped
+    assert scheduler._budget_wait('linkedin', 3, NOW + 700) == 0.0
+    assert list(scheduler._spent['linkedin']) == [(NOW - 1000, 4)]
+    # A site with no recent spending may always run, even above its budget
+    assert scheduler._budget_wait('indeed', 50, NOW) == 0.0
+
+
+def test_next_task_skips_sites_over_budget(scheduler):
+    crawled(scheduler, 'linkedin', 'AI', yield_ewma=5.0, last_crawled=NOW - 1000)
+    crawled(scheduler, 'indeed', 'AI', yield_ewma=0.1, last_crawled=NOW - 1000)
+    scheduler.schedule(['linkedin', 'indeed'], ['AI'], [''])
+    scheduler._spent['linkedin'] = deque([(NOW - 1200, 8)])
+
+    # The higher-scored linkedin task would need 5 more requests; indeed runs instead
+    task, wait = scheduler.next_task(NOW)
+    assert task.key == '|indeed|AI'
+    assert scheduler.next_task(NOW) == (None, 2400)
+    assert scheduler.next_task(NOW + 2400)[0].key == '|linkedin|AI'
+
+
+def test_empty_first_crawls_are_retried_within_the_warmup_interval(scheduler):
+    task = SearchTask('', 'linkedin', 'Python')
+    scheduler.scraper.results['linkedin'] = (3, [])
+    for crawls in range(1, 4):
+        assert scheduler.crawl(task) == 0
+        assert task.yield_ewma == 0.0
+        expected = WARMUP_INTERVAL if crawls < crawl_scheduler.WARMUP_CRAWLS else MAX_INTERVAL
+        assert task.next_due - task.last_crawled == expected
+
+    # A productive search gets a short interval straight away
+    task = SearchTask('', 'indeed', 'Python')
+    scheduler.scraper.results['indeed'] = (2, ['https://example.com/1', 'https://example.com/2'])
+    assert scheduler.crawl(task) == 2
+    assert task.next_due - task.last_crawled == MIN_INTERVAL
+    assert scheduler.crawl(task) == 0  # the same URLs are no longer new
+
+
+def test_failed_crawl_is_charged_and_requeued(scheduler, caplog):
+    caplog.set_level(logging.CRITICAL)
+    scheduler.schedule(['linkedin'], ['Python'], [''])
+    scheduler.scraper.results['linkedin'] = (7, [])
+    scheduler.scraper.error = RuntimeError('parser broke')
+    assert scheduler.run(max_crawls=1) == 1
+
+    assert [count for _, count in scheduler._spent['linkedin']] == [7]
+    task = scheduler.tasks['|linkedin|Python']
+    assert task.crawls == 0
+    assert time.time() + MIN_INTERVAL - 60 < task.next_due <= time.time() + MIN_INTERVAL
+    assert scheduler._waiting == [(task.next_due, task.key)]
@@ -0,0 +1,92 @@
+import logging
+
+import pytest
+
+from benchmark import _synthetic_site_pages
+from distributed_crawl import CrawlWorker, enqueue_searches
+from fixture_replay import FixtureStore, StandInServer, install_stand_in
+from test_scrape_replay import WEBSITES, make_scraper
+from work_queue import WorkQueue
+
+PAGES = 4
+
+
+@pytest.fixture(scope='module')
+def paged_fixtures(tmp_path_factory):
+    """Indeed search with two pages of 10 cards, then an empty third page"""
+    store = FixtureStore(str(tmp_path_factory.mktemp('paged_fixtures')))
+    scraper = make_scraper('requests')
+    adapter = scraper.sites.get('indeed')
+    first = adapter.search_urls('Python', '')[0]
+    urls = [first] + [first + adapter.page_param.format(page * adapter.page_size) for page in (1, 2)]
+    for page, url in enumerate(urls):
+        search_html, details = _synthetic_site_pages('indeed', scraper.website_configs['indeed'], 10 if page < 2 else 0,
+                                                     page * 10)
+        store.save(url, 200, search_html.encode('utf-8'))
+        for detail_url, detail_html in details:
+            store.save(detail_url, 200, detail_html.encode('utf-8'))
+    return store
+
+
+@pytest.fixture
+def crawl(paged_fixtures, tmp_path, monkeypatch, caplog):
+    caplog.set_level(logging.WARNING)
+    scraper = make_scraper('requests')
+    monkeypatch.setattr(scraper.sites.get('indeed'), 'max_pages', PAGES)
+    queue = WorkQueue(str(tmp_path / 'queue.db'))
+
+    def run(max_jobs):
+        enqueue_searches(queue, scraper, ['indeed'], ['Python'], [''], max_jobs)
+        with StandInServer(paged_fixtures) as server:
+            install_stand_in(scraper, server.url)
+            CrawlWorker(queue, scraper, 'w1').run(idle_timeout=0)
+        return scraper, queue
+
+    yield run
+    queue.close()
+
+
+def test_enqueue_queues_the_first_page_of_each_search(tmp_path, monkeypatch):
+    scraper = make_scraper('requests')
+    monkeypatch.setattr(scraper.sites.get('indeed'), 'max_pages', PAGES)
+    queue = WorkQueue(str(tmp_path / 'queue.db'))
+    assert enqueue_searches(queue, scraper, WEBSITES + ['unknown'], ['Python', 'AI'], [''], 20) == 6
+    tasks = []
+    while (task := queue.lease('w1')) is not None:
+        tasks.append(task)
+    assert {(task.payload['site'], task.payload['page']) for task in tasks} == {(site, 0) for site in WEBSITES}
+    assert all(task.payload['url'] == scraper.sites.get(task.payload['site']).search_urls(
+        task.payload['category'], '')[0] for task in tasks)
+    queue.close()
+
+
+def test_next_page_is_queued_only_while_cards_are_needed(crawl):
+    scraper, queue = crawl(15)
+    # Page 1 gives 10 cards, page 2 the remaining 5; page 3 is never requested
+    assert queue.stats()['results'] == 15
+    assert scraper.metrics.total('responses', site='indeed') == 2 + 15
+    assert queue.stats()['search_done'] == 2
+
+
+def test_pagination_stops_at_an_empty_page(crawl):
+    scraper, queue = crawl(100)
+    assert queue.stats()['results'] == 20
+    # Two full pages and the empty third one; the fourth is never queued
+    assert scraper.metrics.total('responses', site='indeed') == 3 + 20
+    assert queue.stats()['search_done'] == 3
+
+
+def test_request_slots_are_reserved_per_host(tmp_path):
+    scraper = make_scraper('requests')
+    scraper.request_delay = 60
+    queue = WorkQueue(str(tmp_path / 'queue.db'))
+    worker = CrawlWorker(queue, scraper, 'w1')
+    adapter = scraper.sites.get('indeed')
+    # Each host's first request goes out at once, whatever other hosts of the site have reserved
+    scraper._sleep = lambda seconds, website: pytest.fail(f"waited {seconds}s")
+    worker._throttle(adapter, 'https://uk.indeed.com/viewjob?jk=1')
+    worker._throttle(adapter, 'https://www.indeed.com/jobs?q=python')
+    hosts = {row[0] for row in queue.conn.execute('SELECT host FROM rate_slots')}
+    assert hosts == {'uk.indeed.com', 'www.indeed.com'}
+    assert queue.reserve_slot('www.indeed.com', 60) > 59
+    queue.close()
@@ -0,0 +1,38 @@
+import enrichment_cache
+from enrichment_cache import EnrichmentCache
+
+
+def test_hits_refresh_lru_order_in_batches(tmp_path, monkeypatch):
+    monkeypatch.setattr(enrichment_cache, 'TOUCH_BATCH_SIZE', 3)
+    cache = EnrichmentCache(str(tmp_path / 'cache.db'), max_entries=2)
+    for key in ('a', 'b', 'c'):
+        cache.put(key, [key.upper()], 'Python')
+    last_used = lambda: dict(cache.conn.execute('SELECT key, last_used FROM enrichment'))
+
+    before = last_used()
+    assert cache.get('a') == (['A'], 'Python')
+    assert cache.get('missing') is None
+    assert (cache.hits, cache.misses) == (1, 1)
+    assert last_used() == before  # the refresh is held in memory
+
+    # Evicting writes pending refreshes first, so 'a' outlives the older 'b'
+    assert cache.evict() == 1
+    assert sorted(last_used()) == ['a', 'c']
+    cache.put('d', ['D'], 'AI')
+    for key in ('a', 'c', 'a', 'd'):
+        cache.get(key)
+    assert not cache._touched  # flushed at the batch size
+    cache.close()
+
+
+def test_close_writes_pending_refreshes(tmp_path):
+    path = str(tmp_path / 'cache.db')
+    cache = EnrichmentCache(path)
+    cache.put('a', ['Python'], 'Python')
+    before = cache.conn.execute('SELECT last_used FROM enrichment').fetchone()[0]
+    cache.get('a')
+    cache.close()
+
+    cache = EnrichmentCache(path)
+    assert cache.conn.execute('SELECT last_used FROM enrichment').fetchone()[0] > before
+    cache.close()
@@ -0,0 +1,51 @@
+import json
+import logging
+
+from html_archive import HtmlArchive, reparse
+from job_archive import iter_archive
+
+DESCRIPTION = 'Build Python services with Django and PostgreSQL on AWS.'
+
+
+def detail_page(title=None, json_ld=None):
+    head = f"<title>{title}</title>" if title else ''
+    if json_ld:
+        head += f'<script type="application/ld+json">{json.dumps(json_ld)}</script>'
+    return (f'<html><head>{head}</head><body><div class="show-more-less-html__markup">{DESCRIPTION}</div>'
+            f'</body></html>').encode('utf-8')
+
+
+def test_latest_only_picks_the_newest_fetch_not_the_last_indexed(tmp_path):
+    with HtmlArchive(str(tmp_path / 'archive')) as archive:
+        archive.write('https://example.com/a', 'linkedin', 'detail_fetch', 200, b'new', fetched_at=200.0)
+        archive.write('https://example.com/a?utm_source=x', 'linkedin', 'detail_fetch', 200, b'old', fetched_at=100.0)
+        archive.write('https://example.com/b', 'linkedin', 'detail_fetch', 200, b'b', fetched_at=150.0)
+        archive.write('https://example.com/b', 'linkedin', 'detail_fetch', 500, b'error', fetched_at=300.0)
+
+        latest = {entry['url']: entry['fetched_at'] for entry in archive.entries(latest_only=True)}
+        assert latest == {'https://example.com/a': 200.0, 'https://example.com/b': 150.0}
+        assert [archive.read(entry)['content'] for entry in archive.entries(latest_only=True, until=150.0)] == [b'old']
+        assert archive.get('https://example.com/a', at=150.0)['content'] == b'old'
+
+
+def test_reparse_builds_jobs_without_a_search_card_from_the_page(tmp_path, caplog):
+    caplog.set_level(logging.WARNING)
+    with HtmlArchive(str(tmp_path / 'archive')) as archive:
+        posting = {'@type': 'JobPosting', 'title': 'Backend Engineer', 'description': DESCRIPTION,
+                   'hiringOrganization': {'name': 'Acme'},
+                   'jobLocation': {'address': {'addressLocality': 'Sydney', 'addressCountry': 'AU'}}}
+        archive.write('https://www.linkedin.com/jobs/view/1', 'linkedin', 'detail_fetch', 200,
+                      detail_page(json_ld=posting))
+        archive.write('https://www.linkedin.com/jobs/view/2', 'linkedin', 'detail_fetch', 200,
+                      detail_page(title='Python Developer | Sydney'))
+        archive.write('https://www.linkedin.com/jobs/view/3', 'linkedin', 'detail_fetch', 200, detail_page())
+
+    output = str(tmp_path / 'reparsed.json')
+    assert reparse(str(tmp_path / 'archive'), 'JD_scrapper', output, processes=1) == 2
+    jobs = {job['url']: job for _, job in iter_archive(output)}
+    first = jobs['https://www.linkedin.com/jobs/view/1']
+    assert (first['title'], first['company'], first['location']) == ('Backend Engineer', 'Acme', 'Sydney, AU')
+    second = jobs['https://www.linkedin.com/jobs/view/2']
+    assert (second['title'], second['company'], second['location']) == \
+        ('Python Developer | Sydney', 'Not specified', 'Not specified')
+    assert 'Django' in second['technology_stack']
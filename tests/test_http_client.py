@@ -0,0 +1,53 @@
+import socket
+
+import pytest
+import requests
+
+from fixture_replay import FixtureStore, StandInServer
+from http_client import make_session
+
+PAGE_URL = 'https://example.com/page'
+
+
+@pytest.fixture(scope='module')
+def server(tmp_path_factory):
+    store = FixtureStore(str(tmp_path_factory.mktemp('fixtures')))
+    store.save(PAGE_URL, 200, b'x' * 200000, 'application/octet-stream')
+    with StandInServer(store) as server:
+        yield server
+
+
+def free_slots(session):
+    return session.get_adapter('http://').limiter._value
+
+
+def test_plain_request_releases_its_slot(server):
+    session = make_session(max_total=2, dns_ttl=None)
+    response = session.get(f"{server.url}/?url={PAGE_URL}")
+    assert len(response.content) == 200000
+    assert free_slots(session) == 2
+
+
+def test_streamed_response_holds_its_slot_until_read_or_closed(server):
+    session = make_session(max_total=2, dns_ttl=None)
+    response = session.get(f"{server.url}/?url={PAGE_URL}", stream=True)
+    assert free_slots(session) == 1
+    assert sum(len(chunk) for chunk in response.iter_content(4096)) == 200000
+    assert free_slots(session) == 2
+    response.close()  # releasing twice must not over-release the semaphore
+    assert free_slots(session) == 2
+
+    with session.get(f"{server.url}/?url=missing", stream=True) as response:
+        assert response.status_code == 404
+        assert free_slots(session) == 1
+    assert free_slots(session) == 2
+
+
+def test_failed_request_releases_its_slot():
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        port = sock.getsockname()[1]
+    session = make_session(max_total=2, dns_ttl=None)
+    with pytest.raises(requests.ConnectionError):
+        session.get(f"http://127.0.0.1:{port}/", timeout=2)
+    assert free_slots(session) == 2
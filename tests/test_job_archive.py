@@ -0,0 +1,89 @@
+import json
+
+import job_archive
+from job_archive import (ArchiveWriter, LazyJob, SplitArchiveWriter, iter_archive, iter_jobs, iter_lazy_archive,
+                         summarize_jobs)
+
+
+def make_jobs(count):
+    return [
+        {'title': f"Python Developer {n}", 'company': 'Acme', 'category': 'AI' if n % 2 else 'Python',
+         'description': f"Désigner des API — job {n} " + 'x' * n, 'requirements': None if n == 2 else f"{n}+ years",
+         'technology_stack': ['Python', 'Django'][:n % 3], 'url': f"https://example.com/{n}",
+         'source_website': 'linkedin'}
+        for n in range(5)
+    ]
+
+
+def write_split(path, jobs):
+    with SplitArchiveWriter(str(path)) as writer:
+        for n, job in enumerate(jobs, 1):
+            writer.write(f"JD{n:03d}", job)
+    return str(path)
+
+
+def count_blob_reads(monkeypatch):
+    reads = []
+    read = job_archive.TextBlob.read
+
+    def counting_read(blob, offset, length):
+        reads.append((offset, length))
+        return read(blob, offset, length)
+    monkeypatch.setattr(job_archive.TextBlob, 'read', counting_read)
+    return reads
+
+
+def test_split_archive_round_trips(tmp_path):
+    jobs = make_jobs(5)
+    path = write_split(tmp_path / 'jobs.jsonl', jobs)
+
+    assert list(iter_archive(path)) == [(f"JD{n:03d}", job) for n, job in enumerate(jobs, 1)]
+    lazy = list(iter_lazy_archive(path))
+    assert all(isinstance(job, LazyJob) for _, job in lazy)
+    assert [(key, job.to_dict()) for key, job in lazy] == [(f"JD{n:03d}", job) for n, job in enumerate(jobs, 1)]
+
+    # Metadata lines hold offsets; only strings go to the blob
+    with open(path, 'r', encoding='utf-8') as f:
+        record = json.loads(f.readline())
+    assert record['description'] == [0, len(jobs[0]['description'].encode('utf-8'))]
+    assert record['_text'] == ['description', 'requirements']
+
+
+def test_text_fields_are_read_from_the_blob_only_when_accessed(tmp_path, monkeypatch):
+    jobs = make_jobs(5)
+    path = write_split(tmp_path / 'jobs.jsonl', jobs)
+    reads = count_blob_reads(monkeypatch)
+
+    lazy = [job for _, job in iter_lazy_archive(path)]
+    assert summarize_jobs(lazy)['categories'] == {'Python': 3, 'AI': 2}
+    assert [job['title'] for job in lazy] == [job['title'] for job in jobs]
+    assert reads == []
+
+    assert lazy[3]['description'] == jobs[3]['description']
+    assert lazy[3]['description'] == jobs[3]['description']
+    assert len(reads) == 1  # decoded once, then kept
+    assert lazy[2]['requirements'] is None  # non-string text fields stay inline
+    assert len(reads) == 1
+    assert lazy[3]['requirements'] == '3+ years'
+    assert len(reads) == 2
+
+
+def test_iter_archive_reads_every_layout(tmp_path):
+    jobs = make_jobs(3)
+    with ArchiveWriter(str(tmp_path / 'jobs.json')) as writer:
+        for n, job in enumerate(jobs, 1):
+            writer.write(f"JD{n:03d}", job)
+    with ArchiveWriter(str(tmp_path / 'jobs.jsonl'), jsonl=True) as writer:
+        for n, job in enumerate(jobs, 1):
+            writer.write(f"JD{n:03d}", job)
+    (tmp_path / 'array.json').write_text(json.dumps(jobs), encoding='utf-8')
+    with ArchiveWriter(str(tmp_path / 'empty.json')):
+        pass
+
+    expected = [(f"JD{n:03d}", job) for n, job in enumerate(jobs, 1)]
+    assert list(iter_archive(str(tmp_path / 'jobs.json'), chunk_size=16)) == expected
+    assert list(iter_archive(str(tmp_path / 'jobs.jsonl'))) == expected
+    assert list(iter_archive(str(tmp_path / 'array.json'))) == [(str(n), job) for n, job in enumerate(jobs)]
+    assert list(iter_archive(str(tmp_path / 'empty.json'))) == []
+    paths = [str(tmp_path / 'jobs.json'), write_split(tmp_path / 'split.jsonl', jobs)]
+    assert [dict(job) for job in iter_jobs(paths, lazy=True)] == jobs * 2
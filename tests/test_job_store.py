@@ -0,0 +1,91 @@
+import json
+
+import pytest
+
+from job_archive import stable_job_id
+from job_store import JobStore, fts_query
+
+
+def make_job(url, title='Python Developer', description='', technology_stack=(), category='Python', **fields):
+    job = {'title': title, 'company': 'Acme', 'location': 'Sydney, Australia', 'description': description,
+           'requirements': '', 'salary': None, 'category': category, 'technology_stack': list(technology_stack),
+           'url': url, 'posted_date': None, 'scraped_date': '2025-07-14T10:00:00', 'source_website': 'linkedin'}
+    job.update(fields)
+    return job
+
+
+@pytest.fixture
+def store(tmp_path):
+    with JobStore(str(tmp_path / 'jobs.db'), batch_size=2) as store:
+        yield store
+
+
+def test_upsert_by_canonical_url(store):
+    store.add(make_job('https://www.linkedin.com/jobs/view/1?utm_source=x', technology_stack=['Python', 'Django']))
+    store.add(make_job('https://www.linkedin.com/jobs/view/2'))
+    # Same posting under a tracking parameter and a trailing slash replaces the first row
+    store.add(make_job('https://www.linkedin.com/jobs/view/1/', title='Senior Python Developer',
+                       technology_stack=['Python', 'Flask']))
+    store.add(make_job(None, title='No URL'))
+    store.add(make_job(None, title='No URL'))
+    assert store.count() == 3
+
+    job = store.get('https://www.linkedin.com/jobs/view/1')
+    assert job['title'] == 'Senior Python Developer'
+    assert job['technology_stack'] == ['Python', 'Flask']
+    assert store.has_url('https://www.linkedin.com/jobs/view/2?trk=abc')
+    assert not store.has_url('https://www.linkedin.com/jobs/view/3')
+
+
+def test_technology_and_column_filters(store):
+    store.add_many([
+        make_job('https://example.com/1', technology_stack=['Python', 'Kafka'], category='AI'),
+        make_job('https://example.com/2', technology_stack=['Python'], scraped_date='2025-01-01T00:00:00'),
+        make_job('https://example.com/3', technology_stack=['Kafka'], source_website='indeed'),
+    ])
+    urls = lambda **filters: [job['url'] for job in store.query(**filters)]
+    assert urls(technology='Kafka') == ['https://example.com/1', 'https://example.com/3']
+    assert urls(technology='Kafka', category='AI') == ['https://example.com/1']
+    assert urls(technology='Python', since='2025-06-01') == ['https://example.com/1']
+    assert urls(source_website='indeed') == ['https://example.com/3']
+    assert urls(limit=1) == ['https://example.com/1']
+
+    # Re-adding a job replaces its technologies
+    store.add_many([make_job('https://example.com/1', technology_stack=['Go'], category='AI')])
+    assert urls(technology='Kafka') == ['https://example.com/3']
+    assert urls(technology='Go') == ['https://example.com/1']
+
+
+def test_text_search_takes_punctuation_literally(store):
+    store.add_many([
+        make_job('https://example.com/1', description='Modern C++ and CUDA work'),
+        make_job('https://example.com/2', description='Backend in node.js, some "quoted" text'),
+        make_job('https://example.com/3', title='Data Engineer', description='PyTorch pipelines'),
+    ])
+    urls = lambda text: [job['url'] for job in store.query(text=text)]
+    assert urls('c++') == ['https://example.com/1']
+    assert urls('node.js') == ['https://example.com/2']
+    assert urls('"quoted') == ['https://example.com/2']
+    assert urls('cuda OR pytorch') == ['https://example.com/1', 'https://example.com/3']
+    assert urls('pytor*') == ['https://example.com/3']
+    assert urls('python cuda') == ['https://example.com/1']
+    assert urls('OR') == []
+    assert urls('AND NOT NEAR(') == []
+
+
+def test_fts_query_quotes_each_word():
+    assert fts_query('c++ node.js') == '"c++" "node.js"'
+    assert fts_query('a OR b') == '"a" OR "b"'
+    assert fts_query('OR a OR') == '"OR" "a" "OR"'
+    assert fts_query('say "hi"') == '"say" """hi"""'
+    assert fts_query('py*') == '"py"*'
+
+
+def test_export_json_uses_stable_ids(store, tmp_path):
+    job = make_job('https://example.com/1', technology_stack=['Python'])
+    store.add_many([job, make_job('https://example.com/2', category='AI')])
+    assert store.export_json(str(tmp_path / 'out.json'), category='Python') == 1
+    with open(tmp_path / 'out.json', 'r', encoding='utf-8') as f:
+        exported = json.load(f)
+    assert list(exported) == [stable_job_id(job)]
+    assert exported[stable_job_id(job)]['technology_stack'] == ['Python']
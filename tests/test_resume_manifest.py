@@ -0,0 +1,77 @@
+import struct
+
+from resume_manifest import ResumeManifest, image_info, sniff_format
+
+PNG = b'\x89PNG\r\n\x1a\n' + struct.pack('>I', 13) + b'IHDR' + struct.pack('>II', 640, 480) + b'\x08\x02\x00\x00\x00'
+GIF = b'GIF89a' + struct.pack('<HH', 320, 200) + b'\x00\x00\x00'
+# APP0 segment before the start-of-frame, which must be skipped by its length
+JPEG = (b'\xff\xd8' + b'\xff\xe0' + struct.pack('>H', 16) + b'JFIF\x00' + b'\x00' * 9
+        + b'\xff\xc0' + struct.pack('>HBHH', 17, 8, 600, 800) + b'\x03' + b'\x00' * 9 + b'\xff\xd9')
+WEBP_LOSSY = b'RIFF' + struct.pack('<I', 30) + b'WEBPVP8 ' + b'\x00' * 10 + struct.pack('<HH', 1024, 768)
+WEBP_LOSSLESS = b'RIFF' + struct.pack('<I', 30) + b'WEBPVP8L' + b'\x00' * 5 + (99 | 49 << 14).to_bytes(4, 'little')
+
+
+def write(folder, name, data):
+    path = folder / name
+    path.write_bytes(data)
+    return str(path)
+
+
+def test_sniff_format_reads_magic_bytes():
+    assert sniff_format(PNG) == 'png'
+    assert sniff_format(JPEG) == 'jpeg'
+    assert sniff_format(GIF) == 'gif'
+    assert sniff_format(b'GIF87a') == 'gif'
+    assert sniff_format(WEBP_LOSSY) == 'webp'
+    assert sniff_format(b'RIFF\x00\x00\x00\x00WAVE') is None
+    assert sniff_format(b'<html>') is None
+    assert sniff_format(b'') is None
+
+
+def test_image_info_reads_dimensions_from_headers(tmp_path):
+    # Extensions are wrong on purpose: the format comes from the bytes
+    assert image_info(write(tmp_path, 'a.jpg', PNG)) == {'format': 'png', 'width': 640, 'height': 480, 'bytes': len(PNG)}
+    expected = {
+        'b.png': (JPEG, 'jpeg', 800, 600),
+        'c.gif': (GIF, 'gif', 320, 200),
+        'd.webp': (WEBP_LOSSY, 'webp', 1024, 768),
+        'e.webp': (WEBP_LOSSLESS, 'webp', 100, 50),
+        'f.jpg': (b'<html>not an image</html>', None, None, None),
+        'g.jpg': (JPEG[:12], 'jpeg', None, None),  # truncated before the frame header
+    }
+    for name, (data, image_format, width, height) in expected.items():
+        info = image_info(write(tmp_path, name, data))
+        assert (info['format'], info['width'], info['height']) == (image_format, width, height), name
+
+
+def test_record_then_read_back(tmp_path):
+    manifest = ResumeManifest(str(tmp_path / 'nested' / 'manifest.jsonl'))
+    assert manifest.entries() == {}
+    png = write(tmp_path, 'resume_1.png', PNG)
+    entry = manifest.record(png, 'https://i.redd.it/1.png', '/r/resumes/comments/1/')
+    manifest.record(write(tmp_path, 'resume_2.jpg', JPEG), 'https://i.redd.it/2.jpg')
+    # A later entry for the same file wins
+    manifest.record(png, 'https://i.redd.it/1b.png', '/r/resumes/comments/1/')
+
+    entries = ResumeManifest(manifest.path).entries()
+    assert list(entries) == ['resume_1.png', 'resume_2.jpg']
+    assert entries['resume_1.png'] == {**entry, 'url': 'https://i.redd.it/1b.png', 'recorded': entries['resume_1.png']['recorded']}
+    assert entries['resume_2.jpg']['permalink'] is None
+    assert [e['file'] for e in manifest.select(image_format='jpeg')] == ['resume_2.jpg']
+    assert [e['file'] for e in manifest.select(min_width=700)] == ['resume_2.jpg']
+    assert [e['file'] for e in manifest.select(max_bytes=len(PNG))] == ['resume_1.png']
+    assert [[e['file'] for e in batch] for batch in manifest.batches(1)] == [['resume_1.png'], ['resume_2.jpg']]
+
+
+def test_index_folder_adds_only_unrecorded_images(tmp_path):
+    folder = tmp_path / 'resumes'
+    folder.mkdir()
+    manifest = ResumeManifest(str(folder / 'manifest.jsonl'))
+    manifest.record(write(folder, 'resume_1.png', PNG), 'https://i.redd.it/1.png')
+    write(folder, 'resume_2.gif', GIF)
+    write(folder, 'notes.txt', b'not an image')
+    assert manifest.index_folder(str(folder)) == 1
+    assert manifest.index_folder(str(folder)) == 0
+    entries = manifest.entries()
+    assert sorted(entries) == ['resume_1.png', 'resume_2.gif']
+    assert entries['resume_1.png']['url'] == 'https://i.redd.it/1.png'
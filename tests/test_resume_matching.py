@@ -0,0 +1,90 @@
+import math
+import random
+
+import numpy as np
+import pytest
+
+import resume_matching
+from resume_matching import JobIndex
+
+SKILLS = ['Python', 'Django', 'Aws', 'AWS', 'Docker', 'Kubernetes', 'React', 'Go', 'Rust', 'Kafka', 'Spark',
+          'Terraform', 'Postgresql', 'Redis', 'Quantum Basket Weaving', 'Cobol-2030']
+
+
+def make_jobs(count, seed, start=0):
+    rng = random.Random(seed)
+    return [
+        {'title': f"Engineer {n}", 'company': 'Acme', 'location': 'Sydney', 'url': f"https://example.com/jobs/{n}",
+         'technology_stack': rng.sample(SKILLS, rng.randrange(0, 6))}
+        for n in range(start, start + count)
+    ]
+
+
+def make_resumes(count, seed):
+    rng = random.Random(seed)
+    return [rng.sample(SKILLS + ['Fortran'], rng.randrange(0, 7)) for _ in range(count)] + [[]]
+
+
+def brute_force(jobs, resumes, metric, vocabulary):
+    """Scores of every (resume, job) pair, straight from the definitions"""
+    known = {term.lower() for term in vocabulary}
+    job_sets = [{skill.lower() for skill in job['technology_stack']} for job in jobs]
+    resume_sets = [{skill.lower() for skill in skills} & known for skills in resumes]
+    if metric == 'jaccard':
+        return np.array([[len(r & j) / max(len(r | j), 1) for j in job_sets] for r in resume_sets])
+
+    doc_freq = {term: sum(term in j for j in job_sets) for term in known}
+    idf = {term: math.log((1 + len(jobs)) / (1 + df)) + 1 for term, df in doc_freq.items()}
+
+    def norm(terms):
+        return math.sqrt(sum(idf[t] ** 2 for t in terms)) or 1.0
+    return np.array([[sum(idf[t] ** 2 for t in r & j) / (norm(r) * norm(j)) for j in job_sets] for r in resume_sets])
+
+
+def check_top_k(index, jobs, resumes, metric, k):
+    rows, scores = index.top_k(resumes, k=k, metric=metric, job_block=7, resume_block=3)
+    expected = brute_force(jobs, resumes, metric, index.vocabulary)
+    assert rows.shape == scores.shape == (len(resumes), k)
+    for resume, (row_list, score_list) in enumerate(zip(rows, scores)):
+        best = np.sort(expected[resume])[::-1][:k]
+        found = row_list >= 0
+        np.testing.assert_allclose(score_list[found], best, rtol=1e-5, atol=1e-6)
+        # Ties may pick different jobs, but every returned job must carry its true score
+        np.testing.assert_allclose(expected[resume, row_list[found]], score_list[found], rtol=1e-5, atol=1e-6)
+        assert len(set(row_list[found])) == found.sum() == min(k, len(jobs))
+
+
+@pytest.mark.parametrize('metric', ['jaccard', 'tfidf'])
+@pytest.mark.parametrize('sparse_merge_factor', [0, 1000])
+def test_top_k_matches_brute_force_across_incremental_adds(tmp_path, monkeypatch, metric, sparse_merge_factor):
+    # 0 forces the partition merge for every block, 1000 the sparse merge
+    monkeypatch.setattr(resume_matching, 'SPARSE_MERGE_FACTOR', sparse_merge_factor)
+    monkeypatch.setattr(resume_matching, 'ADD_BATCH_SIZE', 13)
+    jobs = make_jobs(60, seed=1)
+    resumes = make_resumes(20, seed=2)
+
+    index = JobIndex(str(tmp_path / 'index'))
+    assert index.add(jobs[:25]) == 25
+    check_top_k(index, jobs[:25], resumes, metric, k=5)
+    index.save()
+
+    # Reloaded index skips jobs it has, grows the vocabulary and keeps document frequencies current
+    index = JobIndex(str(tmp_path / 'index'))
+    more = jobs[20:] + jobs[:3] + make_jobs(5, seed=3, start=1000)
+    more[-1]['technology_stack'] = ['Brand New Framework', 'python']
+    assert index.add(more) == 40
+    all_jobs = jobs + more[-5:]
+    assert len(index) == len(all_jobs)
+    assert 'Brand New Framework' in index.vocabulary
+    check_top_k(index, all_jobs, resumes + [['brand new framework']], metric, k=5)
+    check_top_k(index, all_jobs, resumes, metric, k=len(all_jobs) + 3)
+
+
+def test_match_returns_positive_scores_with_job_fields(tmp_path):
+    index = JobIndex(str(tmp_path / 'index'))
+    index.add(make_jobs(10, seed=4))
+    matches = index.match([['Python', 'Django'], []], k=3)
+    assert len(matches) == 2 and matches[1] == []
+    assert all(match['score'] > 0 and match['url'].startswith('https://example.com/jobs/') for match in matches[0])
+    with pytest.raises(ValueError):
+        index.top_k([['Python']], metric='bm25')
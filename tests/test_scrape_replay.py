@@ -0,0 +1,172 @@
+import importlib
+import logging
+import socket
+
+import pytest
+
+from benchmark import make_synthetic_fixtures
+from crawl_scheduler import CrawlScheduler, SearchTask
+from enrichment_cache import EnrichmentCache
+from fingerprint_store import FingerprintStore
+from fixture_replay import FixtureStore, StandInServer, install_stand_in
+import html_archive
+from html_archive import HtmlArchive, reparse
+from job_archive import iter_archive
+from job_store import JobStore
+
+WEBSITES = ['linkedin', 'indeed', 'remoteok']
+
+
+def make_scraper(transport, module='JD_scrapper'):
+    scraper = importlib.import_module(module).JobScraper(transport=transport)
+    scraper.request_delay = 0
+    scraper.site_delay = 0
+    return scraper
+
+
+@pytest.fixture(scope='module')
+def fixtures(tmp_path_factory):
+    store = FixtureStore(str(tmp_path_factory.mktemp('fixtures')))
+    make_synthetic_fixtures(make_scraper('requests'), store, WEBSITES, ['Python'], '', 10)
+    return store
+
+
+def responses(scraper):
+    return scraper.metrics.total('responses')
+
+
+@pytest.mark.parametrize('module', ['JD_scrapper', 'jd_aus'])
+@pytest.mark.parametrize('transport', ['requests', 'httpx'])
+def test_replayed_scrape_and_fingerprint_refresh(fixtures, tmp_path, module, transport, caplog):
+    caplog.set_level(logging.WARNING)
+    with StandInServer(fixtures) as server:
+        first_jobs = None
+        for run in range(2):
+            scraper = make_scraper(transport, module)
+            scraper.fingerprints = FingerprintStore(str(tmp_path / 'fingerprints.db'))
+            install_stand_in(scraper, server.url)
+            jobs = scraper.scrape_all_websites(WEBSITES, ['Python'], '', 10)
+            if run == 0:
+                # One search page per site (it already fills max_jobs) and every job page
+                assert len(jobs) == 30
+                assert responses(scraper) == 33
+                assert {job['category'] for job in jobs} == {'Python'}
+                assert all(job['technology_stack'] for job in jobs)
+                assert list(jobs[0]) == list(scraper.listing_class.__dataclass_fields__)
+                first_jobs = jobs
+            else:
+                # Unchanged cards skip their job pages but still return the stored listings
+                assert jobs == first_jobs
+                assert responses(scraper) == 3
+                assert scraper.metrics.total('fingerprint_hits') == 30
+
+
+def test_fingerprint_is_not_recorded_when_the_job_cannot_be_built(fixtures, tmp_path, caplog):
+    caplog.set_level(logging.CRITICAL)
+    with StandInServer(fixtures) as server:
+        scraper = make_scraper('requests')
+        scraper.fingerprints = FingerprintStore(str(tmp_path / 'fingerprints.db'))
+        install_stand_in(scraper, server.url)
+
+        def broken_build(card, job_details, website):
+            raise ValueError('broken')
+        scraper._build_job = broken_build
+        assert scraper.scrape_all_websites(WEBSITES, ['Python'], '', 10) == []
+
+        # Nothing was recorded, so the next scrape fetches every job page again
+        scraper = make_scraper('requests')
+        scraper.fingerprints = FingerprintStore(str(tmp_path / 'fingerprints.db'))
+        install_stand_in(scraper, server.url)
+        assert len(scraper.scrape_all_websites(WEBSITES, ['Python'], '', 10)) == 30
+        assert responses(scraper) == 33
+
+
+def test_enrichment_cache_follows_category_and_keyword_edits(fixtures, tmp_path, caplog):
+    caplog.set_level(logging.WARNING)
+    scraper = make_scraper('requests')
+    scraper.enrichment_cache = EnrichmentCache(str(tmp_path / 'enrichment.db'))
+
+    def scrape():
+        hits, misses = scraper.metrics.total('enrichment_cache_hits'), scraper.metrics.total('enrichment_cache_misses')
+        jobs = scraper.scrape_all_websites(WEBSITES, ['Python'], '', 10)
+        return (jobs, scraper.metrics.total('enrichment_cache_hits') - hits,
+                scraper.metrics.total('enrichment_cache_misses') - misses)
+
+    with StandInServer(fixtures) as server:
+        install_stand_in(scraper, server.url)
+        jobs, hits, misses = scrape()
+        assert (len(jobs), hits, misses) == (30, 0, 30)
+        jobs, hits, misses = scrape()
+        assert (len(jobs), hits, misses) == (30, 30, 0)
+
+        # In-place edits change the configuration version from the next scrape on
+        scraper.tech_stack_keywords.add('golang')
+        jobs, hits, misses = scrape()
+        assert (len(jobs), hits, misses) == (30, 0, 30)
+        scraper.categories['Python'][:] = ['no such keyword']
+        jobs, hits, misses = scrape()
+        assert (hits, misses) == (0, 30)
+        assert 'Python' not in {job['category'] for job in jobs}
+    scraper.enrichment_cache.close()
+
+
+@pytest.mark.parametrize('transport', ['requests', 'httpx'])
+def test_archived_pages_are_indexed_after_a_scrape(fixtures, tmp_path, transport, caplog):
+    caplog.set_level(logging.WARNING)
+    scraper = make_scraper(transport)
+    scraper.html_archive = HtmlArchive(str(tmp_path / 'archive'))
+    with StandInServer(fixtures) as server:
+        install_stand_in(scraper, server.url)
+        scraper.scrape_all_websites(WEBSITES, ['Python'], '', 10)
+
+    # Visible to other readers before the archive is closed
+    reader = HtmlArchive(str(tmp_path / 'archive'))
+    assert len(list(reader.entries())) == 33
+    assert len(list(reader.entries(stage='search_fetch'))) == 3
+    reader.close()
+    scraper.html_archive.close()
+
+
+def test_reparse_rebuilds_scraped_jobs_offline(fixtures, tmp_path, monkeypatch, caplog):
+    caplog.set_level(logging.WARNING)
+    # Small chunks keep several worker tasks in flight while entries are still streaming
+    monkeypatch.setattr(html_archive, 'REPARSE_CHUNK_SIZE', 4)
+    scraper = make_scraper('requests')
+    scraper.html_archive = HtmlArchive(str(tmp_path / 'archive'))
+    with StandInServer(fixtures) as server:
+        install_stand_in(scraper, server.url)
+        jobs = scraper.scrape_all_websites(WEBSITES, ['Python'], '', 10)
+    scraper.html_archive.close()
+
+    output = str(tmp_path / 'reparsed.json')
+    assert reparse(str(tmp_path / 'archive'), 'JD_scrapper', output, processes=2) == 30
+    reparsed = {job['url']: job for _, job in iter_archive(output)}
+    assert set(reparsed) == {job['url'] for job in jobs}
+    for job in jobs:
+        again = reparsed[job['url']]
+        for field in ('title', 'company', 'location', 'description', 'technology_stack', 'category'):
+            assert again[field] == job[field]
+
+
+@pytest.mark.parametrize('transport', ['requests', 'httpx'])
+def test_scheduler_charges_failed_requests(fixtures, tmp_path, transport, caplog):
+    caplog.set_level(logging.CRITICAL)
+    scraper = make_scraper(transport)
+    scheduler = CrawlScheduler(scraper, JobStore(str(tmp_path / 'jobs.db')), str(tmp_path / 'state.json'), max_jobs=10)
+    task = SearchTask('', 'linkedin', 'Python')
+
+    with StandInServer(fixtures) as server:
+        install_stand_in(scraper, server.url)
+        assert scheduler.crawl(task) == 10
+        assert task.last_requests == 11
+
+    # Nothing listens on a closed port: the search request fails without a response, but still costs budget
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        port = sock.getsockname()[1]
+    install_stand_in(scraper, f"http://127.0.0.1:{port}")
+    assert scheduler.crawl(task) == 0
+    assert task.last_requests == 1
+    assert task.requests == 12
+    assert scraper.metrics.total('request_errors', site='linkedin') == 1
+    assert scraper.metrics.total('responses', site='linkedin') == 11
@@ -0,0 +1,65 @@
+import json
+
+from structured_data import find_job_posting, format_base_salary, format_job_location, html_to_text, job_posting_details
+
+
+def page(*payloads: str) -> bytes:
+    scripts = ''.join(f'<script type="application/ld+json">{payload}</script>' for payload in payloads)
+    return f'<html><head>{scripts}</head><body></body></html>'.encode('utf-8')
+
+
+POSTING = {
+    '@type': 'JobPosting',
+    'title': 'Python Developer',
+    'description': '<p>Build APIs</p><ul><li>Django</li></ul>',
+    'qualifications': '3+ years of Python',
+    'datePosted': '2024-05-01',
+    'baseSalary': {'currency': 'AUD', 'value': {'minValue': 90000, 'maxValue': 120000, 'unitText': 'YEAR'}},
+    'jobLocation': {'address': {'addressLocality': 'Sydney', 'addressRegion': 'NSW', 'addressCountry': 'AU'}},
+}
+
+
+def test_find_job_posting_skips_other_nodes_and_broken_blocks():
+    content = page('{not json', json.dumps({'@type': 'Organization'}), json.dumps(POSTING))
+    assert find_job_posting(content)['title'] == 'Python Developer'
+
+
+def test_find_job_posting_in_graph_with_type_list_and_cdata():
+    graph = {'@graph': [{'@type': 'WebPage'}, dict(POSTING, **{'@type': ['JobPosting', 'Thing']})]}
+    content = page('<![CDATA[' + json.dumps(graph) + ']]>')
+    assert find_job_posting(content)['datePosted'] == '2024-05-01'
+
+
+def test_find_job_posting_without_json_ld():
+    assert find_job_posting(b'<html><body>no data</body></html>') is None
+
+
+def test_format_base_salary():
+    assert format_base_salary(POSTING['baseSalary']) == '$90,000 - $120,000'
+    assert format_base_salary({'currency': 'GBP', 'value': {'value': 25.5, 'unitText': 'HOUR'}}) == '£25.50 per hour'
+    assert format_base_salary(None) is None
+
+
+def test_job_posting_details():
+    details = job_posting_details(POSTING, lambda text: ' '.join(text.split()), lambda text: None)
+    assert 'Build APIs' in details['description'] and 'Django' in details['description']
+    assert '<' not in details['description']
+    assert details['requirements'] == '3+ years of Python'
+    assert details['salary'] == '$90,000 - $120,000'
+    assert details['posted_date'] == '2024-05-01'
+    assert details['location'] == 'Sydney, NSW, AU'
+
+
+def test_html_to_text_decodes_entities_once_after_stripping_tags():
+    assert html_to_text('<p>Generics like List&lt;T&gt;</p><br>R&amp;D') == 'Generics like List<T>  R&D'
+    assert html_to_text('Write &amp;lt;div&amp;gt; by hand') == 'Write &lt;div&gt; by hand'
+    assert html_to_text(None) == ''
+
+
+def test_format_job_location_joins_address_lists():
+    location = {'address': [{'addressLocality': 'Sydney', 'addressCountry': 'AU'},
+                            {'addressLocality': 'Melbourne', 'addressCountry': 'AU'}, 'Remote']}
+    assert format_job_location(location) == 'Sydney, AU; Melbourne, AU; Remote'
+    assert format_job_location([{'address': 'Perth, WA'}]) == 'Perth, WA'
+    assert format_job_location({'address': []}) == ''
+    assert format_job_location(None) == ''
@@ -0,0 +1,100 @@
+import json
+import os
+import random
+import re
+
+from tech_matcher import (TECH_STACK_KEYWORDS, TECH_VARIATIONS, MIN_PARALLEL_JOBS, build_tables, config_hash,
+                          extract_technology_stacks, get_tech_matcher, TechMatcher)
+
+
+def reference_extract(title, description, requirements):
+    """One regex search per keyword and variation, as the scraper originally did"""
+    full_text = f"{title} {description} {requirements}".lower()
+    found = set()
+    for tech in TECH_STACK_KEYWORDS:
+        if re.search(r'\b' + re.escape(tech.lower()) + r'\b', full_text):
+            found.add(tech.title())
+    for variation, standard in TECH_VARIATIONS.items():
+        if re.search(r'\b' + re.escape(variation) + r'\b', full_text):
+            found.add(standard)
+    return sorted(found)
+
+
+def random_texts(count, seed=0):
+    rng = random.Random(seed)
+    vocabulary = sorted(TECH_STACK_KEYWORDS) + sorted(TECH_VARIATIONS) + [
+        'developer', 'team', 'c++11', 'go-to', 'rustic', 'javascripts', 'node', 'js', 'react-native', '.', ',', '/',
+        'sql', 'server', 'ci', 'cd', 'power', 'bi', 'ruby', 'on', 'rails', 'scikit', 'learn'
+    ]
+    separators = [' ', ' ', ' ', ', ', '/', '-', '.', '(']
+    for _ in range(count):
+        words = [rng.choice(vocabulary) for _ in range(rng.randrange(1, 25))]
+        text = ''.join(word + rng.choice(separators) for word in words)
+        yield text.upper() if rng.random() < 0.2 else text
+
+
+def test_matcher_matches_per_keyword_search():
+    matcher = TechMatcher(build_tables(TECH_STACK_KEYWORDS, TECH_VARIATIONS))
+    for text in random_texts(3000):
+        assert matcher.extract('', text, '') == reference_extract('', text, ''), text
+
+
+def test_overlapping_and_prefix_terms():
+    matcher = get_tech_matcher(cache_dir=None)
+    assert matcher.extract('React Native developer', 'react.js and node js', 'c++ and c#') == \
+        reference_extract('React Native developer', 'react.js and node js', 'c++ and c#')
+    assert 'Sql Server' in matcher.extract('', 'sql server', '')
+
+
+def test_cached_tables_round_trip(tmp_path):
+    matcher = get_tech_matcher(['python', 'go'], {}, cache_dir=str(tmp_path))
+    cache_files = list(tmp_path.iterdir())
+    assert len(cache_files) == 1
+
+    with open(cache_files[0], 'r', encoding='utf-8') as f:
+        cached = TechMatcher(json.load(f))
+    for text in ('Go developer, python', 'going pythonic', 'GO/Python'):
+        assert cached.extract('', text, '') == matcher.extract('', text, '')
+
+
+def test_scraper_tables_are_per_instance_and_rebuild_the_matcher():
+    from JD_scrapper import CATEGORIES, JobScraper
+    scraper, other = JobScraper(), JobScraper()
+    scraper.categories['Python'].append('pyramid')
+    assert 'pyramid' not in other.categories['Python'] and 'pyramid' not in CATEGORIES['Python']
+
+    assert scraper.extract_technology_stack('Golang developer', '', '') == []
+    scraper.tech_stack_keywords.add('golang')
+    assert scraper.extract_technology_stack('Golang developer', '', '') == ['Golang']
+    assert other.extract_technology_stack('Golang developer', '', '') == []
+
+    scraper.tech_stack_keywords = {'python'}
+    assert scraper.extract_technology_stack('Python and Java', '', '') == ['Python']
+    scraper.tech_stack_keywords |= {'java'}
+    assert scraper.extract_technology_stack('Python and Java', '', '') == ['Java', 'Python']
+    scraper.tech_stack_keywords.discard('python')
+    assert scraper.extract_technology_stack('Python and Java', '', '') == ['Java']
+
+
+def test_tech_matcher_is_only_looked_up_again_after_an_edit(monkeypatch):
+    import JD_scrapper
+    lookups = []
+    monkeypatch.setattr(JD_scrapper, 'get_tech_matcher', lambda keywords: lookups.append(set(keywords)) or object())
+    scraper = JD_scrapper.JobScraper()
+    matcher = scraper.tech_matcher
+    assert scraper.tech_matcher is matcher and len(lookups) == 1
+    scraper.tech_stack_keywords.update(['golang'])
+    assert scraper.tech_matcher is not matcher and 'golang' in lookups[-1]
+    scraper.tech_matcher
+    assert len(lookups) == 2
+
+
+def test_default_cache_dir_is_read_at_call_time(matcher_cache_dir):
+    get_tech_matcher(['python', 'cobol'], {})
+    assert os.path.exists(os.path.join(matcher_cache_dir, f"tech_matcher-{config_hash(['python', 'cobol'], {})}.json"))
+
+
+def test_batch_extraction_keeps_order_across_processes():
+    jobs = [('', text, '') for text in random_texts(MIN_PARALLEL_JOBS + 500, seed=1)]
+    stacks = extract_technology_stacks(jobs, processes=2, chunk_size=300)
+    assert stacks == [reference_extract(*job) for job in jobs]
@@ -0,0 +1,127 @@
+import random
+from collections import Counter
+from itertools import combinations
+
+import numpy as np
+
+import trend_analytics
+from trend_analytics import TrendStore, location_key, time_bucket
+
+TECHS = [f"Tech{i}" for i in range(40)]
+LOCATIONS = ['Sydney, Australia', 'London, United Kingdom', 'Lahore, Pakistan', '']
+CATEGORIES = ['Python', 'AI', 'Database']
+
+
+def make_jobs(count, seed=0, start=0):
+    rng = random.Random(seed)
+    for i in range(start, start + count):
+        yield {
+            'url': f"https://example.com/jobs/{i}",
+            'scraped_date': f"2025-0{rng.randrange(1, 4)}-{rng.randrange(10, 28)}T10:00:00",
+            'location': rng.choice(LOCATIONS),
+            'category': rng.choice(CATEGORIES),
+            'technology_stack': rng.sample(TECHS, rng.randrange(0, 6)),
+        }
+
+
+def brute_force(jobs):
+    mentions, totals, pairs = Counter(), Counter(), Counter()
+    for job in jobs:
+        bucket = time_bucket(job['scraped_date'])
+        location = location_key(job['location'])
+        totals[bucket, location] += 1
+        for tech in job['technology_stack']:
+            mentions[bucket, location, tech] += 1
+        for a, b in combinations(sorted(job['technology_stack']), 2):
+            pairs[job['category'], a, b] += 1
+            pairs[job['category'], b, a] += 1
+    return mentions, totals, pairs
+
+
+def check_against(store, jobs):
+    mentions, totals, pairs = brute_force(jobs)
+    for location in ('Australia', 'Pakistan'):
+        for tech in TECHS[:10]:
+            expected = sorted(
+                (bucket, mentions[bucket, location, tech], total)
+                for (bucket, where), total in totals.items() if where == location
+            )
+            assert store.tech_series(tech, location=location) == expected
+    for category in CATEGORIES:
+        row = Counter({b: count for (c, a, b), count in pairs.items() if c == category and a == 'Tech3'})
+        top = store.cooccurring('Tech3', category=category, k=len(TECHS))
+        assert dict(top) == dict(row)
+
+
+def test_incremental_updates_match_a_full_recount(tmp_path, monkeypatch):
+    # Small batches exercise the seen-table lookups and capacity growth many times
+    monkeypatch.setattr(trend_analytics, 'UPDATE_BATCH_SIZE', 37)
+    jobs = list(make_jobs(600))
+    store = TrendStore(str(tmp_path))
+    assert store.update(jobs[:250]) == 250
+    store.save()
+    store.close()
+
+    # Reloaded store skips jobs it already counted, including duplicates within one update
+    store = TrendStore(str(tmp_path))
+    assert store.update(jobs[200:] + jobs[:10] + jobs[590:]) == 350
+    assert store.seen_count() == 600
+    check_against(store, jobs)
+    assert store.counts.shape == (len(store.groups), len(store.techs))
+    assert store.cooccurrence.shape == (len(store.pairs), len(store.techs), len(store.techs))
+    store.save()
+    store.close()
+
+    store = TrendStore(str(tmp_path))
+    check_against(store, jobs)
+    assert store.update(jobs) == 0
+    store.close()
+
+
+def test_unsaved_updates_are_not_marked_seen(tmp_path):
+    jobs = list(make_jobs(50))
+    store = TrendStore(str(tmp_path))
+    store.update(jobs)
+    store.close()
+
+    store = TrendStore(str(tmp_path))
+    assert store.seen_count() == 0
+    assert store.update(jobs) == 50
+    store.close()
+
+
+def test_top_technologies_and_week_over_week(tmp_path):
+    jobs = [
+        {'url': 'a', 'scraped_date': '2025-07-07', 'location': 'Australia', 'category': 'AI', 'technology_stack': ['Python']},
+        {'url': 'b', 'scraped_date': '2025-07-14', 'location': 'Australia', 'category': 'AI', 'technology_stack': ['Python', 'Go']},
+        {'url': 'c', 'scraped_date': '2025-07-15', 'location': 'Australia', 'category': 'AI', 'technology_stack': ['Python']},
+    ]
+    store = TrendStore(str(tmp_path))
+    store.update(jobs)
+    assert store.top_technologies() == [('Python', 3), ('Go', 1)]
+    changes = store.week_over_week('python')
+    assert [change['jobs'] for change in changes] == [1, 2]
+    assert changes[1]['change'] == 1 and changes[1]['change_pct'] == 100.0
+    store.close()
+
+
+def test_stores_with_fingerprints_in_the_arrays_are_migrated(tmp_path):
+    jobs = list(make_jobs(20))
+    store = TrendStore(str(tmp_path))
+    store.update(jobs)
+    store.save()
+    store.close()
+
+    # Rewrite the arrays the way older versions stored them, with a sorted 'seen' array
+    with np.load(tmp_path / 'trends.npz') as arrays:
+        legacy = dict(arrays)
+    legacy['seen'] = np.sort(np.array([trend_analytics.job_fingerprint(job) for job in jobs], dtype=np.int64))
+    np.savez_compressed(tmp_path / 'trends.npz', **legacy)
+    (tmp_path / 'seen.db').unlink()
+    for suffix in ('-wal', '-shm'):
+        (tmp_path / f"seen.db{suffix}").unlink(missing_ok=True)
+
+    store = TrendStore(str(tmp_path))
+    assert store.seen_count() == 20
+    assert store.update(jobs) == 0
+    store.close()
@@ -0,0 +1,83 @@
+import time
+
+from work_queue import WorkQueue
+
+
+def make_queue(tmp_path):
+    return WorkQueue(str(tmp_path / 'queue.db'))
+
+
+def test_put_dedupes_pending_tasks(tmp_path):
+    queue = make_queue(tmp_path)
+    assert queue.put('search', 'search:a', {'n': 1})
+    assert not queue.put('search', 'search:a', {'n': 2})
+    assert queue.stats()['search_pending'] == 1
+
+
+def test_lease_prefers_detail_tasks_and_ack_finishes(tmp_path):
+    queue = make_queue(tmp_path)
+    queue.put('search', 'search:a', {})
+    queue.put('detail', 'detail:a', {})
+
+    task = queue.lease('w1')
+    assert task.kind == 'detail' and task.attempts == 1
+    assert queue.ack(task, 'w1')
+    assert queue.lease('w1').kind == 'search'
+    assert queue.lease('w1') is None
+
+
+def test_expired_lease_moves_to_another_worker(tmp_path):
+    queue = make_queue(tmp_path)
+    queue.put('search', 'search:a', {})
+    task = queue.lease('w1', lease_seconds=0.01)
+    assert queue.lease('w2') is None
+    time.sleep(0.02)
+
+    stolen = queue.lease('w2')
+    assert stolen.id == task.id and stolen.attempts == 2
+    # The first worker lost its lease, so its ack is rejected
+    assert not queue.ack(task, 'w1')
+    assert queue.ack(stolen, 'w2')
+    assert not queue.has_unfinished()
+
+
+def test_nack_retries_then_fails(tmp_path):
+    queue = make_queue(tmp_path)
+    queue.put('search', 'search:a', {})
+    for _ in range(3):
+        task = queue.lease('w1')
+        queue.nack(task, 'w1', 'boom', max_attempts=3)
+    assert queue.lease('w1') is None
+    assert queue.stats()['search_failed'] == 1
+
+
+def test_new_generation_requeues_finished_tasks(tmp_path):
+    queue = make_queue(tmp_path)
+    first = queue.start_generation()
+    assert queue.put('search', 'search:a', {'n': 1}, first)
+    task = queue.lease('w1')
+    queue.ack(task, 'w1')
+    # Within the same crawl the key stays deduped
+    assert not queue.put('search', 'search:a', {'n': 1}, first)
+
+    second = queue.start_generation()
+    assert second > first
+    assert queue.put('search', 'search:a', {'n': 2}, second)
+    assert not queue.put('search', 'search:a', {'n': 3}, second)
+    again = queue.lease('w1')
+    assert again.payload == {'n': 2} and again.attempts == 1 and again.generation == second
+
+
+def test_unfinished_tasks_are_not_reset_by_a_new_generation(tmp_path):
+    queue = make_queue(tmp_path)
+    queue.put('search', 'search:a', {}, queue.start_generation())
+    leased = queue.lease('w1')
+    assert not queue.put('search', 'search:a', {}, queue.start_generation() + 1)
+    assert queue.ack(leased, 'w1')
+
+
+def test_recrawled_result_replaces_the_stored_job(tmp_path):
+    queue = make_queue(tmp_path)
+    assert queue.add_result('job-1', {'title': 'old'})
+    assert not queue.add_result('job-1', {'title': 'new'})
+    assert list(queue.iter_results()) == [('job-1', {'title': 'new'})]
@@ -0,0 +1,399 @@
+import argparse
+import hashlib
+import json
+import os
+import sqlite3
+from datetime import date
+from typing import Dict, Iterable, List, Optional, Tuple
+import logging
+
+import numpy as np
+
+from job_archive import canonical_url, content_hash, iter_jobs
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_STORE_DIR = 'trends'
+
+# Jobs folded into the aggregates per vectorized update
+UPDATE_BATCH_SIZE = 10000
+
+# Fingerprints per "IN (...)" membership query; stays below SQLite's parameter limit
+SEEN_QUERY_SIZE = 900
+
+
+def time_bucket(value: Optional[str], granularity: str = 'week') -> str:
+    """ISO week ('2025-W28') or day ('2025-07-14') of an ISO date/datetime string"""
+    if not value:
+        return 'unknown'
+    try:
+        day = date.fromisoformat(value[:10])
+    except ValueError:
+        return 'unknown'
+    if granularity == 'day':
+        return day.isoformat()
+    year, week, _ = day.isocalendar()
+    return f"{year}-W{week:02d}"
+
+
+def location_key(location: Optional[str]) -> str:
+    """Coarse market for a job location: the last comma-separated part (usually the country)"""
+    if not location:
+        return 'Not specified'
+    return location.rsplit(',', 1)[-1].strip() or 'Not specified'
+
+
+def job_fingerprint(job: Dict) -> int:
+    """64-bit identity of a job, used to skip jobs already folded into the aggregates"""
+    identity = canonical_url(job.get('url')) or content_hash(job)
+    return int.from_bytes(hashlib.sha1(identity.encode('utf-8')).digest()[:8], 'little', signed=True)
+
+
+class _Codes:
+    """Append-only string <-> integer code table"""
+
+    def __init__(self, values: Iterable[str] = ()):
+        self.values: List[str] = []
+        self.index: Dict[str, int] = {}
+        for value in values:
+            self.code(value)
+
+    def code(self, value: str) -> int:
+        code = self.index.get(value)
+        if code is None:
+            code = self.index[value] = len(self.values)
+            self.values.append(value)
+        return code
+
+    def __len__(self):
+        return len(self.values)
+
+
+class TrendStore:
+    """Incremental technology/category aggregates over the job archive.
+
+    Two aggregates are kept:
+
+    * time-bucketed counts: for every (bucket, location, category) group, the
+      number of jobs and the number of jobs mentioning each technology;
+    * co-occurrence matrices: for every (location, category), how often each
+      pair of technologies appears in the same job.
+
+    Each job's technology_stack becomes a row of a boolean bitset matrix over
+    the technology vocabulary, and updates are NumPy scatter-adds and matrix
+    products over only the jobs not seen before. Seen jobs are 64-bit
+    fingerprints in an indexed SQLite table, so skipping known jobs costs one
+    lookup per job, not a pass over everything seen. The arrays grow by
+    doubling their capacity. An update therefore costs O(new jobs), plus
+    amortized growth. ``save`` rewrites the aggregates, which scale with
+    groups x technologies (and pairs x technologies^2), not with jobs seen.
+    """
+
+    def __init__(self, directory: str = DEFAULT_STORE_DIR, granularity: str = 'week', date_field: str = 'scraped_date'):
+        self.directory = directory
+        self.granularity = granularity
+        self.date_field = date_field
+        self.techs = _Codes()
+        self._tech_lookup: Dict[str, int] = {}
+        self.buckets = _Codes()
+        self.locations = _Codes()
+        self.categories = _Codes()
+        self.groups = _Codes()  # "bucket|location|category" -> row of counts
+        self.pairs = _Codes()  # "location|category" -> co-occurrence matrix
+        # Capacity-backed buffers; the properties below expose the used part
+        self._group_codes = np.zeros((0, 3), dtype=np.int32)  # bucket, location, category code per group
+        self._pair_codes = np.zeros((0, 2), dtype=np.int32)  # location, category code per pair
+        self._jobs = np.zeros(0, dtype=np.int64)
+        self._counts = np.zeros((0, 0), dtype=np.int64)
+        self._cooccurrence = np.zeros((0, 0, 0), dtype=np.int32)
+        os.makedirs(directory, exist_ok=True)
+        # Fingerprints of counted jobs; inserts are committed together with the arrays in save()
+        self.conn = sqlite3.connect(os.path.join(directory, 'seen.db'), isolation_level=None)
+        self.conn.execute('PRAGMA journal_mode=WAL')
+        self.conn.execute('CREATE TABLE IF NOT EXISTS seen (fingerprint INTEGER PRIMARY KEY)')
+        self.load()
+
+    @property
+    def group_codes(self) -> np.ndarray:
+        return self._group_codes[:len(self.groups)]
+
+    @property
+    def pair_codes(self) -> np.ndarray:
+        return self._pair_codes[:len(self.pairs)]
+
+    @property
+    def jobs(self) -> np.ndarray:
+        return self._jobs[:len(self.groups)]
+
+    @property
+    def counts(self) -> np.ndarray:
+        return self._counts[:len(self.groups), :len(self.techs)]
+
+    @property
+    def cooccurrence(self) -> np.ndarray:
+        n_techs = len(self.techs)
+        return self._cooccurrence[:len(self.pairs), :n_techs, :n_techs]
+
+    @property
+    def _meta_path(self) -> str:
+        return os.path.join(self.directory, 'trends.json')
+
+    @property
+    def _arrays_path(self) -> str:
+        return os.path.join(self.directory, 'trends.npz')
+
+    def load(self):
+        if not os.path.exists(self._meta_path):
+            return
+        with open(self._meta_path, 'r', encoding='utf-8') as f:
+            meta = json.load(f)
+        self.granularity = meta['granularity']
+        self.date_field = meta['date_field']
+        for name in ('techs', 'buckets', 'locations', 'categories', 'groups', 'pairs'):
+            setattr(self, name, _Codes(meta[name]))
+        self._tech_lookup = {tech.lower(): code for code, tech in enumerate(self.techs.values)}
+        with np.load(self._arrays_path) as arrays:
+            self._group_codes = arrays['group_codes']
+            self._pair_codes = arrays['pair_codes']
+            self._jobs = arrays['jobs']
+            self._counts = arrays['counts']
+            self._cooccurrence = arrays['cooccurrence']
+            if 'seen' in arrays.files:
+                # Stores written before fingerprints moved to seen.db
+                self.conn.execute('BEGIN')
+                self.conn.executemany('INSERT OR IGNORE INTO seen (fingerprint) VALUES (?)',
+                                      ((int(fingerprint),) for fingerprint in arrays['seen']))
+                self.conn.execute('COMMIT')
+
+    def seen_count(self) -> int:
+        """Number of distinct jobs counted so far (including unsaved updates)"""
+        return self.conn.execute('SELECT COUNT(*) FROM seen').fetchone()[0]
+
+    def close(self):
+        """Close the fingerprint table; unsaved updates are discarded"""
+        self.conn.close()
+
+    def save(self):
+        """Persist the aggregates (written to temporary files, then swapped in) and commit their fingerprints"""
+        arrays_tmp = self._arrays_path + '.tmp.npz'
+        np.savez_compressed(arrays_tmp, group_codes=self.group_codes, pair_codes=self.pair_codes, jobs=self.jobs,
+                            counts=self.counts, cooccurrence=self.cooccurrence)
+        meta = {
+            'granularity': self.granularity,
+            'date_field': self.date_field,
+            **{name: getattr(self, name).values for name in ('techs', 'buckets', 'locations', 'categories', 'groups', 'pairs')}
+        }
+        meta_tmp = self._meta_path + '.tmp'
+        with open(meta_tmp, 'w', encoding='utf-8') as f:
+            json.dump(meta, f)
+        os.replace(arrays_tmp, self._arrays_path)
+        os.replace(meta_tmp, self._meta_path)
+        if self.conn.in_transaction:
+            self.conn.execute('COMMIT')
+
+    def _tech_code(self, tech: str) -> int:
+        key = tech.lower()
+        code = self._tech_lookup.get(key)
+        if code is None:
+            code = self._tech_lookup[key] = self.techs.code(tech)
+        return code
+
+    @staticmethod
+    def _resized(array: np.ndarray, shape: Tuple[int, ...]) -> np.ndarray:
+        """``array`` in a buffer of at least ``shape``, doubling every dimension that is too small"""
+        if all(need <= have for need, have in zip(shape, array.shape)):
+            return array
+        capacity = tuple(max(need, 2 * have) if need > have else have for need, have in zip(shape, array.shape))
+        resized = np.zeros(capacity, dtype=array.dtype)
+        resized[tuple(slice(0, size) for size in array.shape)] = array
+        return resized
+
+    def _grow(self):
+        """Make room for newly coded groups, pairs and technologies (amortized, by doubling capacity)"""
+        n_groups, n_pairs, n_techs = len(self.groups), len(self.pairs), len(self.techs)
+        self._group_codes = self._resized(self._group_codes, (n_groups, 3))
+        self._pair_codes = self._resized(self._pair_codes, (n_pairs, 2))
+        self._jobs = self._resized(self._jobs, (n_groups,))
+        self._counts = self._resized(self._counts, (n_groups, n_techs))
+        self._cooccurrence = self._resized(self._cooccurrence, (n_pairs, n_techs, n_techs))
+
+    def update(self, jobs: Iterable[Dict]) -> int:
+        """Fold jobs into the aggregates, skipping ones already counted; returns how many were new"""
+        added = 0
+        batch = []
+        for job in jobs:
+            batch.append(job)
+            if len(batch) >= UPDATE_BATCH_SIZE:
+                added += self._update_batch(batch)
+                batch = []
+        if batch:
+            added += self._update_batch(batch)
+        return added
+
+    def _update_batch(self, batch: List[Dict]) -> int:
+        fingerprints = np.fromiter((job_fingerprint(job) for job in batch), dtype=np.int64, count=len(batch))
+        # Drop duplicates inside this batch, then jobs counted in earlier batches or runs
+        fingerprints, first = np.unique(fingerprints, return_index=True)
+        fingerprints = fingerprints.tolist()
+        known = set()
+        for start in range(0, len(fingerprints), SEEN_QUERY_SIZE):
+            chunk = fingerprints[start:start + SEEN_QUERY_SIZE]
+            known.update(row[0] for row in self.conn.execute(
+                f"SELECT fingerprint FROM seen WHERE fingerprint IN ({','.join('?' * len(chunk))})", chunk
+            ))
+        fresh = np.fromiter((fingerprint not in known for fingerprint in fingerprints), dtype=bool, count=len(fingerprints))
+        rows = np.sort(first[fresh])
+        if not len(rows):
+            return 0
+        if not self.conn.in_transaction:
+            self.conn.execute('BEGIN')
+        self.conn.executemany('INSERT INTO seen (fingerprint) VALUES (?)',
+                              ((fingerprint,) for fingerprint in fingerprints if fingerprint not in known))
+        new_jobs = [batch[i] for i in rows]
+
+        group_index = np.empty(len(new_jobs), dtype=np.int64)
+        pair_index = np.empty(len(new_jobs), dtype=np.int64)
+        new_group_codes, new_pair_codes = [], []
+        tech_rows, tech_cols = [], []
+        for row, job in enumerate(new_jobs):
+            bucket = time_bucket(job.get(self.date_field), self.granularity)
+            location = location_key(job.get('location'))
+            category = job.get('category') or 'Other'
+            codes = (self.buckets.code(bucket), self.locations.code(location), self.categories.code(category))
+
+            n_groups = len(self.groups)
+            group_index[row] = self.groups.code(f"{bucket}|{location}|{category}")
+            if len(self.groups) > n_groups:
+                new_group_codes.append(codes)
+            n_pairs = len(self.pairs)
+            pair_index[row] = self.pairs.code(f"{location}|{category}")
+            if len(self.pairs) > n_pairs:
+                new_pair_codes.append(codes[1:])
+
+            for tech in job.get('technology_stack') or []:
+                tech_rows.append(row)
+                tech_cols.append(self._tech_code(tech))
+
+        self._grow()
+        if new_group_codes:
+            self._group_codes[len(self.groups) - len(new_group_codes):len(self.groups)] = new_group_codes
+        if new_pair_codes:
+            self._pair_codes[len(self.pairs) - len(new_pair_codes):len(self.pairs)] = new_pair_codes
+
+        # One bitset row per job over the technology vocabulary
+        bitsets = np.zeros((len(new_jobs), len(self.techs)), dtype=bool)
+        bitsets[tech_rows, tech_cols] = True
+
+        self.jobs[:] += np.bincount(group_index, minlength=len(self.groups))
+        np.add.at(self.counts, group_index, bitsets.astype(np.int64))
+        cooccurrence = self.cooccurrence
+        order = np.argsort(pair_index, kind='stable')
+        pair_ids, starts = np.unique(pair_index[order], return_index=True)
+        for pair_id, members in zip(pair_ids, np.split(order, starts[1:])):
+            block = bitsets[members].astype(np.int32)
+            cooccurrence[pair_id] += block.T @ block
+        return len(new_jobs)
+
+    def _group_mask(self, location: Optional[str] = None, category: Optional[str] = None,
+                    codes: Optional[np.ndarray] = None, offset: int = 1) -> np.ndarray:
+        codes = self.group_codes if codes is None else codes
+        mask = np.ones(len(codes), dtype=bool)
+        for column, (table, value) in enumerate(((self.locations, location), (self.categories, category)), offset):
+            if value is not None:
+                mask &= codes[:, column] == table.index.get(value, -1)
+        return mask
+
+    def _tech_index(self, tech: str) -> int:
+        code = self._tech_lookup.get(tech.lower())
+        if code is None:
+            raise KeyError(f"Technology '{tech}' has not been seen")
+        return code
+
+    def tech_series(self, tech: str, location: Optional[str] = None, category: Optional[str] = None) -> List[Tuple[str, int, int]]:
+        """(bucket, jobs mentioning tech, all jobs) per time bucket, oldest first"""
+        tech_code = self._tech_index(tech)
+        mask = self._group_mask(location, category)
+        bucket_codes = self.group_codes[mask, 0]
+        mentions = np.bincount(bucket_codes, weights=self.counts[mask, tech_code], minlength=len(self.buckets))
+        totals = np.bincount(bucket_codes, weights=self.jobs[mask], minlength=len(self.buckets))
+        present = np.flatnonzero(totals)
+        series = [(self.buckets.values[code], int(mentions[code]), int(totals[code])) for code in present]
+        return sorted(series)
+
+    def week_over_week(self, tech: str, location: Optional[str] = None, category: Optional[str] = None) -> List[Dict]:
+        """Change in jobs mentioning a technology between consecutive buckets"""
+        changes = []
+        previous = None
+        for bucket, mentions, total in self.tech_series(tech, location, category):
+            change = {'bucket': bucket, 'jobs': mentions, 'share': round(mentions / total, 4) if total else 0.0}
+            if previous is not None:
+                change['change'] = mentions - previous
+                change['change_pct'] = round((mentions - previous) / previous * 100, 1) if previous else None
+            changes.append(change)
+            previous = mentions
+        return changes
+
+    def top_technologies(self, location: Optional[str] = None, category: Optional[str] = None,
+                         bucket: Optional[str] = None, k: int = 10) -> List[Tuple[str, int]]:
+        mask = self._group_mask(location, category)
+        if bucket is not None:
+            mask &= self.group_codes[:, 0] == self.buckets.index.get(bucket, -1)
+        totals = self.counts[mask].sum(axis=0)
+        top = np.argsort(-totals, kind='stable')[:k]
+        return [(self.techs.values[code], int(totals[code])) for code in top if totals[code]]
+
+    def cooccurring(self, tech: str, location: Optional[str] = None, category: Optional[str] = None,
+                    k: int = 10) -> List[Tuple[str, int]]:
+        """Technologies most often listed in the same job as ``tech``"""
+        tech_code = self._tech_index(tech)
+        mask = self._group_mask(location, category, self.pair_codes, offset=0)
+        row = self.cooccurrence[mask, tech_code, :].sum(axis=0)
+        row[tech_code] = 0
+        top = np.argsort(-row, kind='stable')[:k]
+        return [(self.techs.values[code], int(row[code])) for code in top if row[code]]
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Technology and category trends over scraped job archives")
+    parser.add_argument('--store', default=DEFAULT_STORE_DIR, help="directory holding the aggregates")
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    update = commands.add_parser('update', help="fold new jobs from archives into the aggregates")
+    update.add_argument('archives', nargs='+')
+    update.add_argument('--granularity', choices=['week', 'day'], default='week', help="bucket size for a new store")
+    update.add_argument('--date-field', choices=['scraped_date', 'posted_date'], default='scraped_date')
+
+    trend = commands.add_parser('trend', help="bucket-over-bucket demand for a technology")
+    trend.add_argument('tech')
+
+    top = commands.add_parser('top', help="most mentioned technologies")
+    top.add_argument('--bucket')
+    top.add_argument('-k', type=int, default=10)
+
+    related = commands.add_parser('related', help="technologies co-occurring with one technology")
+    related.add_argument('tech')
+    related.add_argument('-k', type=int, default=10)
+
+    for command in (trend, top, related):
+        command.add_argument('--location', help="market, e.g. 'Australia'")
+        command.add_argument('--category')
+    args = parser.parse_args(argv)
+
+    if args.command == 'update':
+        store = TrendStore(args.store, args.granularity, args.date_field)
+        added = store.update(iter_jobs(args.archives, lazy=True))
+        store.save()
+        print(f"Added {added} new jobs ({store.seen_count()} total)")
+    elif args.command == 'trend':
+        for row in TrendStore(args.store).week_over_week(args.tech, args.location, args.category):
+            print(json.dumps(row))
+    elif args.command == 'top':
+        for tech, count in TrendStore(args.store).top_technologies(args.location, args.category, args.bucket, args.k):
+            print(f"  {tech}: {count}")
+    elif args.command == 'related':
+        for tech, count in TrendStore(args.store).cooccurring(args.tech, args.location, args.category, args.k):
+            print(f"  {tech}: {count}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,180 @@
+import json
+import sqlite3
+import time
+from dataclasses import dataclass
+from typing import Dict, Iterator, Optional
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS tasks (
+    id INTEGER PRIMARY KEY,
+    kind TEXT NOT NULL,
+    dedupe_key TEXT NOT NULL UNIQUE,
+    payload TEXT NOT NULL,
+    status TEXT NOT NULL DEFAULT 'pending',
+    attempts INTEGER NOT NULL DEFAULT 0,
+    lease_owner TEXT,
+    lease_expires REAL,
+    last_error TEXT,
+    updated REAL NOT NULL,
+    generation INTEGER NOT NULL DEFAULT 0
+);
+CREATE INDEX IF NOT EXISTS tasks_ready ON tasks (status, kind, id);
+CREATE TABLE IF NOT EXISTS rate_slots (
+    host TEXT PRIMARY KEY,
+    next_allowed REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS results (
+    job_key TEXT PRIMARY KEY,
+    job TEXT NOT NULL,
+    worker TEXT,
+    created REAL NOT NULL
+);
+"""
+
+
+@dataclass
+class Task:
+    id: int
+    kind: str
+    payload: Dict
+    attempts: int
+    generation: int = 0
+
+
+class WorkQueue:
+    """SQLite-backed task queue with lease/ack semantics, shared rate slots and deduped results.
+
+    Every worker process opens its own connection to the same database file.
+    A leased task that is neither acked nor nacked before its lease expires is
+    handed to another worker, so a crashed worker never loses work. Detail
+    tasks are leased before search tasks to keep the queue short.
+
+    Keys are deduped per crawl generation: within one generation a key is
+    queued once, while a later generation re-queues keys that are done or
+    failed, so the same database can be crawled again.
+    """
+
+    def __init__(self, path: str, timeout: float = 30.0):
+        self.path = path
+        self.conn = sqlite3.connect(path, timeout=timeout, isolation_level=None)
+        self.conn.execute('PRAGMA journal_mode=WAL')
+        self.conn.execute('PRAGMA synchronous=NORMAL')
+        self.conn.executescript(SCHEMA)
+        columns = {row[1] for row in self.conn.execute('PRAGMA table_info(tasks)')}
+        if 'generation' not in columns:
+            # Queues created before crawl generations existed
+            self.conn.execute('ALTER TABLE tasks ADD COLUMN generation INTEGER NOT NULL DEFAULT 0')
+
+    def close(self):
+        self.conn.close()
+
+    def start_generation(self) -> int:
+        """Number for a new crawl; tasks put with it re-queue keys finished by earlier crawls"""
+        return self.conn.execute('SELECT COALESCE(MAX(generation), 0) + 1 FROM tasks').fetchone()[0]
+
+    def put(self, kind: str, dedupe_key: str, payload: Dict, generation: int = 0) -> bool:
+        """Enqueue a task; returns False if the key is unfinished or was already queued in this generation"""
+        cursor = self.conn.execute(
+            """INSERT INTO tasks (kind, dedupe_key, payload, updated, generation) VALUES (?, ?, ?, ?, ?)
+               ON CONFLICT (dedupe_key) DO UPDATE SET
+                   kind = excluded.kind, payload = excluded.payload, status = 'pending', attempts = 0,
+                   lease_owner = NULL, lease_expires = NULL, last_error = NULL,
+                   updated = excluded.updated, generation = excluded.generation
+               WHERE tasks.status IN ('done', 'failed') AND tasks.generation < excluded.generation""",
+            (kind, dedupe_key, json.dumps(payload), time.time(), generation)
+        )
+        return cursor.rowcount == 1
+
+    def lease(self, worker: str, lease_seconds: float = 120.0) -> Optional[Task]:
+        """Claim the next ready task (pending, or leased with an expired lease)"""
+        now = time.time()
+        self.conn.execute('BEGIN IMMEDIATE')
+        try:
+            row = self.conn.execute(
+                """SELECT id, kind, payload, attempts, generation FROM tasks
+                   WHERE status = 'pending' OR (status = 'leased' AND lease_expires < ?)
+                   ORDER BY kind = 'search', id LIMIT 1""",
+                (now,)
+            ).fetchone()
+            if row is None:
+                self.conn.execute('COMMIT')
+                return None
+            self.conn.execute(
+                """UPDATE tasks SET status = 'leased', lease_owner = ?, lease_expires = ?,
+                   attempts = attempts + 1, updated = ? WHERE id = ?""",
+                (worker, now + lease_seconds, now, row[0])
+            )
+            self.conn.execute('COMMIT')
+        except BaseException:
+            self.conn.execute('ROLLBACK')
+            raise
+        return Task(id=row[0], kind=row[1], payload=json.loads(row[2]), attempts=row[3] + 1, generation=row[4])
+
+    def ack(self, task: Task, worker: str) -> bool:
+        """Mark a leased task done; False if the lease was lost to another worker"""
+        cursor = self.conn.execute(
+            "UPDATE tasks SET status = 'done', lease_owner = NULL, updated = ? WHERE id = ? AND lease_owner = ?",
+            (time.time(), task.id, worker)
+        )
+        return cursor.rowcount == 1
+
+    def nack(self, task: Task, worker: str, error: str = '', max_attempts: int = 3):
+        """Return a task to the queue, or mark it failed after ``max_attempts``"""
+        status = 'failed' if task.attempts >= max_attempts else 'pending'
+        self.conn.execute(
+            """UPDATE tasks SET status = ?, lease_owner = NULL, lease_expires = NULL, last_error = ?, updated = ?
+               WHERE id = ? AND lease_owner = ?""",
+            (status, error[:500], time.time(), task.id, worker)
+        )
+
+    def reserve_slot(self, host: str, min_interval: float) -> float:
+        """Reserve the next request slot for a host across all workers; returns seconds to wait"""
+        if min_interval <= 0:
+            return 0.0
+        now = time.time()
+        self.conn.execute('BEGIN IMMEDIATE')
+        try:
+            row = self.conn.execute('SELECT next_allowed FROM rate_slots WHERE host = ?', (host,)).fetchone()
+            start = max(now, row[0] if row else 0.0)
+            self.conn.execute(
+                'INSERT OR REPLACE INTO rate_slots (host, next_allowed) VALUES (?, ?)',
+                (host, start + min_interval)
+            )
+            self.conn.execute('COMMIT')
+        except BaseException:
+            self.conn.execute('ROLLBACK')
+            raise
+        return start - now
+
+    def add_result(self, job_key: str, job: Dict, worker: str = '') -> bool:
+        """Store a scraped job, replacing an older copy from a re-crawl; returns False if it was stored before"""
+        self.conn.execute('BEGIN IMMEDIATE')
+        try:
+            existed = self.conn.execute('SELECT 1 FROM results WHERE job_key = ?', (job_key,)).fetchone() is not None
+            self.conn.execute(
+                """INSERT INTO results (job_key, job, worker, created) VALUES (?, ?, ?, ?)
+                   ON CONFLICT (job_key) DO UPDATE SET job = excluded.job, worker = excluded.worker""",
+                (job_key, json.dumps(job, ensure_ascii=False), worker, time.time())
+            )
+            self.conn.execute('COMMIT')
+        except BaseException:
+            self.conn.execute('ROLLBACK')
+            raise
+        return not existed
+
+    def iter_results(self) -> Iterator[tuple]:
+        for job_key, job in self.conn.execute('SELECT job_key, job FROM results ORDER BY created'):
+            yield job_key, json.loads(job)
+
+    def stats(self) -> Dict[str, int]:
+        counts = {
+            f"{kind}_{status}": count
+            for kind, status, count in self.conn.execute('SELECT kind, status, COUNT(*) FROM tasks GROUP BY kind, status')
+        }
+        counts['results'] = self.conn.execute('SELECT COUNT(*) FROM results').fetchone()[0]
+        return counts
+
+    def has_unfinished(self) -> bool:
+        """True while any task is pending or leased (possibly by a live worker)"""
+        row = self.conn.execute("SELECT 1 FROM tasks WHERE status IN ('pending', 'leased') LIMIT 1").fetchone()
+        return row is not None